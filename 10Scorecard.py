@@ -1,6 +1,8 @@
 import requests
 import pymysql
 import json
+from entity_keys import ENTITY_DDL
+from field_mapping import Arg, Field, FieldMapping, safe_float
 
 # ---------------- DB CONFIG ----------------
 DB_CONFIG = {
@@ -21,9 +23,9 @@ cursor.execute('''
         id INT AUTO_INCREMENT PRIMARY KEY,
         record_type ENUM('batsman','partnership','bowler') NOT NULL,
         
-        -- Batsman fields
+        -- Batsman fields (names are kept once per player in `players`)
         player_id INT,
-        player_name VARCHAR(100),
+        player_key INT,
         runs INT,
         balls INT,
         dots INT,
@@ -34,7 +36,7 @@ cursor.execute('''
         
         -- Partnership fields
         bat_partner_id INT,
-        bat_partner_name VARCHAR(100),
+        bat_partner_key INT,
         bat_partner_runs INT,
         bat_partner_fours INT,
         bat_partner_sixes INT,
@@ -43,7 +45,7 @@ cursor.execute('''
         
         -- Bowler fields
         bowler_id INT,
-        bowler_name VARCHAR(100),
+        bowler_key INT,
         overs FLOAT,
         maidens INT,
         bowler_runs INT,
@@ -51,6 +53,38 @@ cursor.execute('''
         economy FLOAT
     )
 ''')
+cursor.execute(ENTITY_DDL['players'])
+
+# Cricbuzz id column -> players.player_key column, as in the *_facts tables
+KEY_COLUMNS = {'player_id': 'player_key', 'bat_partner_id': 'bat_partner_key', 'bowler_id': 'bowler_key'}
+# Name columns of SCOREBOARD tables written before the players table, by id column
+LEGACY_NAME_COLUMNS = {'player_id': 'player_name', 'bat_partner_id': 'bat_partner_name', 'bowler_id': 'bowler_name'}
+
+cursor.execute("SHOW COLUMNS FROM SCOREBOARD")
+existing = {row[0] for row in cursor.fetchall()}
+missing_keys = [key for key in KEY_COLUMNS.values() if key not in existing]
+if missing_keys:
+    cursor.execute("ALTER TABLE SCOREBOARD " + ", ".join(f"ADD COLUMN {key} INT" for key in missing_keys))
+legacy = {id_col: name for id_col, name in LEGACY_NAME_COLUMNS.items() if name in existing}
+if legacy:
+    named = " UNION ALL ".join(
+        f"SELECT {id_col} AS id, {name} AS name FROM SCOREBOARD" for id_col, name in legacy.items()
+    )
+    cursor.execute(
+        f"INSERT INTO players (player_id, player_name) "
+        f"SELECT id, MAX(name) FROM ({named}) named "
+        f"WHERE id IS NOT NULL AND name IS NOT NULL AND name <> '' GROUP BY id "
+        f"ON DUPLICATE KEY UPDATE player_name = COALESCE(NULLIF(players.player_name, ''), VALUES(player_name))"
+    )
+if missing_keys or legacy:
+    for id_col, key in KEY_COLUMNS.items():
+        cursor.execute(
+            f"UPDATE SCOREBOARD s JOIN players p ON p.player_id = s.{id_col} "
+            f"SET s.{key} = p.player_key WHERE s.{key} IS NULL"
+        )
+if legacy:
+    cursor.execute("ALTER TABLE SCOREBOARD " + ", ".join(f"DROP COLUMN {name}" for name in legacy.values()))
+    print(f"✅ Moved {len(legacy)} name columns of SCOREBOARD into players")
 print("✅ Table created or already exists")
 conn.commit()
 
@@ -65,6 +99,83 @@ headers = {
 	"x-rapidapi-host": "cricbuzz-cricket.p.rapidapi.com"
 }
 
+# SCOREBOARD columns for each record type (see field_mapping.py)
+BATSMAN_FIELDS = FieldMapping({
+    'player_id': Field("id"),
+    'runs': Field("runs"),
+    'balls': Field("balls"),
+    'dots': Arg(),  # dots field doesn't exist for batsmen in API
+    'fours': Field("fours"),
+    'sixes': Field("sixes"),
+    'strike_rate': Field("strkrate", coerce=safe_float),
+    'dismissal': Field("outdec"),
+}, name='batsman_fields')
+
+BOWLER_FIELDS = FieldMapping({
+    'bowler_id': Field("id"),
+    'overs': Field("overs", coerce=safe_float),
+    'maidens': Field("maidens"),
+    'bowler_runs': Field("runs"),
+    'wickets': Field("wickets"),
+    'economy': Field("economy", coerce=safe_float),
+}, name='bowler_fields')
+
+PARTNERSHIP_FIELDS = FieldMapping({
+    'player_id': Field("bat1id"),
+    'runs': Field("bat1runs"),
+    'fours': Field("bat1fours"),
+    'sixes': Field("bat1sixes"),
+    'bat_partner_id': Field("bat2id"),
+    'bat_partner_runs': Field("bat2runs"),
+    'bat_partner_fours': Field("bat2fours"),
+    'bat_partner_sixes': Field("bat2sixes"),
+    'total_runs': Field("totalruns"),
+    'total_balls': Field("totalballs"),
+}, name='partnership_fields')
+
+
+def key_columns(mapping):
+    """(id column, key column) pairs a record type's rows carry."""
+    return [(column, KEY_COLUMNS[column]) for column in mapping.columns if column in KEY_COLUMNS]
+
+
+def insert_sql(mapping):
+    columns = ['record_type'] + mapping.columns + [key for _, key in key_columns(mapping)]
+    return (f"INSERT INTO SCOREBOARD ({', '.join(columns)}) "
+            f"VALUES ({', '.join(['%s'] * len(columns))})")
+
+
+def with_keys(mapping, record_type, values, player_keys):
+    """A SCOREBOARD row: the record type, the mapped values and the player keys of their ids."""
+    ids = [values[mapping.columns.index(column)] for column, _ in key_columns(mapping)]
+    return (record_type,) + values + tuple(player_keys.get(player_id) for player_id in ids)
+
+
+INSERT_PLAYERS = (
+    "INSERT INTO players (player_id, player_name) VALUES (%s, %s) "
+    "ON DUPLICATE KEY UPDATE player_name = VALUES(player_name)"
+)
+
+
+def player_names(scard):
+    """(player_id, name) pairs of everyone in an innings, for the players table."""
+    names = {}
+    for person in scard.get("batsman", []) + scard.get("bowler", []):
+        names[person.get("id")] = person.get("name")
+    for p in (scard.get("partnership", {}) or {}).get("partnership", []):
+        names[p.get("bat1id")] = p.get("bat1name")
+        names[p.get("bat2id")] = p.get("bat2name")
+    return [(player_id, name) for player_id, name in names.items() if player_id and name]
+
+
+def player_keys(player_ids):
+    """Cricbuzz player_id -> players.player_key."""
+    if not player_ids:
+        return {}
+    cursor.execute("SELECT player_id, player_key FROM players WHERE player_id IN %s", (tuple(player_ids),))
+    return dict(cursor.fetchall())
+
+
 count = 0
 
 # Process both URLs
@@ -78,104 +189,53 @@ for url in urls:
     
     for scard in Score.get("scorecard", []):
 
+        players = player_names(scard)
+        if players:
+            cursor.executemany(INSERT_PLAYERS, players)
+        keys = player_keys([player_id for player_id, _ in players])
+
         # 🏏 Batsmen - Using actual JSON field names
-        for bat in scard.get("batsman", []):
-            # Convert strike rate from string to float
-            strike_rate = None
-            if bat.get("strkrate"):
-                try:
-                    strike_rate = float(bat.get("strkrate"))
-                except (ValueError, TypeError):
-                    strike_rate = None
-            
-            cursor.execute('''
-                         INSERT INTO SCOREBOARD
-                         (record_type, player_id, player_name, runs, balls, dots, fours, sixes, strike_rate, dismissal)
-                         VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s,%s)
-                         ''', (
-                            'batsman',
-                            bat.get("id"),
-                            bat.get("name"),
-                            bat.get("runs"),
-                            bat.get("balls"),
-                            None,  # dots field doesn't exist for batsmen in API
-                            bat.get("fours"),
-                            bat.get("sixes"),
-                            strike_rate,
-                            bat.get("outdec")
-                     ))
-            count += 1
+        batsman_rows = [with_keys(BATSMAN_FIELDS, 'batsman', BATSMAN_FIELDS.extract(bat, None), keys)
+                        for bat in scard.get("batsman", [])]
 
         # 🎯 Bowlers - Using actual JSON field names
-        for bowler in scard.get("bowler", []):
-            # Convert string values to proper types
-            overs_val = None
-            if bowler.get("overs"):
-                try:
-                    overs_val = float(bowler.get("overs"))
-                except (ValueError, TypeError):
-                    overs_val = None
-            
-            economy_val = None
-            if bowler.get("economy"):
-                try:
-                    economy_val = float(bowler.get("economy"))
-                except (ValueError, TypeError):
-                    economy_val = None
-            
-            cursor.execute('''
-                INSERT INTO SCOREBOARD
-                (record_type, bowler_id, bowler_name, overs, maidens, bowler_runs, wickets, economy)
-                VALUES (%s,%s,%s,%s,%s,%s,%s,%s)
-            ''', ( "bowler",
-                bowler.get("id"),
-                bowler.get("name"),
-                overs_val,
-                bowler.get("maidens"),
-                bowler.get("runs"),
-                bowler.get("wickets"),
-                economy_val
-            ))
-            count += 1
+        bowler_rows = [with_keys(BOWLER_FIELDS, 'bowler', BOWLER_FIELDS.extract(bowler), keys)
+                       for bowler in scard.get("bowler", [])]
 
         # 🤝 Partnerships - Using exact JSON structure
-        partnership_data = scard.get("partnership", {})
-        if partnership_data and "partnership" in partnership_data:
-            for p in partnership_data["partnership"]:
-                cursor.execute('''
-                    INSERT INTO SCOREBOARD
-                    (record_type, player_id, player_name, runs, fours, sixes,
-                     bat_partner_id, bat_partner_name, bat_partner_runs, bat_partner_fours, bat_partner_sixes,
-                     total_runs, total_balls)
-                    VALUES ('partnership', %s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s)
-                ''', (
-                    p.get("bat1id"), 
-                    p.get("bat1name"), 
-                    p.get("bat1runs"), 
-                    p.get("bat1fours"), 
-                    p.get("bat1sixes"),
-                    p.get("bat2id"), 
-                    p.get("bat2name"), 
-                    p.get("bat2runs"), 
-                    p.get("bat2fours"), 
-                    p.get("bat2sixes"),
-                    p.get("totalruns"), 
-                    p.get("totalballs")
-                ))
-                count += 1
+        partnership_data = scard.get("partnership", {}) or {}
+        partnership_rows = [
+            with_keys(PARTNERSHIP_FIELDS, 'partnership', PARTNERSHIP_FIELDS.extract(p), keys)
+            for p in partnership_data.get("partnership", [])
+        ]
+
+        for sql, batch in ((insert_sql(BATSMAN_FIELDS), batsman_rows),
+                           (insert_sql(BOWLER_FIELDS), bowler_rows),
+                           (insert_sql(PARTNERSHIP_FIELDS), partnership_rows)):
+            if batch:
+                cursor.executemany(sql, batch)
+                count += len(batch)
 
 conn.commit()
 print(f"✅ Inserted {count} records into the database")
 
 # Optional: Display some sample data
 print("\n📊 Sample data from database:")
-cursor.execute("SELECT record_type, player_name, runs, dismissal FROM SCOREBOARD WHERE record_type='batsman' LIMIT 5")
+cursor.execute(
+    "SELECT s.record_type, p.player_name, s.runs, s.dismissal FROM SCOREBOARD s "
+    "LEFT JOIN players p ON p.player_key = s.player_key WHERE s.record_type='batsman' LIMIT 5"
+)
 batsmen_data = cursor.fetchall()
 for row in batsmen_data:
     print(f"  {row[0]}: {row[1]} - {row[2]} runs ({row[3]})")
 
 print("\n🤝 Partnership data:")
-cursor.execute("SELECT player_name, bat_partner_name, total_runs FROM SCOREBOARD WHERE record_type='partnership' LIMIT 3")
+cursor.execute(
+    "SELECT p1.player_name, p2.player_name, s.total_runs FROM SCOREBOARD s "
+    "LEFT JOIN players p1 ON p1.player_key = s.player_key "
+    "LEFT JOIN players p2 ON p2.player_key = s.bat_partner_key "
+    "WHERE s.record_type='partnership' LIMIT 3"
+)
 partnership_data = cursor.fetchall()
 for row in partnership_data:
     print(f"  {row[0]} & {row[1]} - {row[2]} runs")
@@ -7,10 +7,29 @@ from typing import Dict, List, Optional
 import os
 from dotenv import load_dotenv
 import time
+import threading
+import queue
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 from contextlib import contextmanager
-import re
+from summary_tables import refresh_summaries
+from derived_tables import derive_completed_matches, DERIVED_TABLE_DDL
+from career_ledger import update_career_ledger
+from analytics_engine import snapshot_tables
+from match_cache import bump_match_versions
+from match_snapshots import prune_match_snapshots, write_match_snapshots
+from commentary_classifier import classify_commentary, ensure_classification_columns
+from delivery_store import store_deliveries
+from scorecard_engine import ScorecardEngine, innings_count
+from dimension_cache import (
+    DIMENSION_KEYS, DimensionCache, dimension_hash, prune_dimension_rows,
+)
+from commentary_codec import CommentaryCodec, write_commentary_frame
+from dtype_policy import log_savings, write_frame
+from entity_keys import FACT_TABLES, KeyResolver, write_fact_rows
+from raw_archive import RAW_ARCHIVE_DIR, RawArchive
+from columnar import BATCH, BOOL, FLOAT, INT, OBJECT, STR, ColumnarBuilder
+from field_mapping import Arg, Field, FieldMapping, safe_float, safe_int
 
 # Setup logging
 logging.basicConfig(
@@ -46,6 +65,238 @@ HEADERS = {
     "x-rapidapi-host": RAPIDAPI_HOST
 }
 
+# Output columns of each live table, in storage order (see columnar.py)
+INNINGS_COLUMNS = {
+    f"{team}_inngs{n}_{field}": kind
+    for team in ('team1', 'team2')
+    for n in (1, 2)
+    for field, kind in (('runs', INT), ('wickets', INT), ('overs', FLOAT), ('declared', BOOL))
+}
+
+TABLE_COLUMNS = {
+    'live_match_info': {
+        'match_id': INT, 'series_id': INT, 'series_name': STR, 'match_desc': STR,
+        'match_format': STR, 'start_date': INT, 'runs': OBJECT, 'state': STR, 'status': STR,
+        'curr_bat_team_id': INT, 'toss_status': STR, **INNINGS_COLUMNS,
+    },
+    'live_venues': {
+        'match_id': INT, 'venue_id': INT, 'ground': STR, 'city': STR, 'timezone': STR,
+        'latitude': OBJECT, 'longitude': OBJECT, 'row_hash': STR,
+    },
+    'live_teams': {
+        'match_id': INT, 'team_role': STR, 'team_id': INT, 'team_name': STR, 'team_sname': STR,
+        'row_hash': STR,
+    },
+    'live_officials': {
+        'match_id': INT, 'role': STR, 'official_id': INT, 'name': STR, 'country': STR,
+        'row_hash': STR,
+    },
+    'live_series': {
+        'series_id': INT, 'series_name': STR, 'match_type': STR, 'series_type': STR, 'match_id': INT,
+        'series_start_dt': OBJECT, 'series_end_dt': OBJECT, 'fetched_at': BATCH, 'row_hash': STR,
+    },
+    'live_batting_stats': {
+        'match_id': INT, 'innings_id': INT, 'team_name': STR, 'batsman_id': INT, 'batsman_name': STR,
+        'batting_position': INT, 'runs': INT, 'balls_faced': INT, 'fours': INT, 'sixes': INT,
+        'strike_rate': FLOAT, 'out_desc': STR,
+    },
+    'live_bowling_stats': {
+        'match_id': INT, 'innings_id': INT, 'team_name': STR, 'bowler_id': INT, 'bowler_name': STR,
+        'overs': FLOAT, 'maidens': INT, 'runs_conceded': INT, 'wickets': INT, 'economy': FLOAT,
+        'no_balls': INT, 'wides': INT,
+    },
+    'live_partnerships': {
+        'match_id': INT, 'innings_id': INT, 'team_name': STR, 'partnership_number': INT,
+        'bat1_id': INT, 'bat1_name': STR, 'bat1_runs': INT, 'bat1_balls': INT, 'bat1_fours': INT,
+        'bat1_sixes': INT, 'bat1_position': INT,
+        'bat2_id': INT, 'bat2_name': STR, 'bat2_runs': INT, 'bat2_balls': INT, 'bat2_fours': INT,
+        'bat2_sixes': INT, 'bat2_position': INT,
+        'total_runs': INT, 'total_balls': INT, 'is_adjacent': BOOL, 'fetched_at': BATCH,
+    },
+    'live_scorecard_metadata': {
+        'match_id': INT, 'is_match_complete': BOOL, 'match_status': STR,
+    },
+    'live_commentary': {
+        'match_id': INT, 'innings': INT, 'over_number': FLOAT, 'ball_number': INT, 'timestamp': INT,
+        'event_type': STR, 'commentary_text': STR, 'bat_team_score': INT,
+        'toss_winner': STR, 'fetched_at': BATCH,
+    },
+}
+
+# Where each column comes from in the API payloads (see field_mapping.py).
+# Arg columns are passed in by the extract_* functions. The last alias of a
+# field is often the mcenter/v1/{id} header's name for it (archive_backfill.py),
+# which nests team, series and venue fields ('series.id', 'team1.name').
+def _partner_fields(n: int) -> dict:
+    fields = {
+        f"bat{n}_{column}": Field(f"bat{n}{column}", coerce=None if column == 'name' else safe_int)
+        for column in ('id', 'name', 'runs', 'balls', 'fours', 'sixes')
+    }
+    fields[f"bat{n}_position"] = Arg()
+    return fields
+
+INNINGS_FIELDS = FieldMapping({
+    f"{team}_inngs{n}_{field}": Field(f"{team}Score.inngs{n}.{key}", coerce=coerce, default=default)
+    for team in ('team1', 'team2')
+    for n in (1, 2)
+    for field, key, coerce, default in (
+        ('runs', 'runs', safe_int, None),
+        ('wickets', 'wickets', safe_int, None),
+        ('overs', 'overs', safe_float, None),
+        ('declared', 'isDeclared', None, False),
+    )
+}, name='innings_fields')
+
+FIELD_MAPPINGS = {
+    'live_match_info': FieldMapping({
+        'match_id': Arg(),
+        'series_id': Field('seriesid', 'seriesId', 'series.id', coerce=safe_int),
+        'series_name': Field('seriesname', 'seriesName', 'series.name'),
+        'match_desc': Field('matchdesc', 'matchDesc', 'matchDescription'),
+        'match_format': Field('matchformat', 'matchFormat'),
+        'start_date': Field('startdate', 'startDate', 'matchStartTimestamp', coerce=safe_int),
+        'runs': Field('runs'),
+        'state': Field('state'),
+        'status': Field('status'),
+        'curr_bat_team_id': Field('currbatteamid', 'currBatTeamId', coerce=safe_int),
+        'toss_status': Field('tossstatus', 'tossStatus'),
+    }, name='match_info_fields'),
+    'live_venues': FieldMapping({
+        'match_id': Arg(),
+        'venue_id': Field('id', coerce=safe_int),
+        'ground': Field('ground', 'name'),
+        'city': Field('city'),
+        'timezone': Field('timezone'),
+        'latitude': Field('latitude'),
+        'longitude': Field('longitude'),
+    }, name='venue_fields'),
+    'live_teams': FieldMapping({
+        'match_id': Arg(),
+        'team_role': Arg(),
+        'team_id': Field('teamid', 'teamId', 'id', coerce=safe_int),
+        'team_name': Field('teamname', 'teamName', 'name'),
+        'team_sname': Field('teamsname', 'teamSName', 'shortName'),
+    }, name='team_fields'),
+    'live_officials': FieldMapping({
+        'match_id': Arg(),
+        'role': Arg(),
+        'official_id': Field('id', coerce=safe_int),
+        'name': Field('name'),
+        'country': Field('country'),
+    }, name='official_fields'),
+    'live_series': FieldMapping({
+        'series_id': Field('seriesid', 'seriesId', 'series.id', coerce=safe_int),
+        'series_name': Field('seriesname', 'seriesName', 'series.name'),
+        'match_type': Field('matchtype', 'matchType'),
+        'series_type': Field('seriestype', 'seriesType', 'series.seriesType'),
+        'match_id': Arg(),
+        'series_start_dt': Field('seriesstartdt', 'seriesStartDt', 'series.startDate'),
+        'series_end_dt': Field('seriesenddt', 'seriesEndDt', 'series.endDate'),
+    }, name='series_fields'),
+    'live_batting_stats': FieldMapping({
+        'match_id': Arg(),
+        'innings_id': Arg(),
+        'team_name': Arg(),
+        'batsman_id': Field('id', 'batId', coerce=safe_int),
+        'batsman_name': Field('name', 'batName'),
+        'batting_position': Arg(),
+        'runs': Field('runs', coerce=safe_int),
+        'balls_faced': Field('balls', coerce=safe_int),
+        'fours': Field('fours', coerce=safe_int),
+        'sixes': Field('sixes', coerce=safe_int),
+        'strike_rate': Field('strkrate', 'strikeRate', coerce=safe_float),
+        'out_desc': Field('outdec', 'outDesc'),
+    }, name='batting_fields'),
+    'live_bowling_stats': FieldMapping({
+        'match_id': Arg(),
+        'innings_id': Arg(),
+        'team_name': Arg(),
+        'bowler_id': Field('id', 'bowlId', coerce=safe_int),
+        'bowler_name': Field('name', 'bowlName'),
+        'overs': Field('overs', coerce=safe_float),
+        'maidens': Field('maidens', coerce=safe_int),
+        'runs_conceded': Field('runs', coerce=safe_int),
+        'wickets': Field('wickets', coerce=safe_int),
+        'economy': Field('economy', coerce=safe_float),
+        'no_balls': Field('noballs', 'no_balls', coerce=safe_int, default=0),
+        'wides': Field('wides', coerce=safe_int, default=0),
+    }, name='bowling_fields'),
+    'live_partnerships': FieldMapping({
+        'match_id': Arg(),
+        'innings_id': Arg(),
+        'team_name': Arg(),
+        'partnership_number': Arg(),
+        **_partner_fields(1),
+        **_partner_fields(2),
+        'total_runs': Field('totalruns', coerce=safe_int),
+        'total_balls': Field('totalballs', coerce=safe_int),
+        'is_adjacent': Arg(),
+    }, name='partnership_fields'),
+    'live_scorecard_metadata': FieldMapping({
+        'match_id': Arg(),
+        'is_match_complete': Field('ismatchcomplete', default=False),
+        'match_status': Field('status'),
+    }, name='scorecard_metadata_fields'),
+    'live_commentary': FieldMapping({
+        'match_id': Arg(),
+        'innings': Field('inningsid', coerce=safe_int),
+        'over_number': Field('overnum', coerce=safe_float),
+        'ball_number': Field('ballnbr', coerce=safe_int),
+        'timestamp': Field('timestamp', coerce=safe_int),
+        'event_type': Field('eventtype', default=''),
+        'commentary_text': Field('commtxt', default=''),
+        'bat_team_score': Field('batteamscore', coerce=safe_int),
+        'toss_winner': Field('tosswinnername'),
+    }, name='commentary_fields'),
+}
+
+# One innings of a /scard response: (innings_id, batting team, batsmen, bowlers, partnerships)
+SCORECARD_INNINGS_FIELDS = FieldMapping({
+    'innings_id': Field('inningsid', 'inningsId', coerce=safe_int),
+    'team_name': Field('batteamname', 'batTeamName'),
+    'batsmen': Field('batsman', 'batCardList', default=[]),
+    'bowlers': Field('bowler', 'bowlCardList', default=[]),
+    'partnerships': Field('partnership.partnership', default=[]),
+}, name='scorecard_innings_fields')
+
+# The innings list of a /scard response, under its key for each API version
+SCORECARD_FIELDS = FieldMapping({
+    'innings': Field('scorecard', 'scoreCard', 'innings'),
+}, name='scorecard_fields')
+
+# Partnership batter ids, read before the row to look up their batting positions
+PARTNER_ID_FIELDS = FieldMapping({
+    'bat1_id': Field('bat1id', coerce=safe_int),
+    'bat2_id': Field('bat2id', coerce=safe_int),
+}, name='partner_id_fields')
+
+# Header fields the parsers branch on, in the live feed's and mcenter's spellings
+MATCH_KEY_FIELDS = FieldMapping({
+    'match_id': Field('matchid', 'matchId'),
+    'venue': Field('venueinfo', 'venueInfo', 'venue'),
+    'series_id': Field('seriesid', 'seriesId', 'series.id'),
+    'toss_status': Field('tossstatus', 'tossStatus'),
+    'toss_winner': Field('tossResults.tossWinnerName', 'tossResults.winnerName'),
+    'toss_decision': Field('tossResults.decision', default=''),
+}, name='match_key_fields')
+MATCH_ID, VENUE, SERIES_ID, TOSS_STATUS, TOSS_WINNER, TOSS_DECISION = range(len(MATCH_KEY_FIELDS.columns))
+
+# An mcenter/v1/{id} response: the header and the innings scores
+MATCH_PAYLOAD_FIELDS = FieldMapping({
+    'match': Field('matchInfo', 'matchheaders', default={}),
+    'match_score': Field('matchScore', default={}),
+}, name='match_payload_fields')
+
+BATSMAN_ID = FIELD_MAPPINGS['live_batting_stats'].columns.index('batsman_id')
+
+# Builders take rows positionally, so the two specs must agree on column order
+for _table, _mapping in FIELD_MAPPINGS.items():
+    _columns = _mapping.columns + (INNINGS_FIELDS.columns if _table == 'live_match_info' else [])
+    if _table in DIMENSION_KEYS:
+        _columns = _columns + ['row_hash']
+    if _columns != [name for name, kind in TABLE_COLUMNS[_table].items() if kind != BATCH]:
+        raise ValueError(f"FIELD_MAPPINGS['{_table}'] does not match TABLE_COLUMNS")
+
 def create_session_with_retries(retries: int = 3, backoff_factor: float = 0.5) -> requests.Session:
     """Create a requests session with retry logic."""
     session = requests.Session()
@@ -73,13 +324,39 @@ def save_response_for_debug(data: dict, filename: str):
         json.dump(data, f, indent=2)
     logger.debug(f"Saved debug response to {filepath}")
 
-def fetch_api_data(url: str, endpoint_name: str = "API", save_debug: bool = False) -> Optional[dict]:
-    """Fetch data from API with error handling and retries."""
+_raw_archive = None
+_raw_archive_lock = threading.Lock()
+
+def get_raw_archive() -> Optional[RawArchive]:
+    """The process's raw response archive (see raw_archive.py), or None if RAW_ARCHIVE_DIR is empty."""
+    global _raw_archive
+    if not RAW_ARCHIVE_DIR:
+        return None
+    with _raw_archive_lock:
+        if _raw_archive is None:
+            _raw_archive = RawArchive(RAW_ARCHIVE_DIR)
+    return _raw_archive
+
+def fetch_api_data(url: str, endpoint_name: str = "API", save_debug: bool = False,
+                   raw_key: Optional[tuple] = None) -> Optional[dict]:
+    """
+    Fetch data from API with error handling and retries.
+
+    raw_key=(endpoint, match_id) also appends the response to the raw archive,
+    so parse_payload() can re-read it later without another API call.
+    """
     try:
         response = SESSION.get(url, headers=HEADERS, timeout=30)
         response.raise_for_status()
         data = response.json()
         logger.info(f"✓ Successfully fetched {endpoint_name}")
+
+        archive = get_raw_archive() if raw_key else None
+        if archive is not None:
+            try:
+                archive.append(raw_key[0], data, match_id=raw_key[1])
+            except Exception as e:
+                logger.warning(f"⚠ Could not archive {endpoint_name}: {e}")
         
         if save_debug:
             filename = f"{endpoint_name.replace(' ', '_')}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
@@ -96,280 +373,140 @@ def fetch_api_data(url: str, endpoint_name: str = "API", save_debug: bool = Fals
         logger.error(f"✗ JSON decode error for {endpoint_name}: {e}")
         return None
 
-def safe_get(dictionary: dict, *keys, default=None):
-    """Safely navigate nested dictionaries with multiple possible keys."""
-    for key in keys:
-        value = dictionary.get(key)
-        if value is not None:
-            return value
-    return default
-
-def safe_float(val):
-    """Convert value to float safely, return None if invalid."""
-    if val is None or val == '':
-        return None
-    try:
-        if isinstance(val, (int, float)):
-            return float(val)
-        if isinstance(val, str):
-            import re
-            match = re.search(r"[-+]?\d*\.?\d+", val)
-            if match:
-                return float(match.group())
-        return None
-    except (ValueError, TypeError):
-        return None
-
-def safe_int(val):
-    """Convert value to int safely, return None if invalid."""
-    if val is None or val == '':
-        return None
-    try:
-        if isinstance(val, bool):
-            return int(val)
-        return int(float(val))
-    except (ValueError, TypeError):
-        return None
-
-def extract_commentary_data(commentary_json: dict, match_id: int) -> List[dict]:
-    """Extract commentary lines into a flat list of dicts."""
-    commentary_lines = []
-    
+def extract_commentary_data(commentary_json: dict, match_id: int, out: ColumnarBuilder) -> int:
+    """
+    Append commentary lines to the live_commentary builder; returns lines added.
+    Runs and extras are classified per batch afterwards (see commentary_classifier).
+    """
     comwrapper = commentary_json.get('comwrapper', [])
     
     if not comwrapper:
         logger.debug(f"No commentary data found for match {match_id}")
-        return commentary_lines
+        return 0
     
+    extract = FIELD_MAPPINGS['live_commentary'].extract
+    added = 0
     for item in comwrapper:
         comm = item.get('commentary', {})
         
         if not comm:
             continue
         
-        # Extract runs scored from commentary text or event type
-        runs_scored = 0
-        comm_text = comm.get('commtxt', '')
-        event_type = comm.get('eventtype', '')
-        
-        if event_type == 'FOUR':
-            runs_scored = 4
-        elif event_type == 'SIX':
-            runs_scored = 6
-        else:
-            run_match = re.search(r'(\d+)\s+runs?', comm_text)
-            if run_match:
-                runs_scored = int(run_match.group(1))
-            elif 'no run' in comm_text.lower():
-                runs_scored = 0
-        
-        commentary_lines.append({
-            'match_id': match_id,
-            'innings': safe_int(comm.get('inningsid')),
-            'over_number': safe_float(comm.get('overnum')),
-            'ball_number': safe_int(comm.get('ballnbr')),
-            'timestamp': comm.get(datetime('timestamp')),
-            'event_type': event_type,
-            'commentary_text': comm_text,
-            'runs_scored': runs_scored,
-            'bat_team_score': safe_int(comm.get('batteamscore')),
-            'toss_winner':comm.get('tosswinnername'),
-            'fetched_at': datetime.now()
-        })
+        out.append(*extract(comm, match_id))
+        added += 1
     
-    return commentary_lines
+    return added
 
-def extract_venue_info(venue_dict: dict, match_id: int) -> Optional[dict]:
-    """Extract and flatten venue information."""
+def append_dimension_row(table_name: str, source: dict, out: ColumnarBuilder,
+                         dimensions: Optional[DimensionCache], *args) -> bool:
+    """
+    Append one venue/team/official/series row with its row_hash, unless the
+    dimension cache already holds it unchanged (see dimension_cache.py).
+    args are the mapping's Arg values, which are also the row's key.
+    """
+    mapping = FIELD_MAPPINGS[table_name]
+    row_hash = dimension_hash(mapping, source, *args)
+    if dimensions is not None and not dimensions.changed(table_name, args, row_hash):
+        return False
+    out.append(*mapping.extract(source, *args), row_hash)
+    return True
+
+def extract_venue_info(venue_dict: dict, match_id: int, out: ColumnarBuilder,
+                       dimensions: Optional[DimensionCache] = None) -> bool:
+    """Append flattened venue information to the live_venues builder."""
     if not venue_dict:
-        return None
+        return False
     
-    venue_info = {
-        'match_id': match_id,
-        'venue_id': venue_dict.get('id'),
-        'ground': venue_dict.get('ground'),
-        'city': venue_dict.get('city'),
-        'timezone': venue_dict.get('timezone'),
-        'latitude': venue_dict.get('latitude'),
-        'longitude': venue_dict.get('longitude')
-    }
-    return venue_info
+    return append_dimension_row('live_venues', venue_dict, out, dimensions, match_id)
 
-def extract_team_info(team_dict: dict, match_id: int, team_role: str) -> Optional[dict]:
-    """Extract and flatten team information."""
+def extract_team_info(team_dict: dict, match_id: int, team_role: str, out: ColumnarBuilder,
+                      dimensions: Optional[DimensionCache] = None) -> bool:
+    """Append flattened team information to the live_teams builder."""
     if not team_dict:
-        return None
+        return False
     
-    team_info = {
-        'match_id': match_id,
-        'team_role': team_role,
-        'team_id': safe_get(team_dict, 'teamid', 'teamId'),
-        'team_name': safe_get(team_dict, 'teamname', 'teamName'),
-        'team_sname': safe_get(team_dict, 'teamsname', 'teamSName')
-    }
-    return team_info
+    return append_dimension_row('live_teams', team_dict, out, dimensions, match_id, team_role)
 
-def extract_official_info(official_dict: dict, match_id: int, role: str) -> Optional[dict]:
-    """Extract umpire or referee information."""
+def extract_official_info(official_dict: dict, match_id: int, role: str, out: ColumnarBuilder,
+                          dimensions: Optional[DimensionCache] = None) -> bool:
+    """Append umpire or referee information to the live_officials builder."""
     if not official_dict or not official_dict.get('id'):
-        return None
+        return False
     
-    return {
-        'match_id': match_id,
-        'role': role,
-        'official_id': official_dict.get('id'),
-        'name': official_dict.get('name'),
-        'country': official_dict.get('country')
-    }
+    return append_dimension_row('live_officials', official_dict, out, dimensions, match_id, role)
 
-def extract_player_stats_and_partnerships(scorecard_data: dict, match_id: int) -> tuple:
+def extract_player_stats_and_partnerships(
+    scorecard_data: dict,
+    match_id: int,
+    batting: ColumnarBuilder,
+    bowling: ColumnarBuilder,
+    partnerships: ColumnarBuilder
+) -> tuple:
     """
-    Extract batting, bowling, and partnership statistics from scorecard.
-    Returns: (batsmen_list, bowlers_list, partnerships_list)
+    Append batting, bowling, and partnership statistics from scorecard to their builders.
+    Returns: (batsmen_added, bowlers_added, partnerships_added)
     """
-    all_batsmen = []
-    all_bowlers = []
-    all_partnerships = []
+    counts = (len(batting), len(bowling), len(partnerships))
     
     if not scorecard_data:
         logger.warning(f"No scorecard data for match {match_id}")
-        return all_batsmen, all_bowlers, all_partnerships
-    
-    scorecards = None
-    if 'scorecard' in scorecard_data:
-        scorecards = scorecard_data['scorecard']
-    elif 'scoreCard' in scorecard_data:
-        scorecards = scorecard_data['scoreCard']
-    elif 'innings' in scorecard_data:
-        scorecards = scorecard_data['innings']
+        return 0, 0, 0
     
+    scorecards, = SCORECARD_FIELDS.extract(scorecard_data)
     if not scorecards:
         logger.warning(f"Could not find scorecard data for match {match_id}")
-        return all_batsmen, all_bowlers, all_partnerships
+        return 0, 0, 0
     
+    batting_fields = FIELD_MAPPINGS['live_batting_stats'].extract
+    bowling_fields = FIELD_MAPPINGS['live_bowling_stats'].extract
+    partnership_fields = FIELD_MAPPINGS['live_partnerships'].extract
+    partner_ids = PARTNER_ID_FIELDS.extract
+
     for innings in scorecards:
-        innings_id = innings.get('inningsid') or innings.get('inningsId')
-        batting_team_name = innings.get('batteamname') or innings.get('batTeamName')
+        innings_id, batting_team_name, batsmen_list, bowlers_list, partnerships_list = \
+            SCORECARD_INNINGS_FIELDS.extract(innings)
 
         # Build position lookup
         batsman_positions = {}
-        batsmen_list = innings.get('batsman') or innings.get('batCardList', [])
         
         # Extract batsmen with positions
         for position, bat_card in enumerate(batsmen_list, start=1):
-            batsman_id = bat_card.get('id') or bat_card.get('batId')
-            if batsman_id:
-                batsman_positions[batsman_id] = position
-            
-            batsman = {
-                'match_id': match_id,
-                'innings_id': innings_id,
-                'team_name': batting_team_name,
-                'batsman_id': batsman_id,
-                'batsman_name': bat_card.get('name') or bat_card.get('batName'),
-                'batting_position': position,
-                'runs': safe_int(bat_card.get('runs')),
-                'balls_faced': safe_int(bat_card.get('balls')),
-                'fours': safe_int(bat_card.get('fours')),
-                'sixes': safe_int(bat_card.get('sixes')),
-                'strike_rate': safe_float(bat_card.get('strkrate') or bat_card.get('strikeRate')),
-                'out_desc': bat_card.get('outdec') or bat_card.get('outDesc')
-            }
-            all_batsmen.append(batsman)
+            row = batting_fields(bat_card, match_id, innings_id, batting_team_name, position)
+            if row[BATSMAN_ID]:
+                batsman_positions[row[BATSMAN_ID]] = position
+            batting.append(*row)
 
         # Extract bowlers
-        bowlers_list = innings.get('bowler') or innings.get('bowlCardList', [])
         for bowl_card in bowlers_list:
-            bowler = {
-                'match_id': match_id,
-                'innings_id': innings_id,
-                'team_name': batting_team_name,
-                'bowler_id': bowl_card.get('id') or bowl_card.get('bowlId'),
-                'bowler_name': bowl_card.get('name') or bowl_card.get('bowlName'),
-                'overs': safe_float(bowl_card.get('overs')),
-                'maidens': safe_int(bowl_card.get('maidens')),
-                'runs_conceded': safe_int(bowl_card.get('runs')),
-                'wickets': safe_int(bowl_card.get('wickets')),
-                'economy': safe_float(bowl_card.get('economy')),
-                'no_balls': safe_int(bowl_card.get('noballs') or bowl_card.get('no_balls', 0)),
-                'wides': safe_int(bowl_card.get('wides', 0))
-            }
-            all_bowlers.append(bowler)
+            bowling.append(*bowling_fields(bowl_card, match_id, innings_id, batting_team_name))
         
         # Extract partnerships
-        partnership_obj = innings.get('partnership', {})
-        partnerships_list = partnership_obj.get('partnership', [])
-        
         for idx, partnership in enumerate(partnerships_list):
-            bat1_id = partnership.get('bat1id')
-            bat2_id = partnership.get('bat2id')
+            bat1_id, bat2_id = partner_ids(partnership)
             bat1_position = batsman_positions.get(bat1_id)
             bat2_position = batsman_positions.get(bat2_id)
-            
-            partnership_record = {
-                'match_id': match_id,
-                'innings_id': innings_id,
-                'team_name': batting_team_name,
-                'partnership_number': idx + 1,
-                'bat1_id': bat1_id,
-                'bat1_name': partnership.get('bat1name'),
-                'bat1_runs': safe_int(partnership.get('bat1runs')),
-                'bat1_balls': safe_int(partnership.get('bat1balls')),
-                'bat1_fours': safe_int(partnership.get('bat1fours')),
-                'bat1_sixes': safe_int(partnership.get('bat1sixes')),
-                'bat1_position': bat1_position,
-                'bat2_id': bat2_id,
-                'bat2_name': partnership.get('bat2name'),
-                'bat2_runs': safe_int(partnership.get('bat2runs')),
-                'bat2_balls': safe_int(partnership.get('bat2balls')),
-                'bat2_fours': safe_int(partnership.get('bat2fours')),
-                'bat2_sixes': safe_int(partnership.get('bat2sixes')),
-                'bat2_position': bat2_position,
-                'total_runs': safe_int(partnership.get('totalruns')),
-                'total_balls': safe_int(partnership.get('totalballs')),
-                'is_adjacent': (
-                    abs(bat1_position - bat2_position) == 1 
-                    if bat1_position and bat2_position else None
-                ),
-                'fetched_at': datetime.now()
-            }
-            all_partnerships.append(partnership_record)
-
-    return all_batsmen, all_bowlers, all_partnerships
-
-def extract_scorecard_metadata(scorecard_data: dict, match_id: int) -> Optional[dict]:
-    """Extract match completion status and result from scorecard."""
+            is_adjacent = (
+                abs(bat1_position - bat2_position) == 1
+                if bat1_position and bat2_position else None
+            )
+            partnerships.append(*partnership_fields(
+                partnership, match_id, innings_id, batting_team_name, idx + 1,
+                bat1_position, bat2_position, is_adjacent
+            ))
+
+    return (len(batting) - counts[0], len(bowling) - counts[1], len(partnerships) - counts[2])
+
+def extract_scorecard_metadata(scorecard_data: dict, match_id: int, out: ColumnarBuilder) -> bool:
+    """Append match completion status and result from scorecard."""
     if not scorecard_data:
-        return None
+        return False
     
-    metadata = {
-        'match_id': match_id,
-        'is_match_complete': scorecard_data.get('ismatchcomplete', False),
-        'match_status': scorecard_data.get('status'),
-    }
+    out.append(*FIELD_MAPPINGS['live_scorecard_metadata'].extract(scorecard_data, match_id))
     
-    return metadata
-
-def flatten_json(
-    data: dict,
-    fetch_player_data: bool = True,
-    fetch_commentary: bool = True
-) -> Dict[str, pd.DataFrame]:
-    """
-    Flatten nested JSON response into normalized DataFrames.
-    Includes match info, venues, teams, officials, series, scorecards, partnerships, and commentary.
-    """
-    all_matches = []
-    all_venues = []
-    all_teams = []
-    all_officials = []
-    all_series = []
-    all_batsmen = []
-    all_bowlers = []
-    all_partnerships = []  # NEW
-    all_scorecard_metadata = []
-    all_commentary = []
+    return True
 
+def list_matches(data) -> tuple:
+    """(matches, {match_id: matchScore}) from a live/recent matches response."""
     # Handle both possible JSON structures
     matches_list = []
     match_scores_dict = {}
@@ -386,172 +523,229 @@ def flatten_json(
                         match_info = match.get("matchInfo", {})
                         match_score = match.get("matchScore", {})
                         matches_list.append(match_info)
-                        if match_info.get('matchId') or match_info.get('matchid'):
-                            mid = match_info.get('matchId') or match_info.get('matchid')
+                        mid = MATCH_KEY_FIELDS.extract(match_info)[MATCH_ID]
+                        if mid:
                             match_scores_dict[mid] = match_score
     elif isinstance(data, dict) and "matches" in data:
         matches_list = data.get("matches", [])
 
-    logger.info(f"Found {len(matches_list)} matches to process")
+    return matches_list, match_scores_dict
 
-    for idx, match in enumerate(matches_list):
-        match_id = safe_get(match, 'matchid', 'matchId')
-        if not match_id:
-            logger.warning("Skipping match without matchId")
-            continue
+def extract_match_rows(match: dict, match_score: dict, match_id: int, builders: Dict[str, ColumnarBuilder],
+                       dimensions: Optional[DimensionCache] = None):
+    """
+    Append one match header's info, venue, team, official and series rows to the live builders.
+    With a DimensionCache, venue, team, official and series rows already stored unchanged are skipped.
+    """
+    keys = MATCH_KEY_FIELDS.extract(match)
 
-        # Extract match score data if available
-        match_score = match_scores_dict.get(match_id, {})
-        team1_score = match_score.get('team1Score', {})
-        team2_score = match_score.get('team2Score', {})
-        
-        team1_inngs1 = team1_score.get('inngs1', {})
-        team1_inngs2 = team1_score.get('inngs2', {})
-        team2_inngs1 = team2_score.get('inngs1', {})
-        team2_inngs2 = team2_score.get('inngs2', {})
-
-        # Match Information
-        match_info = {
-            'match_id': match_id,
-            'series_id': safe_get(match, 'seriesid', 'seriesId'),
-            'series_name': safe_get(match, 'seriesname', 'seriesName'),
-            'match_desc': safe_get(match, 'matchdesc', 'matchDesc'),
-            'match_format': safe_get(match, 'matchformat', 'matchFormat'),
-            'runs': safe_get(match, 'runs'),
-            'state': match.get('state'),
-            'status': match.get('status'),
-            'curr_bat_team_id': safe_get(match, 'currbatteamid', 'currBatTeamId'),
-            'toss_status': safe_get(match, 'tossstatus', 'tossStatus'),
-            'team1_inngs1_runs': safe_int(team1_inngs1.get('runs')),
-            'team1_inngs1_wickets': safe_int(team1_inngs1.get('wickets')),
-            'team1_inngs1_overs': safe_float(team1_inngs1.get('overs')),
-            'team1_inngs1_declared': team1_inngs1.get('isDeclared', False),
-            'team1_inngs2_runs': safe_int(team1_inngs2.get('runs')),
-            'team1_inngs2_wickets': safe_int(team1_inngs2.get('wickets')),
-            'team1_inngs2_overs': safe_float(team1_inngs2.get('overs')),
-            'team1_inngs2_declared': team1_inngs2.get('isDeclared', False),
-            'team2_inngs1_runs': safe_int(team2_inngs1.get('runs')),
-            'team2_inngs1_wickets': safe_int(team2_inngs1.get('wickets')),
-            'team2_inngs1_overs': safe_float(team2_inngs1.get('overs')),
-            'team2_inngs1_declared': team2_inngs1.get('isDeclared', False),
-            'team2_inngs2_runs': safe_int(team2_inngs2.get('runs')),
-            'team2_inngs2_wickets': safe_int(team2_inngs2.get('wickets')),
-            'team2_inngs2_overs': safe_float(team2_inngs2.get('overs')),
-            'team2_inngs2_declared': team2_inngs2.get('isDeclared', False)
-        }
-        all_matches.append(match_info)
-
-        # Venue Information
-        venue_info_dict = safe_get(match, 'venueinfo', 'venueInfo', 'venue')
-        if venue_info_dict:
-            venue = extract_venue_info(venue_info_dict, match_id)
-            if venue:
-                all_venues.append(venue)
-
-        # Teams Information
-        team1_dict = match.get('team1')
-        if team1_dict:
-            team1 = extract_team_info(team1_dict, match_id, 'team1')
-            if team1:
-                all_teams.append(team1)
-
-        team2_dict = match.get('team2')
-        if team2_dict:
-            team2 = extract_team_info(team2_dict, match_id, 'team2')
-            if team2:
-                all_teams.append(team2)
-
-        # Officials
-        for i in [1, 2, 3]:
-            umpire = match.get(f'umpire{i}')
-            if umpire:
-                official = extract_official_info(umpire, match_id, f'umpire{i}')
-                if official:
-                    all_officials.append(official)
-
-        referee = match.get('referee')
-        if referee:
-            official = extract_official_info(referee, match_id, 'referee')
-            if official:
-                all_officials.append(official)
-
-        # Series
-        series_id = safe_get(match, 'seriesid', 'seriesId')
-        if series_id:
-            all_series.append({
-                'series_id': series_id,
-                'series_name': safe_get(match, 'seriesname', 'seriesName'),
-                'match_type': safe_get(match, 'matchtype', 'matchType'),
-                'series_type': safe_get(match, 'seriestype', 'seriesType'),
-                'match_id': match_id,
-                'series_start_dt': safe_get(match, 'seriesstartdt', 'seriesStartDt'),
-                'series_end_dt': safe_get(match, 'seriesenddt', 'seriesEndDt'),
-                'fetched_at': datetime.now()
-            })
-
-        # Scorecard (Player Stats and Partnerships)
-        if fetch_player_data:
-            logger.info(f"  Fetching player stats for match {match_id} ({idx+1}/{len(matches_list)})")
-            scorecard_url = API_ENDPOINTS['match_scorecard'].format(match_id=match_id)
-            scorecard_data = fetch_api_data(scorecard_url, f"scorecard for match {match_id}")
-
-            if scorecard_data:
-                try:
-                    batsmen, bowlers, partnerships = extract_player_stats_and_partnerships(scorecard_data, match_id)
-                    all_batsmen.extend(batsmen)
-                    all_bowlers.extend(bowlers)
-                    all_partnerships.extend(partnerships)  # NEW
-                    logger.info(f"    → {len(batsmen)} batsmen, {len(bowlers)} bowlers, {len(partnerships)} partnerships")
-
-                    metadata = extract_scorecard_metadata(scorecard_data, match_id)
-                    if metadata:
-                        all_scorecard_metadata.append(metadata)
-                except Exception as e:
-                    logger.error(f"    ✗ Error extracting player stats: {e}")
-            else:
-                logger.warning(f"    ✗ No scorecard data returned")
-
-            time.sleep(0.5)
-
-        # Commentary
-        if fetch_commentary:
-            logger.info(f"  Fetching commentary for match {match_id}")
-            commentary_url = API_ENDPOINTS['match_commentary'].format(match_id=match_id)
-            commentary_data = fetch_api_data(commentary_url, f"commentary for match {match_id}")
-
-            if commentary_data:
-                try:
-                    commentary_lines = extract_commentary_data(commentary_data, match_id)
-                    all_commentary.extend(commentary_lines)
-                    logger.info(f"    → {len(commentary_lines)} commentary lines")
-                except Exception as e:
-                    logger.error(f"    ✗ Error extracting commentary: {e}")
-            else:
-                logger.warning(f"    ✗ No commentary data returned")
+    # Match Information
+    builders['live_match_info'].append(
+        *FIELD_MAPPINGS['live_match_info'].extract(match, match_id),
+        *INNINGS_FIELDS.extract(match_score)
+    )
+
+    # Venue Information
+    venue_info_dict = keys[VENUE]
+    if venue_info_dict:
+        extract_venue_info(venue_info_dict, match_id, builders['live_venues'], dimensions)
 
-            time.sleep(0.5)
+    # Teams Information
+    team1_dict = match.get('team1')
+    if team1_dict:
+        extract_team_info(team1_dict, match_id, 'team1', builders['live_teams'], dimensions)
 
-    # Build DataFrames
-    logger.info("Building DataFrames from collected data")
+    team2_dict = match.get('team2')
+    if team2_dict:
+        extract_team_info(team2_dict, match_id, 'team2', builders['live_teams'], dimensions)
 
+    # Officials
+    for i in [1, 2, 3]:
+        umpire = match.get(f'umpire{i}')
+        if umpire:
+            extract_official_info(umpire, match_id, f'umpire{i}', builders['live_officials'], dimensions)
+
+    referee = match.get('referee')
+    if referee:
+        extract_official_info(referee, match_id, 'referee', builders['live_officials'], dimensions)
+
+    # Series
+    if keys[SERIES_ID]:
+        append_dimension_row('live_series', match, builders['live_series'], dimensions, match_id)
+
+TOSS_DECISIONS = {'batting': 'bat', 'bowling': 'bowl'}
+
+def with_toss_status(match: dict) -> dict:
+    """The mcenter header has tossResults instead of the live feed's tossStatus sentence; add one."""
+    keys = MATCH_KEY_FIELDS.extract(match)
+    winner = keys[TOSS_WINNER]
+    if not winner or keys[TOSS_STATUS]:
+        return match
+    decision = str(keys[TOSS_DECISION]).lower()
+    return {**match, 'tossStatus': f"{winner} opt to {TOSS_DECISIONS.get(decision, decision)}"}
+
+# Raw archive endpoint (see raw_archive.py) -> live tables its responses fill
+PAYLOAD_TABLES = {
+    'live': ['live_match_info', 'live_venues', 'live_teams', 'live_officials', 'live_series'],
+    'match_info': ['live_match_info', 'live_venues', 'live_teams', 'live_officials', 'live_series'],
+    'scard': ['live_batting_stats', 'live_bowling_stats', 'live_partnerships', 'live_scorecard_metadata'],
+    'comm': ['live_commentary'],
+}
+
+def parse_payload(endpoint: str, payload: dict, match_id: Optional[int], builders: Dict[str, ColumnarBuilder]):
+    """
+    Append the rows of one API response to the live table builders.
+
+    endpoint is the raw archive name of the response: 'live' (matches/v1/live),
+    'match_info' (mcenter/v1/{id}), 'scard' or 'comm'.
+    """
+    if endpoint == 'live':
+        matches_list, match_scores_dict = list_matches(payload)
+        for match in matches_list:
+            mid = MATCH_KEY_FIELDS.extract(match)[MATCH_ID]
+            if mid:
+                extract_match_rows(match, match_scores_dict.get(mid, {}), mid, builders)
+    elif endpoint == 'match_info':
+        match, match_score = MATCH_PAYLOAD_FIELDS.extract(payload)
+        extract_match_rows(with_toss_status(match), match_score, match_id, builders)
+    elif endpoint == 'scard':
+        extract_player_stats_and_partnerships(
+            payload, match_id, builders['live_batting_stats'],
+            builders['live_bowling_stats'], builders['live_partnerships']
+        )
+        extract_scorecard_metadata(payload, match_id, builders['live_scorecard_metadata'])
+    elif endpoint == 'comm':
+        extract_commentary_data(payload, match_id, builders['live_commentary'])
+    else:
+        raise ValueError(f"Unknown payload endpoint '{endpoint}'")
+
+def endpoints_for(tables: Optional[list]) -> List[str]:
+    """Raw archive endpoints needed to rebuild `tables` (None: all of them)."""
+    return [
+        endpoint for endpoint, endpoint_tables in PAYLOAD_TABLES.items()
+        if tables is None or set(tables) & set(endpoint_tables)
+    ]
+
+def new_builders() -> Dict[str, ColumnarBuilder]:
+    return {table_name: ColumnarBuilder(columns) for table_name, columns in TABLE_COLUMNS.items()}
+
+def builders_to_frames(builders: Dict[str, ColumnarBuilder], fetched_at: datetime) -> Dict[str, pd.DataFrame]:
+    """Empty the builders into DataFrames, with classified commentary."""
+    # One fetch time for the whole run instead of one datetime.now() per row
+    batch = {'fetched_at': fetched_at}
     dataframes = {
-        'live_match_info': pd.DataFrame(all_matches),
-        'live_venues': pd.DataFrame(all_venues),
-        'live_teams': pd.DataFrame(all_teams),
-        'live_officials': pd.DataFrame(all_officials),
-        'live_series': pd.DataFrame(all_series),
-        'live_batting_stats': pd.DataFrame(all_batsmen),
-        'live_bowling_stats': pd.DataFrame(all_bowlers),
-        'live_partnerships': pd.DataFrame(all_partnerships),  # NEW
-        'live_scorecard_metadata': pd.DataFrame(all_scorecard_metadata),
-        'live_commentary': pd.DataFrame(all_commentary)
+        table_name: builder.to_frame(batch if 'fetched_at' in builder.spec else None)
+        for table_name, builder in builders.items()
     }
+    dataframes['live_commentary'] = classify_commentary(dataframes['live_commentary'])
+    return dataframes
 
-    # Log row counts
-    for table_name, df in dataframes.items():
-        logger.info(f"{table_name}: {len(df)} rows")
+# Natural key of each live table; tables not listed drop exact duplicate rows
+NATURAL_KEYS = {
+    'live_match_info': ['match_id'],
+    **DIMENSION_KEYS,
+    # Players first seen in commentary have no id until the next /scard
+    'live_batting_stats': ['match_id', 'innings_id', 'batsman_id', 'batsman_name'],
+    'live_bowling_stats': ['match_id', 'innings_id', 'bowler_id', 'bowler_name'],
+    'live_partnerships': ['match_id', 'innings_id', 'bat1_id', 'bat2_id'],
+    'live_commentary': ['match_id', 'innings', 'timestamp', 'ball_number'],
+}
 
-    return dataframes
+def drop_duplicate_rows(table_name: str, df: pd.DataFrame) -> pd.DataFrame:
+    """Remove duplicates based on natural keys, keeping the latest row."""
+    if table_name in NATURAL_KEYS:
+        return df.drop_duplicates(subset=NATURAL_KEYS[table_name], keep='last')
+    return df.drop_duplicates()
+
+def fetch_match(
+    match: dict,
+    match_score: dict,
+    match_id: int,
+    fetch_player_data: bool = True,
+    fetch_commentary: bool = True,
+    scorecards: Optional[ScorecardEngine] = None
+) -> dict:
+    """
+    Fetch stage: call /scard and /comm for one match of the live feed.
+
+    With a ScorecardEngine (and commentary enabled), /scard is only fetched
+    if the engine says the match needs reconciling; otherwise parse_match()
+    gets its scorecard rows from the engine, updated with the new commentary.
+    """
+    item = {'match': match, 'match_score': match_score, 'match_id': match_id,
+            'scard': None, 'comm': None, 'progress': None, 'reconcile': True}
+
+    if scorecards is not None and fetch_player_data and fetch_commentary:
+        item['progress'] = (innings_count(match_score), match.get('state'))
+        item['reconcile'] = scorecards.needs_reconcile(match_id, *item['progress'])
+
+    # Scorecard (Player Stats and Partnerships)
+    if fetch_player_data and item['reconcile']:
+        logger.info(f"  Fetching player stats for match {match_id}")
+        scorecard_url = API_ENDPOINTS['match_scorecard'].format(match_id=match_id)
+        item['scard'] = fetch_api_data(scorecard_url, f"scorecard for match {match_id}",
+                                       raw_key=('scard', match_id))
+        if not item['scard']:
+            logger.warning(f"    ✗ No scorecard data returned for match {match_id}")
+        time.sleep(0.5)
+
+    # Commentary
+    if fetch_commentary:
+        logger.info(f"  Fetching commentary for match {match_id}")
+        commentary_url = API_ENDPOINTS['match_commentary'].format(match_id=match_id)
+        item['comm'] = fetch_api_data(commentary_url, f"commentary for match {match_id}",
+                                      raw_key=('comm', match_id))
+        if not item['comm']:
+            logger.warning(f"    ✗ No commentary data returned for match {match_id}")
+        time.sleep(0.5)
+
+    return item
+
+def parse_match(item: dict, fetched_at: datetime, scorecards: Optional[ScorecardEngine] = None,
+                dimensions: Optional[DimensionCache] = None) -> Dict[str, pd.DataFrame]:
+    """
+    Parse stage: flatten one fetch_match() result into the live tables' DataFrames.
+    Includes match info, venues, teams, officials, series, scorecards, partnerships, and commentary.
+    """
+    match_id = item['match_id']
+    builders = new_builders()
+    extract_match_rows(item['match'], item['match_score'], match_id, builders, dimensions)
+
+    scard_parsed = False
+    if item['scard']:
+        try:
+            batsmen, bowlers, partnerships = extract_player_stats_and_partnerships(
+                item['scard'],
+                match_id,
+                builders['live_batting_stats'],
+                builders['live_bowling_stats'],
+                builders['live_partnerships']
+            )
+            logger.info(f"    → {batsmen} batsmen, {bowlers} bowlers, {partnerships} partnerships ({match_id})")
+
+            extract_scorecard_metadata(item['scard'], match_id, builders['live_scorecard_metadata'])
+            scard_parsed = True
+        except Exception as e:
+            logger.error(f"    ✗ Error extracting player stats for match {match_id}: {e}")
+
+    if item['comm']:
+        try:
+            commentary_lines = extract_commentary_data(item['comm'], match_id, builders['live_commentary'])
+            logger.info(f"    → {commentary_lines} commentary lines ({match_id})")
+        except Exception as e:
+            logger.error(f"    ✗ Error extracting commentary for match {match_id}: {e}")
+
+    tables = builders_to_frames(builders, fetched_at)
+    if item['progress'] is not None:
+        progress = {match_id: item['progress']}
+        if item['reconcile'] and not scard_parsed:
+            # No usable /scard: keep the match stale and serve the engine's rows until one arrives
+            reconciled, skipped = {}, (progress if scorecards.mark_stale(match_id) else {})
+        else:
+            reconciled, skipped = (progress, {}) if item['reconcile'] else ({}, progress)
+        tables = scorecards.update(tables, reconciled, skipped, prune=False)
+
+    return {table_name: drop_duplicate_rows(table_name, df) for table_name, df in tables.items()}
 
 @contextmanager
 def get_db_engine():
@@ -566,70 +760,232 @@ def get_db_engine():
     finally:
         engine.dispose()
 
-def fetch_and_store_all(append_mode: bool = False, fetch_player_data: bool = True, fetch_commentary: bool = True, debug_mode: bool = False):
+# Matches buffered between pipeline stages; bounds memory and throttles the
+# fetch stage when parsing or the database falls behind
+LIVE_PIPELINE_QUEUE = int(os.getenv('LIVE_PIPELINE_QUEUE', 4))
+
+_DONE = object()
+
+def _put(q: queue.Queue, item, stop: threading.Event) -> bool:
+    """Block until q has room; False if the pipeline stopped first."""
+    while not stop.is_set():
+        try:
+            q.put(item, timeout=0.5)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+def _get(q: queue.Queue, stop: threading.Event):
+    """Next item of q, or _DONE if the pipeline stopped."""
+    while not stop.is_set():
+        try:
+            return q.get(timeout=0.5)
+        except queue.Empty:
+            continue
+    return _DONE
+
+def _run_stage(name: str, items, work, outbox: queue.Queue, stop: threading.Event):
+    """Thread body: put work(item) on outbox for every item, then _DONE."""
+    try:
+        for item in items:
+            if stop.is_set():
+                return
+            try:
+                result = work(item)
+            except Exception as e:
+                logger.error(f"✗ {name} stage failed on one match: {e}", exc_info=True)
+                continue
+            if not _put(outbox, result, stop):
+                return
+    finally:
+        _put(outbox, _DONE, stop)
+
+def _drain(inbox: queue.Queue, stop: threading.Event):
+    """Items of inbox up to its _DONE."""
+    while True:
+        item = _get(inbox, stop)
+        if item is _DONE:
+            return
+        yield item
+
+class LiveTableWriter:
+    """Write stage: stores each match's tables as soon as they are parsed."""
+
+    def __init__(self, engine, append_mode: bool, dimensions: DimensionCache, keys: KeyResolver,
+                 codec: CommentaryCodec):
+        self.engine = engine
+        self.append_mode = append_mode
+        self.dimensions = dimensions
+        self.keys = keys
+        self.codec = codec
+        self.rows: Dict[str, int] = {}
+        # Table -> [bytes before, bytes after] of the frames narrowed on write (see dtype_policy.py)
+        self.dtype_savings: Dict[str, List[int]] = {}
+        self.match_ids: List[int] = []
+
+    def write(self, tables: Dict[str, pd.DataFrame]):
+        # Venue, team, official and series rows are only here when new or changed;
+        # they are upserted by key and never replaced wholesale
+        dimension_rows = {t: df for t, df in tables.items() if t in DIMENSION_KEYS and not df.empty}
+        if dimension_rows:
+            with self.engine.begin() as conn:
+                for table_name, df in dimension_rows.items():
+                    self.rows[table_name] = self.rows.get(table_name, 0) + self.dimensions.store(conn, table_name, df)
+
+        for table_name, df in tables.items():
+            if df.empty or table_name in DIMENSION_KEYS:
+                continue
+            # Replace mode replaces each table on its first write of the run
+            first_write = table_name not in self.rows
+            if first_write and self.append_mode and table_name == 'live_commentary':
+                # Tables created before commentary classification lack its columns
+                ensure_classification_columns(self.engine)
+            if_exists = 'replace' if first_write and not self.append_mode else 'append'
+            if table_name in FACT_TABLES:
+                # Scorecard rows are stored with team and player keys (see entity_keys.py)
+                with self.engine.begin() as conn:
+                    write_fact_rows(conn, table_name, df, self.keys, if_exists, savings=self.dtype_savings)
+            elif table_name == 'live_commentary':
+                # Text is stored compactly (see commentary_codec.py); the frames keep it for the steps below
+                with self.engine.begin() as conn:
+                    write_commentary_frame(conn, table_name, df, self.codec, if_exists, savings=self.dtype_savings)
+            else:
+                # Narrow integer and category columns (see dtype_policy.py)
+                write_frame(self.engine, table_name, df, if_exists, savings=self.dtype_savings)
+            self.rows[table_name] = self.rows.get(table_name, 0) + len(df)
+
+        # Keep the integer-coded deliveries table in step with the commentary
+        if not tables['live_commentary'].empty:
+            store_deliveries(self.engine, tables['live_commentary'])
+
+        # Pre-render the match's Live Scores card, then tell the dashboard's
+        # shared match cache it changed
+        match_info = tables['live_match_info']
+        if not match_info.empty:
+            match_ids = match_info['match_id'].tolist()
+            write_match_snapshots(self.engine, {**tables, **self.dimensions.frames(match_ids)})
+            bump_match_versions(self.engine, match_ids)
+            self.match_ids.extend(match_ids)
+
+    def written_tables(self) -> List[str]:
+        for table_name in TABLE_COLUMNS:
+            if table_name in self.rows:
+                logger.info(f"✓ Stored {self.rows[table_name]} rows in '{table_name}' table")
+            elif table_name in DIMENSION_KEYS:
+                logger.info(f"✓ '{table_name}' unchanged")
+            else:
+                logger.warning(f"⚠ No data for '{table_name}' table. Skipped.")
+        log_savings(self.dtype_savings)
+        return list(self.rows)
+
+def fetch_and_store_all(append_mode: bool = False, fetch_player_data: bool = True, fetch_commentary: bool = True, debug_mode: bool = False,
+                        scorecards: Optional[ScorecardEngine] = None, dimensions: Optional[DimensionCache] = None,
+                        keys: Optional[KeyResolver] = None, codec: Optional[CommentaryCodec] = None):
     """
     Fetch live cricket data from API and store in MySQL database.
+
+    Matches stream through three stages joined by bounded queues: a fetch
+    thread calls /scard and /comm, a parse thread flattens the responses,
+    and this thread writes each match's rows as soon as they are parsed.
     
     Args:
         append_mode: If True, append to existing tables. If False, replace tables.
         fetch_player_data: Whether to fetch detailed player statistics (slower)
         fetch_commentary: Whether to fetch ball-by-ball commentary
         debug_mode: If True, save API responses to files for debugging
+        scorecards: Scorecard state kept between polls (see run_live_loop); None fetches every /scard
+        dimensions: Venue/team/official/series rows already stored (see run_live_loop);
+            None starts from what the database holds
+        keys: Team and player keys already resolved (see run_live_loop); None looks them up again
+        codec: Commentary templates and player keys already known (see run_live_loop)
     """
     logger.info("=" * 60)
     logger.info("Starting Cricbuzz Data Pipeline")
     logger.info("=" * 60)
     
     # Fetch live matches
-    data = fetch_api_data(API_ENDPOINTS['live_matches'], "live matches", save_debug=debug_mode)
+    data = fetch_api_data(API_ENDPOINTS['live_matches'], "live matches", save_debug=debug_mode,
+                          raw_key=('live', None))
     if not data:
         logger.error("Failed to fetch live matches data")
         return
 
-    # Flatten and structure data
-    try:
-        tables = flatten_json(data, fetch_player_data=fetch_player_data, fetch_commentary=fetch_commentary)
-    except Exception as e:
-        logger.error(f"Error flattening JSON: {e}", exc_info=True)
-        return
+    matches_list, match_scores_dict = list_matches(data)
+    logger.info(f"Found {len(matches_list)} matches to process")
+    matches = []
+    for match in matches_list:
+        match_id = MATCH_KEY_FIELDS.extract(match)[MATCH_ID]
+        if not match_id:
+            logger.warning("Skipping match without matchId")
+            continue
+        matches.append((match, match_scores_dict.get(match_id, {}), match_id))
+
+    if dimensions is None:
+        dimensions = DimensionCache()
+    if keys is None:
+        keys = KeyResolver()
+    if codec is None:
+        codec = CommentaryCodec()
+
+    # One fetch time for the whole poll
+    fetched_at = datetime.now()
+    fetched = queue.Queue(maxsize=LIVE_PIPELINE_QUEUE)
+    parsed = queue.Queue(maxsize=LIVE_PIPELINE_QUEUE)
+    stop = threading.Event()
+    stages = [
+        threading.Thread(
+            target=_run_stage, name='live-fetch', daemon=True,
+            args=('Fetch', matches,
+                  lambda m: fetch_match(*m, fetch_player_data=fetch_player_data,
+                                        fetch_commentary=fetch_commentary, scorecards=scorecards),
+                  fetched, stop)
+        ),
+        threading.Thread(
+            target=_run_stage, name='live-parse', daemon=True,
+            args=('Parse', _drain(fetched, stop),
+                  lambda item: parse_match(item, fetched_at, scorecards, dimensions), parsed, stop)
+        ),
+    ]
 
     # Connect to MySQL and store data
     try:
         with get_db_engine() as engine:
             logger.info("Connected to MySQL database")
+            live_ids = [match_id for _, _, match_id in matches]
+            dimensions.load(engine, live_ids)
+            writer = LiveTableWriter(engine, append_mode, dimensions, keys, codec)
+            for stage in stages:
+                stage.start()
+            try:
+                for tables in _drain(parsed, stop):
+                    writer.write(tables)
+            finally:
+                stop.set()
+                for stage in stages:
+                    stage.join()
+
+            written_tables = writer.written_tables()
+            if scorecards is not None:
+                scorecards.retain(live_ids)
+            dimensions.retain(live_ids)
+            if writer.match_ids and not append_mode:
+                prune_match_snapshots(engine, writer.match_ids)
+                # Replace mode keeps only live matches, as the other live tables do
+                written_tables += [t for t in prune_dimension_rows(engine, live_ids) if t not in written_tables]
+
+            # Refresh analytics summaries
+            refresh_summaries(engine, written_tables)
+
+            # Append newly completed matches to the derived analytics tables
+            derived_ids = derive_completed_matches(engine)
+            if derived_ids:
+                refresh_summaries(engine, list(DERIVED_TABLE_DDL))
+                # Fold their scorecards into the per-year career totals Most_runs reads
+                update_career_ledger(engine, derived_ids)
 
-            if_exists_mode = 'append' if append_mode else 'replace'
-            
-            for table_name, df in tables.items():
-                if not df.empty:
-                    # Remove duplicates based on natural keys
-                    if table_name == 'live_match_info':
-                        df = df.drop_duplicates(subset=['match_id'], keep='last')
-                    elif table_name == 'live_venues':
-                        df = df.drop_duplicates(subset=['match_id', 'venue_id'], keep='last')
-                    elif table_name == 'live_teams':
-                        df = df.drop_duplicates(subset=['match_id', 'team_id'], keep='last')
-                    elif table_name == 'live_batting_stats':
-                        df = df.drop_duplicates(subset=['match_id', 'innings_id', 'batsman_id'], keep='last')
-                    elif table_name == 'live_bowling_stats':
-                        df = df.drop_duplicates(subset=['match_id', 'innings_id', 'bowler_id'], keep='last')
-                    elif table_name == 'live_partnerships':  # NEW
-                        df = df.drop_duplicates(subset=['match_id', 'innings_id', 'bat1_id', 'bat2_id'], keep='last')
-                    elif table_name == 'live_commentary':
-                        df = df.drop_duplicates(subset=['match_id', 'innings', 'timestamp', 'ball_number'], keep='last')
-                    else:
-                        df = df.drop_duplicates()
-                    
-                    df.to_sql(
-                        table_name, 
-                        con=engine, 
-                        if_exists=if_exists_mode, 
-                        index=False,
-                        chunksize=1000
-                    )
-                    logger.info(f"✓ Stored {len(df)} rows in '{table_name}' table")
-                else:
-                    logger.warning(f"⚠ No data for '{table_name}' table. Skipped.")
+            # Hand the analytics tables to the DuckDB backend
+            snapshot_tables(engine, written_tables + (list(DERIVED_TABLE_DDL) if derived_ids else []))
 
             logger.info("=" * 60)
             logger.info("Data pipeline completed successfully!")
@@ -639,11 +995,35 @@ def fetch_and_store_all(append_mode: bool = False, fetch_player_data: bool = Tru
         logger.error(f"Database error: {e}", exc_info=True)
         raise
 
+def run_live_loop(poll_seconds: int, **kwargs):
+    """
+    Run fetch_and_store_all every poll_seconds, keeping scorecards in memory between polls
+    so each live match's /scard is only refetched every SCARD_RECONCILE_SECONDS, the
+    stored venue/team/official/series rows so unchanged ones are not rewritten, and the
+    resolved team and player keys and commentary templates.
+    """
+    scorecards = ScorecardEngine()
+    dimensions = DimensionCache()
+    keys = KeyResolver()
+    codec = CommentaryCodec()
+    while True:
+        started = time.monotonic()
+        try:
+            fetch_and_store_all(scorecards=scorecards, dimensions=dimensions, keys=keys, codec=codec, **kwargs)
+        except Exception as e:
+            logger.error(f"✗ Poll failed: {e}")
+        time.sleep(max(0.0, poll_seconds - (time.monotonic() - started)))
+
 if __name__ == "__main__":
-    # Run with all features enabled
-    fetch_and_store_all(
+    # Run with all features enabled; LIVE_POLL_SECONDS > 0 keeps polling
+    poll_seconds = int(os.getenv('LIVE_POLL_SECONDS', 0))
+    options = dict(
         append_mode=False, 
         fetch_player_data=True, 
         fetch_commentary=True,
         debug_mode=False
-    )
\ No newline at end of file
+    )
+    if poll_seconds > 0:
+        run_live_loop(poll_seconds, **options)
+    else:
+        fetch_and_store_all(**options)
\ No newline at end of file
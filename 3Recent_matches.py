@@ -4,6 +4,8 @@ from sqlalchemy import create_engine
 import schedule
 import time
 from datetime import datetime
+from summary_tables import refresh_summaries
+from analytics_engine import snapshot_tables
 
 DB_CONFIG = {
     'host': 'localhost',
@@ -83,6 +85,7 @@ def fetch_and_store():
                 team2_score = extract_score(score.get('team2Score'))
                 
                 rows.append({
+                    'Match_Id': info.get('matchId'),
                     'Match_Type': match_type,
                     'Series_Name': series_name,
                     'Team_1': team1,
@@ -105,6 +108,8 @@ def fetch_and_store():
         with engine.connect() as connection:
             df.to_sql('recent_matches', con=connection, if_exists='replace', index=False)
         print(f"Data updated in database. {len(df)} matches stored.")
+        refresh_summaries(engine, ['recent_matches'])
+        snapshot_tables(engine, ['recent_matches'])
         
         print("\nRecent matches sample:")
         print(df[['Team_1', 'Team_2', 'Status', 'Team_1_Score', 'Team_2_Score']].head())
@@ -1,5 +1,7 @@
 import requests
 import pymysql
+from sqlalchemy import create_engine
+from summary_tables import refresh_summaries
 
 # --- DB CONFIG ---
 DB_CONFIG = {
@@ -82,4 +84,9 @@ for pid in player_ids:
         insert_player_info(player_data)
         print(f"✅ Inserted {pid}")
      else:
-         print(f"❌ Failed to insert {pid}")
\ No newline at end of file
+         print(f"❌ Failed to insert {pid}")
+
+# player_info names the pairs in the batting partnership summary
+engine = create_engine(f"mysql+pymysql://{DB_CONFIG['user']}:{DB_CONFIG['password']}@{DB_CONFIG['host']}:{DB_CONFIG['port']}/{DB_CONFIG['database']}")
+refresh_summaries(engine, ['player_info'])
+engine.dispose()
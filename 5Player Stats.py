@@ -1,6 +1,10 @@
 import requests
 import pymysql
 import time
+from sqlalchemy import create_engine
+from summary_tables import refresh_summaries
+from analytics_engine import snapshot_tables
+from stats_grid import BATTING_STATS, BOWLING_STATS, decode_stat_matrices, nested_stats
 
 # Database config
 DB_CONFIG = {
@@ -72,109 +76,16 @@ def setup_database():
     conn.close()
     print("✅ Database recreated with new schema")
 
-def get_all_format_stats(batting_data):
-    headers = batting_data.get("headers", [])
-    
-    # Skip ROWHEADER, get actual format columns
-    format_headers = [h for h in headers[1:] if h.upper() not in ['ROWHEADER']]
-    
-    # Create stats for each format
-    all_stats = {}
-    for i, format_name in enumerate(format_headers, 1):  # Start from index 1
-        all_stats[format_name] = {}
-    
-    # Extract stats for each row
-    for row in batting_data.get("values", []):
-        values = row.get("values", [])
-        if len(values) > len(format_headers):
-            stat_name = values[0].lower()
-            
-            # For each format, get the value
-            for i, format_name in enumerate(format_headers, 1):
-                if len(values) > i:
-                    value = values[i]
-                    
-                    if stat_name == "matches":
-                        all_stats[format_name]['matches'] = int(value) if value.isdigit() else 0
-                    elif stat_name == "innings":
-                        all_stats[format_name]['innings'] = int(value) if value.isdigit() else 0
-                    elif stat_name == "runs":
-                        all_stats[format_name]['runs'] = int(value) if value.isdigit() else 0
-                    elif stat_name == "balls":
-                        all_stats[format_name]['balls'] = int(value) if value.isdigit() else 0
-                    elif stat_name == "highest":
-                        all_stats[format_name]['highest'] = str(value)
-                    elif stat_name == "average":
-                        all_stats[format_name]['average'] = float(value) if value.replace('.','').replace('-','').isdigit() else 0.0
-                    elif stat_name == "sr":
-                        all_stats[format_name]['strike_rate'] = float(value) if value.replace('.','').replace('-','').isdigit() else 0.0
-                    elif stat_name == "not out":
-                        all_stats[format_name]['not_out'] = int(value) if value.isdigit() else 0
-                    elif stat_name == "fours":
-                        all_stats[format_name]['fours'] = int(value) if value.isdigit() else 0
-                    elif stat_name == "sixes":
-                        all_stats[format_name]['sixes'] = int(value) if value.isdigit() else 0
-                    elif stat_name == "ducks":
-                        all_stats[format_name]['ducks'] = int(value) if value.isdigit() else 0
-                    elif stat_name == "50s":
-                        all_stats[format_name]['fifties'] = int(value) if value.isdigit() else 0
-                    elif stat_name == "100s":
-                        all_stats[format_name]['hundreds'] = int(value) if value.isdigit() else 0
-                    elif stat_name == "200s":
-                        all_stats[format_name]['two_hundreds'] = int(value) if value.isdigit() else 0
-                    elif stat_name == "300s":
-                        all_stats[format_name]['three_hundreds'] = int(value) if value.isdigit() else 0
-                    elif stat_name == "400s":
-                        all_stats[format_name]['four_hundreds'] = int(value) if value.isdigit() else 0
-    
-    return all_stats
+def get_all_format_stats(batting_grids):
+    """
+    Batting stats for many players in one pass.
+    {player_id: batting response} -> {player_id: {format: {column: value}}} (see stats_grid.BATTING_STATS)
+    """
+    return nested_stats(decode_stat_matrices(batting_grids, BATTING_STATS, key_name='player_id'))
 
-def get_bowling_stats(bowling_data):
-    headers = bowling_data.get("headers", [])
-    
-    # Skip ROWHEADER, get actual format columns
-    format_headers = [h for h in headers[1:] if h.upper() not in ['ROWHEADER']]
-    
-    # Create bowling stats for each format
-    bowling_stats = {}
-    for i, format_name in enumerate(format_headers, 1):
-        bowling_stats[format_name] = {}
-    
-    # Extract bowling stats for each row
-    for row in bowling_data.get("values", []):
-        values = row.get("values", [])
-        if len(values) > len(format_headers):
-            stat_name = values[0].lower()
-            
-            # For each format, get the value
-            for i, format_name in enumerate(format_headers, 1):
-                if len(values) > i:
-                    value = values[i]
-                    
-                    if stat_name == "wickets":
-                        bowling_stats[format_name]['wickets'] = int(value) if value.isdigit() else 0
-                    elif stat_name == "avg":  # Changed from "average" to "avg"
-                        bowling_stats[format_name]['bowling_average'] = float(value) if value.replace('.','').replace('-','').isdigit() else 0.0
-                    elif stat_name == "sr":
-                        bowling_stats[format_name]['bowling_strike_rate'] = float(value) if value.replace('.','').replace('-','').isdigit() else 0.0
-                    elif stat_name == "eco":  # Changed from "econ" to "eco"
-                        bowling_stats[format_name]['economy_rate'] = float(value) if value.replace('.','').replace('-','').isdigit() else 0.0
-                    elif stat_name == "balls":
-                        # Calculate overs from balls (6 balls = 1 over)
-                        balls_count = int(value) if value.isdigit() else 0
-                        bowling_stats[format_name]['overs_bowled'] = round(balls_count / 6, 1)
-                    elif stat_name == "maidens":
-                        bowling_stats[format_name]['maidens'] = int(value) if value.isdigit() else 0
-                    elif stat_name == "runs":
-                        bowling_stats[format_name]['runs_conceded'] = int(value) if value.isdigit() else 0
-                    elif stat_name == "bbi":  # Best bowling in innings
-                        bowling_stats[format_name]['best_bowling'] = str(value) if value != "-/-" else "0/0"
-                    elif stat_name == "5w":
-                        bowling_stats[format_name]['five_wickets'] = int(value) if value.isdigit() else 0
-                    elif stat_name == "10w":
-                        bowling_stats[format_name]['ten_wickets'] = int(value) if value.isdigit() else 0
-    
-    return bowling_stats
+def get_bowling_stats(bowling_grids):
+    """Bowling stats for many players in one pass; the balls row is stored as overs_bowled."""
+    return nested_stats(decode_stat_matrices(bowling_grids, BOWLING_STATS, key_name='player_id'))
     
 
 def merge_stats(batting_stats, bowling_stats):
@@ -253,6 +164,12 @@ def main():
     setup_database()
     
     player_ids = [25, 104, 1413, 38, 102, 101, 35, 213, 29, 576, 27, 265, 247, 240, 105, 34, 36, 370, 3864, 3531]
+    saved_ids = []
+    
+    # Fetch every player first, then decode all the stat grids in one pass
+    player_names = {}
+    batting_grids = {}
+    bowling_grids = {}
     
     for player_id in player_ids:
         try:
@@ -273,38 +190,15 @@ def main():
             
             if info_response.status_code == 200:
                 player_info = info_response.json()
-                player_name = player_info.get("name", "Unknown")
-                
-                # Initialize stats
-                batting_stats = {}
-                bowling_stats = {}
+                player_names[player_id] = player_info.get("name", "Unknown")
                 
                 # Get batting stats
                 if batting_response.status_code == 200:
-                    batting_data = batting_response.json()
-                    batting_stats = get_all_format_stats(batting_data)
+                    batting_grids[player_id] = batting_response.json()
                 
                 # Get bowling stats
                 if bowling_response.status_code == 200:
-                    bowling_data = bowling_response.json()
-                    bowling_stats = get_bowling_stats(bowling_data)
-                
-                # Merge batting and bowling stats
-                all_format_stats = merge_stats(batting_stats, bowling_stats)
-                
-                if all_format_stats:
-                    save_player_stats(player_id, player_name, all_format_stats)
-                    
-                    # Show summary of all formats
-                    formats_summary = []
-                    for fmt, stats in all_format_stats.items():
-                        runs = stats.get('runs', 0)
-                        wickets = stats.get('wickets', 0)
-                        formats_summary.append(f"{fmt}: {runs} runs, {wickets} wickets")
-                    
-                    print(f"✅ {player_name}: {', '.join(formats_summary)}")
-                else:
-                    print(f"⚠️ No stats available for {player_name}")
+                    bowling_grids[player_id] = bowling_response.json()
             else:
                 print(f"❌ Failed for player {player_id}")
                 if info_response.status_code != 200:
@@ -315,6 +209,43 @@ def main():
         except Exception as e:
             print(f"❌ Error with player {player_id}: {e}")
     
+    all_batting_stats = get_all_format_stats(batting_grids)
+    all_bowling_stats = get_bowling_stats(bowling_grids)
+    
+    for player_id, player_name in player_names.items():
+        try:
+            # Merge batting and bowling stats
+            all_format_stats = merge_stats(
+                all_batting_stats.get(player_id, {}),
+                all_bowling_stats.get(player_id, {})
+            )
+            
+            if all_format_stats:
+                save_player_stats(player_id, player_name, all_format_stats)
+                saved_ids.append(player_id)
+                
+                # Show summary of all formats
+                formats_summary = []
+                for fmt, stats in all_format_stats.items():
+                    runs = stats.get('runs', 0)
+                    wickets = stats.get('wickets', 0)
+                    formats_summary.append(f"{fmt}: {runs} runs, {wickets} wickets")
+                
+                print(f"✅ {player_name}: {', '.join(formats_summary)}")
+            else:
+                print(f"⚠️ No stats available for {player_name}")
+        
+        except Exception as e:
+            print(f"❌ Error with player {player_id}: {e}")
+    
+    # setup_database() recreated player_stats, so the summaries are rebuilt in full
+    if saved_ids:
+        engine = create_engine(f"mysql+pymysql://{DB_CONFIG['user']}:{DB_CONFIG['password']}@{DB_CONFIG['host']}:{DB_CONFIG['port']}/{DB_CONFIG['database']}")
+        refresh_summaries(engine, ['player_stats'])
+        snapshot_tables(engine, ['player_stats'])
+        engine.dispose()
+        print(f"✅ Refreshed analytics summaries for {len(saved_ids)} players")
+    
     print("Done!")
 
 if __name__ == "__main__":
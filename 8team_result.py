@@ -72,6 +72,7 @@ def fetch_team_results():
             team2_score = extract_score(score.get("team2Score"))
 
             rows.append({
+                "Match_Id": info.get("matchId"),
                 "Series_Name": series_name,
                 "Match_Type": match_type,
                 "Team_1": team1,
@@ -1,13 +1,16 @@
+import argparse
 import requests
 import pandas as pd
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, inspect, text
 from datetime import datetime
 import logging
-import time
 from typing import List, Dict, Optional
 import os
 from dotenv import load_dotenv
-from collections import defaultdict
+from analytics_engine import snapshot_tables
+from backfill_support import BACKFILL_WORKERS, JobCheckpoint, RateLimiter, job_keys, run_jobs
+from career_ledger import lookup_career_stats, update_career_ledger
+from stats_grid import FLOAT, INT, STR, decode_stat_rows, to_records
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -40,16 +43,49 @@ MATCH_FORMATS = {
     4: 'T20'
 }
 
-# Configuration for strike rate fetching
-FETCH_STRIKE_RATES = True  # Set to False to skip strike rate calculation
-SR_PLAYER_LIMIT = 15  # Number of top players per year to fetch strike rates for
-MAX_MATCHES_TO_FETCH = 30  # Maximum recent matches to process
+# Shared by every fetch_stats() call, including concurrent backfill workers
+API_RATE_LIMIT = RateLimiter()
+BACKFILL_CHECKPOINT = os.getenv('MOST_RUNS_CHECKPOINT', 'most_runs_backfill.sqlite')
 
-def fetch_stats(stats_type: str, year: str, format_type: int = 0) -> Optional[dict]:
-    """Fetch cricket statistics from Cricbuzz API."""
+# Strike rates and economies come from the career ledger (career_ledger.py), which
+# only covers matches this project has ingested
+FETCH_STRIKE_RATES = True  # Set to False to skip the ledger lookup
+
+# topstats grid cells by position (see stats_grid.py)
+TOPSTATS_BATTING_COLUMNS = [
+    ('player_id', INT), ('player_name', STR), ('matches', INT),
+    ('innings', INT), ('runs', INT), ('average', FLOAT),
+]
+TOPSTATS_BOWLING_COLUMNS = [
+    ('player_id', INT), ('player_name', STR), ('matches', INT),
+    ('overs', FLOAT), ('wickets', INT), ('average', FLOAT),
+]
+
+def parse_topstats(data: dict, columns: list, year: str, format_type: int, stats_type: str, **extra) -> List[Dict]:
+    """Decode a topstats grid into records tagged with year, format, stats type and any extra columns."""
+    if not data or 'values' not in data:
+        return []
+    
+    df = decode_stat_rows(data, columns)
+    df.insert(0, 'stats_type', stats_type)
+    df.insert(0, 'format', MATCH_FORMATS[format_type])
+    df.insert(0, 'year', int(year))
+    for column, value in extra.items():
+        df[column] = value
+    df['fetched_at'] = datetime.now()
+    return to_records(df)
+
+def fetch_stats(stats_type: str, year: str, format_type: int = 0, raise_errors: bool = False) -> Optional[dict]:
+    """
+    Fetch cricket statistics from Cricbuzz API.
+
+    Returns None if the stats don't exist for that year/format (HTTP 500). Other
+    failures also return None unless raise_errors is set, so a backfill can retry them.
+    """
     url = f"https://cricbuzz-cricket.p.rapidapi.com/stats/v1/topstats/{format_type}"
     querystring = {"statsType": stats_type, "year": year}
     
+    API_RATE_LIMIT.wait()
     try:
         response = requests.get(url, headers=HEADERS, params=querystring, timeout=30)
         response.raise_for_status()
@@ -60,259 +96,45 @@ def fetch_stats(stats_type: str, year: str, format_type: int = 0) -> Optional[di
             logger.warning(f"⚠ {stats_type} not available for {year}/{MATCH_FORMATS[format_type]}")
         else:
             logger.error(f"✗ Error fetching {stats_type} for {year}: {e}")
+            if raise_errors:
+                raise
         return None
     except requests.exceptions.RequestException as e:
         logger.error(f"✗ Error fetching {stats_type} for {year}: {e}")
+        if raise_errors:
+            raise
         return None
 
-def fetch_recent_matches() -> List[int]:
-    """Fetch recent match IDs."""
-    url = "https://cricbuzz-cricket.p.rapidapi.com/matches/v1/recent"
-    
-    try:
-        response = requests.get(url, headers=HEADERS, timeout=30)
-        response.raise_for_status()
-        data = response.json()
-        
-        match_ids = []
-        if 'typeMatches' in data:
-            for type_match in data['typeMatches']:
-                if 'seriesMatches' in type_match:
-                    for series in type_match['seriesMatches']:
-                        if 'seriesAdWrapper' in series:
-                            matches = series['seriesAdWrapper'].get('matches', [])
-                            for match in matches:
-                                if 'matchInfo' in match:
-                                    match_info = match['matchInfo']
-                                    if 'matchId' in match_info:
-                                        match_ids.append(match_info['matchId'])
-        
-        return match_ids
-    except Exception as e:
-        logger.warning(f"Could not fetch recent matches: {e}")
-        return []
+def parse_batting_stats(data: dict, year: str, format_type: int, stats_type: str) -> List[Dict]:
+    """Parse batting statistics from API response."""
+    return parse_topstats(data, TOPSTATS_BATTING_COLUMNS, year, format_type, stats_type, strike_rate=None)
 
-def fetch_match_scorecard(match_id: int) -> Optional[dict]:
-    """Fetch detailed scorecard for a match."""
-    url = f"https://cricbuzz-cricket.p.rapidapi.com/mcenter/v1/{match_id}/scard"
-    
-    try:
-        response = requests.get(url, headers=HEADERS, timeout=30)
-        response.raise_for_status()
-        return response.json()
-    except Exception as e:
-        logger.debug(f"Could not fetch scorecard for match {match_id}")
-        return None
+def enrich_with_strike_rates(engine, batting_records: List[Dict], bowling_records: List[Dict]):
+    """Fill batting strike rates and bowling economies for every player from the career ledger."""
+    for kind, records, column in (('batting', batting_records, 'strike_rate'),
+                                  ('bowling', bowling_records, 'economy')):
+        # One indexed lookup per (year, format) covering all of its players
+        groups = {}
+        for record in records:
+            groups.setdefault((record['year'], record['format']), []).append(record)
 
-def extract_player_batting_from_scorecard(scorecard: dict) -> Dict[int, Dict]:
-    """Extract batting statistics for all players from a scorecard."""
-    player_stats = {}
-    
-    if not scorecard or 'scoreCard' not in scorecard:
-        return player_stats
-    
-    try:
-        for inning in scorecard.get('scoreCard', []):
-            if 'batTeamDetails' not in inning:
+        matched = 0
+        for (year, format_name), group in groups.items():
+            ledger = lookup_career_stats(engine, kind, [r.get('player_id') for r in group], year, format_name)
+            if ledger.empty:
                 continue
-            
-            bat_team = inning['batTeamDetails']
-            if 'batsmenData' not in bat_team:
-                continue
-            
-            for bat_id_str, bat_data in bat_team['batsmenData'].items():
-                try:
-                    # Try to extract player ID from the key
-                    player_id = int(bat_id_str) if bat_id_str.isdigit() else None
-                    
-                    # If player_id is not directly available, try from batId
-                    if not player_id and 'batId' in bat_data:
-                        player_id = int(bat_data['batId'])
-                    
-                    if not player_id:
-                        continue
-                    
-                    runs = int(bat_data.get('runs', 0))
-                    balls = int(bat_data.get('balls', 0))
-                    
-                    if player_id not in player_stats:
-                        player_stats[player_id] = {
-                            'runs': 0,
-                            'balls': 0,
-                            'innings': 0,
-                            'name': bat_data.get('batName', '')
-                        }
-                    
-                    player_stats[player_id]['runs'] += runs
-                    player_stats[player_id]['balls'] += balls
-                    if balls > 0:
-                        player_stats[player_id]['innings'] += 1
-                        
-                except (ValueError, KeyError, TypeError) as e:
-                    continue
-    except Exception as e:
-        logger.debug(f"Error parsing scorecard: {e}")
-    
-    return player_stats
+            values = ledger[column].dropna().to_dict()
+            for record in group:
+                if record.get('player_id') in values:
+                    record[column] = values[record['player_id']]
+                    matched += 1
 
-def calculate_strike_rates_from_matches(player_ids: List[int]) -> Dict[int, float]:
-    """Calculate strike rates for players by fetching match scorecards."""
-    logger.info(f"  📊 Fetching match data to calculate strike rates...")
-    
-    # Get recent matches
-    match_ids = fetch_recent_matches()
-    
-    if not match_ids:
-        logger.warning(f"  ⚠ No matches found")
-        return {}
-    
-    # Limit matches to avoid too many API calls
-    match_ids = match_ids[:MAX_MATCHES_TO_FETCH]
-    logger.info(f"  Processing {len(match_ids)} recent matches...")
-    
-    # Aggregate player stats across matches
-    aggregated_stats = defaultdict(lambda: {'runs': 0, 'balls': 0, 'innings': 0, 'name': ''})
-    
-    successful_fetches = 0
-    for i, match_id in enumerate(match_ids):
-        if i > 0 and i % 10 == 0:
-            logger.info(f"    Progress: {i}/{len(match_ids)} matches processed...")
-        
-        scorecard = fetch_match_scorecard(match_id)
-        if not scorecard:
-            time.sleep(0.3)
-            continue
-        
-        successful_fetches += 1
-        player_data = extract_player_batting_from_scorecard(scorecard)
-        
-        # Aggregate stats for target players
-        for player_id, stats in player_data.items():
-            if player_id in player_ids:
-                aggregated_stats[player_id]['runs'] += stats['runs']
-                aggregated_stats[player_id]['balls'] += stats['balls']
-                aggregated_stats[player_id]['innings'] += stats['innings']
-                if not aggregated_stats[player_id]['name']:
-                    aggregated_stats[player_id]['name'] = stats['name']
-        
-        time.sleep(0.5)  # Rate limiting
-    
-    logger.info(f"  ✓ Successfully fetched {successful_fetches} scorecards")
-    
-    # Calculate strike rates
-    strike_rates = {}
-    for player_id, stats in aggregated_stats.items():
-        if stats['balls'] > 0:
-            strike_rate = (stats['runs'] / stats['balls']) * 100
-            strike_rates[player_id] = round(strike_rate, 2)
-            logger.debug(f"    {stats['name']}: SR={strike_rate:.2f} ({stats['runs']} runs, {stats['balls']} balls)")
-    
-    if strike_rates:
-        logger.info(f"  ✓ Calculated strike rates for {len(strike_rates)} players")
-    else:
-        logger.warning(f"  ⚠ Could not calculate any strike rates")
-    
-    return strike_rates
-
-def parse_batting_stats(data: dict, year: str, format_type: int, stats_type: str) -> List[Dict]:
-    """Parse batting statistics from API response."""
-    records = []
-    
-    if not data or 'values' not in data:
-        return records
-    
-    for player_data in data.get('values', []):
-        values = player_data.get('values', [])
-        
-        if not values or len(values) < 6:
-            continue
-        
-        try:
-            record = {
-                'year': int(year),
-                'format': MATCH_FORMATS[format_type],
-                'stats_type': stats_type,
-                'player_id': int(values[0]) if values[0] and values[0].isdigit() else None,
-                'player_name': values[1] if len(values) > 1 else None,
-                'matches': int(values[2]) if len(values) > 2 and values[2].isdigit() else None,
-                'innings': int(values[3]) if len(values) > 3 and values[3].isdigit() else None,
-                'runs': int(values[4]) if len(values) > 4 and values[4].isdigit() else None,
-                'average': float(values[5]) if len(values) > 5 and values[5].replace('.','').replace('-','').isdigit() else None,
-                'strike_rate': None,
-                'fetched_at': datetime.now()
-            }
-            records.append(record)
-        except (ValueError, IndexError) as e:
-            logger.warning(f"Error parsing player data: {e}")
-            continue
-    
-    return records
-
-def enrich_with_strike_rates(batting_records: List[Dict]) -> List[Dict]:
-    """Enrich batting records with strike rates from match data."""
-    if not batting_records or not FETCH_STRIKE_RATES:
-        return batting_records
-    
-    # Sort by runs and get top players
-    sorted_records = sorted(batting_records, key=lambda x: x.get('runs', 0), reverse=True)
-    top_players = sorted_records[:SR_PLAYER_LIMIT]
-    player_ids = [p['player_id'] for p in top_players if p.get('player_id')]
-    
-    if not player_ids:
-        return batting_records
-    
-    logger.info(f"  🎯 Targeting top {len(player_ids)} run-scorers for strike rate calculation")
-    
-    # Fetch strike rates
-    strike_rates = calculate_strike_rates_from_matches(player_ids)
-    
-    # Merge strike rates back into records
-    matched = 0
-    for record in batting_records:
-        player_id = record.get('player_id')
-        if player_id and player_id in strike_rates:
-            record['strike_rate'] = strike_rates[player_id]
-            matched += 1
-    
-    if matched:
-        logger.info(f"  ✅ Successfully added strike rates for {matched}/{len(player_ids)} players")
-    else:
-        logger.warning(f"  ⚠ Could not match any strike rates")
-    
-    return batting_records
+        if records:
+            logger.info(f"  ✅ Ledger {column}: {matched}/{len(records)} {kind} records")
 
 def parse_bowling_stats(data: dict, year: str, format_type: int, stats_type: str) -> List[Dict]:
     """Parse bowling statistics from API response."""
-    records = []
-    
-    if not data or 'values' not in data:
-        return records
-    
-    for player_data in data.get('values', []):
-        values = player_data.get('values', [])
-        
-        if not values or len(values) < 6:
-            continue
-        
-        try:
-            record = {
-                'year': int(year),
-                'format': MATCH_FORMATS[format_type],
-                'stats_type': stats_type,
-                'player_id': int(values[0]) if values[0] and values[0].isdigit() else None,
-                'player_name': values[1] if len(values) > 1 else None,
-                'matches': int(values[2]) if len(values) > 2 and values[2].isdigit() else None,
-                'overs': float(values[3]) if len(values) > 3 and values[3].replace('.','').isdigit() else None,
-                'wickets': int(values[4]) if len(values) > 4 and values[4].isdigit() else None,
-                'average': float(values[5]) if len(values) > 5 and values[5].replace('.','').replace('-','').isdigit() else None,
-                'fetched_at': datetime.now()
-            }
-            records.append(record)
-        except (ValueError, IndexError) as e:
-            logger.warning(f"Error parsing bowler data: {e}")
-            continue
-    
-    return records
+    return parse_topstats(data, TOPSTATS_BOWLING_COLUMNS, year, format_type, stats_type, economy=None)
 
 def fetch_all_yearly_stats(start_year: int = 2020, end_year: int = 2025, formats: List[int] = [0]):
     """Fetch all batting and bowling stats for specified years and formats."""
@@ -324,10 +146,7 @@ def fetch_all_yearly_stats(start_year: int = 2020, end_year: int = 2025, formats
     logger.info("=" * 60)
     logger.info(f"Years: {start_year} to {end_year}")
     logger.info(f"Formats: {[MATCH_FORMATS[f] for f in formats]}")
-    logger.info(f"Strike Rate Calculation: {'ENABLED' if FETCH_STRIKE_RATES else 'DISABLED'}")
-    if FETCH_STRIKE_RATES:
-        logger.info(f"  → Top {SR_PLAYER_LIMIT} players per year")
-        logger.info(f"  → Processing up to {MAX_MATCHES_TO_FETCH} recent matches")
+    logger.info(f"Strike Rates from Career Ledger: {'ENABLED' if FETCH_STRIKE_RATES else 'DISABLED'}")
     logger.info("=" * 60)
     
     for year in range(start_year, end_year + 1):
@@ -344,13 +163,8 @@ def fetch_all_yearly_stats(start_year: int = 2020, end_year: int = 2025, formats
             if batting_data:
                 batting_records = parse_batting_stats(batting_data, year_str, format_type, 'mostRuns')
                 logger.info(f"    → Fetched {len(batting_records)} batting records")
-                
-                # Enrich with strike rates from match data
-                if FETCH_STRIKE_RATES and batting_records:
-                    batting_records = enrich_with_strike_rates(batting_records)
             
             all_batting_stats.extend(batting_records)
-            time.sleep(1)
             
             # Fetch bowling stats
             bowling_data = fetch_stats('mostWickets', year_str, format_type)
@@ -358,24 +172,30 @@ def fetch_all_yearly_stats(start_year: int = 2020, end_year: int = 2025, formats
                 bowling_records = parse_bowling_stats(bowling_data, year_str, format_type, 'mostWickets')
                 all_bowling_stats.extend(bowling_records)
                 logger.info(f"    → Fetched {len(bowling_records)} bowling records")
-            
-            time.sleep(1)
     
     return all_batting_stats, all_bowling_stats
 
+def create_db_engine():
+    connection_string = (
+        f"mysql+mysqlconnector://{DB_CONFIG['user']}:{DB_CONFIG['password']}"
+        f"@{DB_CONFIG['host']}:{DB_CONFIG['port']}/{DB_CONFIG['database']}"
+    )
+    return create_engine(connection_string, pool_pre_ping=True)
+
 def store_stats_in_db(batting_stats: List[Dict], bowling_stats: List[Dict]):
     """Store statistics in MySQL database."""
     try:
-        connection_string = (
-            f"mysql+mysqlconnector://{DB_CONFIG['user']}:{DB_CONFIG['password']}"
-            f"@{DB_CONFIG['host']}:{DB_CONFIG['port']}/{DB_CONFIG['database']}"
-        )
-        engine = create_engine(connection_string, pool_pre_ping=True)
+        engine = create_db_engine()
         
         logger.info("\n" + "=" * 60)
         logger.info("💾 Storing data in database")
         logger.info("=" * 60)
         
+        if FETCH_STRIKE_RATES:
+            # Catch up on any derived matches first, then read every player's rates
+            update_career_ledger(engine)
+            enrich_with_strike_rates(engine, batting_stats, bowling_stats)
+        
         if batting_stats:
             df_batting = pd.DataFrame(batting_stats)
             df_batting = df_batting.drop_duplicates(
@@ -409,18 +229,116 @@ def store_stats_in_db(batting_stats: List[Dict], bowling_stats: List[Dict]):
             )
             logger.info(f"✓ Stored {len(df_bowling)} bowling stats records")
         
+        snapshot_tables(engine, ['yearly_batting_stats', 'yearly_bowling_stats'])
         engine.dispose()
         
     except Exception as e:
         logger.error(f"❌ Database error: {e}")
         raise
 
+# statsType -> (table, parser, ledger kind)
+BACKFILL_STATS = {
+    'mostRuns': ('yearly_batting_stats', parse_batting_stats, 'batting'),
+    'mostWickets': ('yearly_bowling_stats', parse_bowling_stats, 'bowling'),
+}
+
+def replace_stats_slice(engine, table_name: str, records: List[Dict], year: int, format_name: str) -> int:
+    """Replace one year/format of a yearly stats table with `records`, in one transaction."""
+    df = pd.DataFrame(records).drop_duplicates(subset=['year', 'format', 'player_id'], keep='last')
+    with engine.begin() as conn:
+        inspector = inspect(conn)
+        if inspector.has_table(table_name):
+            # Tables written before a column was added (e.g. economy) get it now
+            existing = {column['name'] for column in inspector.get_columns(table_name)}
+            for column in df.columns.difference(list(existing)):
+                conn.execute(text(f"ALTER TABLE `{table_name}` ADD COLUMN `{column}` DOUBLE"))
+            conn.execute(
+                text(f"DELETE FROM `{table_name}` WHERE year = :year AND format = :format"),
+                {'year': year, 'format': format_name}
+            )
+        df.to_sql(table_name, con=conn, if_exists='append', index=False)
+    return len(df)
+
+def backfill_yearly_stats(start_year: int, end_year: int, formats: List[int],
+                          workers: int = BACKFILL_WORKERS, checkpoint_path: str = BACKFILL_CHECKPOINT,
+                          restart: bool = False) -> Dict[str, int]:
+    """
+    Fetch every (year, format, statsType) concurrently and store each one as soon as it arrives.
+
+    Calls share API_RATE_LIMIT. Each job replaces its own year/format slice of
+    yearly_batting_stats or yearly_bowling_stats and is then checkpointed in
+    checkpoint_path, so rerunning after a crash only fetches what is missing
+    (restart=True starts over).
+    """
+    jobs = job_keys(
+        (stats_type, year, format_type)
+        for year in range(start_year, end_year + 1)
+        for format_type in formats
+        for stats_type in BACKFILL_STATS
+    )
+    checkpoint = JobCheckpoint(checkpoint_path)
+    if restart:
+        checkpoint.reset()
+    engine = create_db_engine()
+
+    logger.info("=" * 60)
+    logger.info(f"🏏 Backfill: {start_year}-{end_year}, formats {[MATCH_FORMATS[f] for f in formats]}, "
+                f"{workers} workers")
+    logger.info("=" * 60)
+
+    if FETCH_STRIKE_RATES:
+        update_career_ledger(engine)
+
+    def fetch(job):
+        stats_type, year, format_type = job
+        return fetch_stats(stats_type, str(year), format_type, raise_errors=True)
+
+    def store(job, data):
+        stats_type, year, format_type = job
+        table_name, parse, kind = BACKFILL_STATS[stats_type]
+        records = parse(data, str(year), format_type, stats_type)
+        if not records:
+            return 0
+        if FETCH_STRIKE_RATES:
+            enrich_with_strike_rates(engine, *((records, []) if kind == 'batting' else ([], records)))
+        return replace_stats_slice(engine, table_name, records, year, MATCH_FORMATS[format_type])
+
+    try:
+        stored = run_jobs(jobs, fetch, store, checkpoint=checkpoint, workers=workers)
+        if stored:
+            snapshot_tables(engine, ['yearly_batting_stats', 'yearly_bowling_stats'])
+    finally:
+        checkpoint.close()
+        engine.dispose()
+
+    logger.info(f"✅ Backfill stored {sum(stored.values())} records from {len(stored)} jobs")
+    return stored
+
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fetch yearly most-runs / most-wickets stats")
+    parser.add_argument('--backfill', action='store_true',
+                        help="fetch concurrently, store each job as it finishes and resume from the checkpoint")
+    parser.add_argument('--start-year', type=int, default=2020)
+    parser.add_argument('--end-year', type=int, default=2025)
+    parser.add_argument('--formats', type=int, nargs='+', choices=list(MATCH_FORMATS), default=None,
+                        help="0=All 1=Test 2=ODI 3=T20I 4=T20 (default: 0, or all five with --backfill)")
+    parser.add_argument('--workers', type=int, default=BACKFILL_WORKERS)
+    parser.add_argument('--checkpoint', default=BACKFILL_CHECKPOINT)
+    parser.add_argument('--restart', action='store_true', help="ignore the checkpoint and fetch everything")
+    args = parser.parse_args()
+
+    if args.backfill:
+        backfill_yearly_stats(
+            args.start_year, args.end_year, args.formats or list(MATCH_FORMATS),
+            workers=args.workers, checkpoint_path=args.checkpoint, restart=args.restart
+        )
+        raise SystemExit(0)
+
     # Fetch stats from 2020 to 2025 for all formats
     batting_stats, bowling_stats = fetch_all_yearly_stats(
-        start_year=2020,
-        end_year=2025,
-        formats=[0]  # 0 = All formats combined
+        start_year=args.start_year,
+        end_year=args.end_year,
+        formats=args.formats or [0]  # 0 = All formats combined
     )
     
     # Store in database
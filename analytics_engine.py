@@ -0,0 +1,201 @@
+"""
+Optional DuckDB analytics backend for the SQL Analytics page.
+
+After each ingest the analytics tables are snapshotted from MySQL into a local
+Parquet store. Dashboard queries over those tables then run in an in-process
+DuckDB instead of scanning InnoDB while the ingesters are writing to it.
+Everything degrades to the MySQL path when duckdb is not installed, a table has
+no snapshot yet, or DuckDB cannot run a query.
+"""
+import json
+import logging
+import os
+import re
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+import pandas as pd
+
+try:
+    import duckdb
+except ImportError:
+    duckdb = None
+
+logger = logging.getLogger(__name__)
+
+ANALYTICS_DIR = os.getenv('ANALYTICS_DIR', 'analytics_store')
+# Set ANALYTICS_BACKEND=mysql to keep every query on MySQL
+ANALYTICS_BACKEND = os.getenv('ANALYTICS_BACKEND', 'duckdb').lower()
+MANIFEST_FILE = 'manifest.json'
+
+# Tables the SQL Analytics queries read
+SNAPSHOT_TABLES = [
+    'player_info',
+    'player_stats',
+    'yearly_batting_stats',
+    'yearly_bowling_stats',
+    'recent_matches',
+    'series_list',
+    'venues',
+    'venue_matches',
+    'live_partnerships',
+    'matches',
+    'live_matches',
+    'partnerships',
+    'player_batting_stats',
+    'player_bowling_stats',
+]
+
+TABLE_REF = re.compile(r'\b(?:FROM|JOIN)\s+`?(\w+)`?', re.IGNORECASE)
+
+# MySQL-only syntax used by the dashboard queries -> DuckDB equivalents
+DIALECT_REWRITES = [
+    (re.compile(r'\bCURDATE\(\)', re.IGNORECASE), 'CURRENT_DATE'),
+    (re.compile(r'\bDATE_SUB\(\s*([^,]+?)\s*,\s*(INTERVAL\s+\d+\s+\w+)\s*\)', re.IGNORECASE), r'(\1 - \2)'),
+    (re.compile(r'\bAS\s+UNSIGNED\b', re.IGNORECASE), 'AS UBIGINT'),
+    (re.compile(r'\bAS\s+SIGNED\b', re.IGNORECASE), 'AS BIGINT'),
+    # MySQL compares with a case-insensitive collation
+    (re.compile(r'\bLIKE\b', re.IGNORECASE), 'ILIKE'),
+]
+
+DUCKDB_MACROS = [
+    """
+    CREATE OR REPLACE MACRO substring_index(s, delim, n) AS
+        CASE WHEN n >= 0
+            THEN array_to_string(string_split(s, delim)[1:n], delim)
+            ELSE array_to_string(string_split(s, delim)[n:], delim)
+        END
+    """,
+]
+
+
+def is_enabled() -> bool:
+    """Whether analytics queries should try DuckDB first."""
+    return duckdb is not None and ANALYTICS_BACKEND == 'duckdb'
+
+
+def _snapshot_path(table_name: str) -> str:
+    return os.path.join(ANALYTICS_DIR, f"{table_name}.parquet")
+
+
+def load_manifest() -> Dict[str, str]:
+    """Return {table_name: snapshot time} for every snapshotted table."""
+    path = os.path.join(ANALYTICS_DIR, MANIFEST_FILE)
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_manifest(manifest: Dict[str, str]):
+    path = os.path.join(ANALYTICS_DIR, MANIFEST_FILE)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def snapshot_tables(engine, tables: Optional[Iterable[str]] = None) -> List[str]:
+    """
+    Copy MySQL tables into the local Parquet store.
+
+    Args:
+        engine: SQLAlchemy engine for the cricbuzz database
+        tables: tables that changed; only those in SNAPSHOT_TABLES are copied.
+                Defaults to every snapshot table.
+
+    Returns:
+        Names of the tables that were snapshotted.
+    """
+    if not is_enabled():
+        return []
+
+    wanted = [t for t in SNAPSHOT_TABLES if tables is None or t in set(tables)]
+    if not wanted:
+        return []
+
+    os.makedirs(ANALYTICS_DIR, exist_ok=True)
+    manifest = load_manifest()
+    done = []
+    con = duckdb.connect()
+    try:
+        for table_name in wanted:
+            try:
+                df = pd.read_sql(f"SELECT * FROM `{table_name}`", engine)
+            except Exception as e:
+                logger.debug(f"Skipping snapshot of '{table_name}': {e}")
+                continue
+
+            # Write next to the live file and swap, so readers never see a partial file
+            path = _snapshot_path(table_name)
+            tmp_path = f"{path}.tmp"
+            con.register('snapshot_df', df)
+            con.execute(f"COPY snapshot_df TO '{tmp_path}' (FORMAT PARQUET)")
+            con.unregister('snapshot_df')
+            os.replace(tmp_path, path)
+
+            manifest[table_name] = datetime.now().isoformat(timespec='seconds')
+            done.append(table_name)
+            logger.info(f"✓ Snapshotted {len(df)} rows of '{table_name}' for analytics")
+    finally:
+        con.close()
+
+    if done:
+        _save_manifest(manifest)
+    return done
+
+
+def to_duckdb_sql(sql: str) -> str:
+    """Rewrite the MySQL-specific bits of a dashboard query for DuckDB."""
+    for pattern, replacement in DIALECT_REWRITES:
+        sql = pattern.sub(replacement, sql)
+    return sql.strip().rstrip(';')
+
+
+def run_analytics_query(sql: str) -> Optional[pd.DataFrame]:
+    """
+    Run a read-only analytics query against the Parquet snapshots.
+
+    Returns None when the query has to go to MySQL instead: DuckDB is disabled,
+    a referenced table has no snapshot, or DuckDB rejects the query.
+    """
+    if not is_enabled():
+        return None
+
+    tables = set(TABLE_REF.findall(sql))
+    if not tables or not all(os.path.exists(_snapshot_path(t)) for t in tables):
+        return None
+
+    con = duckdb.connect()
+    try:
+        for macro in DUCKDB_MACROS:
+            con.execute(macro)
+        for table_name in tables:
+            path = _snapshot_path(table_name).replace("'", "''")
+            con.execute(f"CREATE VIEW {table_name} AS SELECT * FROM read_parquet('{path}')")
+        return con.execute(to_duckdb_sql(sql)).df()
+    except Exception as e:
+        logger.info(f"DuckDB could not run query, falling back to MySQL: {e}")
+        return None
+    finally:
+        con.close()
+
+
+if __name__ == "__main__":
+    # Snapshot every analytics table, e.g. after a manual load of the reference data
+    from dotenv import load_dotenv
+    from sqlalchemy import create_engine
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    load_dotenv()
+    engine = create_engine(
+        f"mysql+pymysql://{os.getenv('DB_USER', 'root')}:{os.getenv('DB_PASSWORD', 'Root')}"
+        f"@{os.getenv('DB_HOST', 'localhost')}:{os.getenv('DB_PORT', 3306)}/{os.getenv('DB_NAME', 'cricbuzz2')}"
+    )
+    if not is_enabled():
+        logger.warning("DuckDB analytics backend is disabled (install duckdb or set ANALYTICS_BACKEND=duckdb)")
+    snapshot_tables(engine)
+    engine.dispose()
@@ -0,0 +1,290 @@
+"""
+Archive the scorecards and commentary of many finished matches.
+
+Usage:
+    python archive_backfill.py --from venue_matches recent_matches team_results
+    python archive_backfill.py --file match_ids.txt [--workers 4] [--batch-size 50]
+
+Match ids come from the match_id columns of venue_matches (11Venue_matches.py),
+recent_matches (3Recent_matches.py) and team_results (8team_result.py), and/or
+a text file with ids separated by whitespace or commas. For every match it
+fetches the match header, /scard and /comm on a worker pool under one shared
+rate limit (backfill_support.py), and every --batch-size matches it writes:
+
+- match header, batting, bowling, partnerships and scorecard metadata
+  rows, appended to the live_* tables in the 2Live_match.py layout (parsed
+  by 2Live_match.parse_payload), with batting, bowling and partnership rows
+  stored against team and player keys (see entity_keys.py), and venue,
+  team, official and series rows upserted by match (see dimension_cache.py);
+- match headers into match_headers, and commentary lines into
+  match_commentary with their text stored compactly (see match_commentary.py,
+  commentary_codec.py), replacing any earlier rows of those matches;
+- their deliveries (see delivery_store.py).
+
+Every response is also kept in the raw archive (raw_archive.py), so the
+tables can be rebuilt later without refetching. Finished matches are
+recorded in a local SQLite job ledger after each batch is written, so an
+interrupted run resumes with the matches still missing.
+At the end the completed matches are derived into the analytics tables and
+the career ledger (derived_tables.py, career_ledger.py), which keep them
+after the next live run replaces the live_* tables.
+"""
+import argparse
+import importlib
+import logging
+import os
+import re
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+import pandas as pd
+
+from analytics_engine import snapshot_tables
+from backfill_support import BACKFILL_WORKERS, JobCheckpoint, RateLimiter, run_jobs
+from career_ledger import update_career_ledger
+from columnar import ColumnarBuilder
+from delivery_store import write_deliveries
+from derived_tables import DERIVED_TABLE_DDL, derive_completed_matches
+from dimension_cache import DIMENSION_KEYS, ensure_dimension_tables, write_dimension_rows
+from dtype_policy import write_frame
+from entity_keys import FACT_TABLES, KeyResolver, store_match_headers, write_fact_rows
+from commentary_codec import CommentaryCodec
+from match_commentary import commentary_rows, ensure_commentary_tables, store_commentary_rows
+from summary_tables import refresh_summaries
+
+live_match = importlib.import_module('2Live_match')
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_LEDGER = os.getenv('ARCHIVE_LEDGER', 'archive_backfill.sqlite')
+ARCHIVE_BATCH_SIZE = int(os.getenv('ARCHIVE_BATCH_SIZE', 50))
+
+MATCH_INFO_URL = "https://cricbuzz-cricket.p.rapidapi.com/mcenter/v1/{match_id}"
+
+# Tables that list matches, and the column holding their ids
+MATCH_ID_SOURCES = {
+    'venue_matches': 'match_id',
+    'recent_matches': 'Match_Id',
+    'team_results': 'Match_Id',
+}
+
+# live_* tables the archive appends to
+ARCHIVE_TABLES = [
+    'live_match_info', 'live_venues', 'live_teams', 'live_officials', 'live_series',
+    'live_batting_stats', 'live_bowling_stats', 'live_partnerships', 'live_scorecard_metadata',
+]
+
+
+def match_ids_from_tables(engine, sources: Iterable[str]) -> List[int]:
+    from sqlalchemy import text
+
+    match_ids = []
+    with engine.connect() as conn:
+        for table_name in sources:
+            column = MATCH_ID_SOURCES[table_name]
+            try:
+                rows = conn.execute(text(
+                    f"SELECT DISTINCT `{column}` FROM `{table_name}` WHERE `{column}` IS NOT NULL"
+                ))
+                found = [int(row[0]) for row in rows]
+            except Exception as e:
+                logger.warning(f"⚠ Could not read match ids from {table_name}: {e}")
+                continue
+            logger.info(f"✓ {len(found)} match ids from {table_name}")
+            match_ids.extend(found)
+    return match_ids
+
+
+def match_ids_from_file(path: str) -> List[int]:
+    with open(path) as f:
+        return [int(token) for token in re.split(r'[\s,]+', f.read()) if token.isdigit()]
+
+
+class MatchArchiver:
+    """Fetches one match's responses and buffers its rows until flush() writes a batch."""
+
+    def __init__(self, engine, scorecards: bool = True, commentary: bool = True,
+                 rate_limit: Optional[RateLimiter] = None):
+        self.engine = engine
+        self.scorecards = scorecards
+        self.commentary = commentary
+        self.rate_limit = rate_limit or RateLimiter()
+        self.keys = KeyResolver()
+        self.codec = CommentaryCodec()
+        self._reset()
+
+    @staticmethod
+    def _new_builders() -> Dict[str, ColumnarBuilder]:
+        return {
+            table_name: ColumnarBuilder(live_match.TABLE_COLUMNS[table_name])
+            for table_name in ARCHIVE_TABLES
+        }
+
+    def _reset(self):
+        self.builders = self._new_builders()
+        self.match_ids: List[int] = []
+        self.headers: List[dict] = []
+        self.commentary_rows: List[tuple] = []
+        self.commentary_lines: List[pd.DataFrame] = []
+
+    def _get(self, url: str, endpoint: str, match_id: int) -> Optional[dict]:
+        self.rate_limit.wait()
+        return live_match.fetch_api_data(url, f"{endpoint} {match_id}", raw_key=(endpoint, match_id))
+
+    def fetch(self, match_id: int) -> Dict[str, Optional[dict]]:
+        """Runs on a worker thread."""
+        info = self._get(MATCH_INFO_URL.format(match_id=match_id), 'match_info', match_id)
+        if not info:
+            # Without the header nothing can be dated or derived; retry on the next run
+            raise RuntimeError(f"no match info for {match_id}")
+        responses = {'match_info': info, 'scard': None, 'comm': None}
+        if self.scorecards:
+            responses['scard'] = self._get(
+                live_match.API_ENDPOINTS['match_scorecard'].format(match_id=match_id), 'scard', match_id
+            )
+        if self.commentary:
+            responses['comm'] = self._get(
+                live_match.API_ENDPOINTS['match_commentary'].format(match_id=match_id), 'comm', match_id
+            )
+        return responses
+
+    def store(self, match_id: int, responses: Dict[str, Optional[dict]]) -> int:
+        """Buffer one match's rows; returns how many were buffered."""
+        # Parse into the match's own builders, so a match that fails part-way adds nothing to the batch
+        builders = self._new_builders()
+        for endpoint in ('match_info', 'scard'):
+            if responses[endpoint]:
+                live_match.parse_payload(endpoint, responses[endpoint], match_id, builders)
+        header, rows, lines = commentary_rows(match_id, responses['match_info'], responses['comm'])
+        if not responses['comm']:
+            rows = []
+
+        buffered = sum(len(builder) for builder in builders.values()) + len(rows)
+        for table_name, builder in builders.items():
+            self.builders[table_name].extend(builder)
+        self.headers.append(header)
+        if rows:
+            self.commentary_rows.extend(rows)
+            self.commentary_lines.append(lines)
+        self.match_ids.append(match_id)
+        return buffered
+
+    def flush(self):
+        """
+        Write the buffered matches and their deliveries in one transaction.
+
+        A match archived again (--restart, or already in the live tables)
+        replaces its earlier rows instead of adding a second copy.
+        """
+        from sqlalchemy import bindparam, inspect, text
+
+        if not self.match_ids:
+            return
+        batch = {'fetched_at': datetime.now()}
+        try:
+            with self.engine.begin() as conn:
+                ensure_dimension_tables(conn)
+                ensure_commentary_tables(conn)
+                for table_name, builder in self.builders.items():
+                    df = builder.to_frame(batch if 'fetched_at' in builder.spec else None)
+                    if df.empty:
+                        continue
+                    if table_name in DIMENSION_KEYS:
+                        write_dimension_rows(conn, table_name, live_match.drop_duplicate_rows(table_name, df))
+                    elif table_name in FACT_TABLES:
+                        write_fact_rows(conn, table_name, df, self.keys, replace_matches=True)
+                    else:
+                        if inspect(conn).has_table(table_name):
+                            conn.execute(
+                                text(f"DELETE FROM {table_name} WHERE match_id IN :ids")
+                                .bindparams(bindparam('ids', expanding=True)),
+                                {'ids': [int(m) for m in df['match_id'].dropna().unique()]}
+                            )
+                        write_frame(conn, table_name, df)
+
+                store_match_headers(conn, self.headers, self.keys)
+                if self.commentary:
+                    conn.execute(
+                        text("DELETE FROM match_commentary WHERE match_id IN :ids")
+                        .bindparams(bindparam('ids', expanding=True)),
+                        {'ids': self.match_ids}
+                    )
+                    store_commentary_rows(conn, self.commentary_rows, self.codec)
+
+                # In the same transaction: a failure here must not leave the batch written but unrecorded
+                lines = [df for df in self.commentary_lines if not df.empty]
+                if lines:
+                    write_deliveries(conn, pd.concat(lines, ignore_index=True))
+            logger.info(f"✓ Archived {len(self.match_ids)} matches "
+                        f"({len(self.commentary_rows)} commentary lines)")
+        finally:
+            self._reset()
+
+
+def archive_matches(match_ids: Iterable[int], workers: int = BACKFILL_WORKERS,
+                    batch_size: int = ARCHIVE_BATCH_SIZE, ledger_path: str = ARCHIVE_LEDGER,
+                    scorecards: bool = True, commentary: bool = True, restart: bool = False) -> Dict[str, int]:
+    """
+    Archive every match not yet in the job ledger; returns match id (as str) -> rows written.
+    """
+    jobs = {str(match_id): match_id for match_id in dict.fromkeys(int(m) for m in match_ids)}
+    checkpoint = JobCheckpoint(ledger_path)
+    if restart:
+        checkpoint.reset()
+
+    with live_match.get_db_engine() as engine:
+        archiver = MatchArchiver(engine, scorecards=scorecards, commentary=commentary)
+        try:
+            stored = run_jobs(
+                jobs, archiver.fetch, archiver.store, checkpoint=checkpoint, workers=workers,
+                flush=archiver.flush, batch_size=batch_size
+            )
+        finally:
+            checkpoint.close()
+
+        if stored:
+            derived_ids = derive_completed_matches(engine)
+            if derived_ids:
+                refresh_summaries(engine, list(DERIVED_TABLE_DDL))
+                update_career_ledger(engine, derived_ids)
+            snapshot_tables(engine, ARCHIVE_TABLES + list(DERIVED_TABLE_DDL))
+
+    logger.info(f"✅ Archived {len(stored)} of {len(jobs)} matches")
+    return stored
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--from', dest='sources', nargs='+', choices=list(MATCH_ID_SOURCES), default=[],
+                        help="tables to take match ids from")
+    parser.add_argument('--file', help="file of match ids (whitespace or comma separated)")
+    parser.add_argument('--workers', type=int, default=BACKFILL_WORKERS)
+    parser.add_argument('--batch-size', type=int, default=ARCHIVE_BATCH_SIZE,
+                        help="matches written (and checkpointed) per transaction")
+    parser.add_argument('--ledger', default=ARCHIVE_LEDGER, help="SQLite job ledger for resuming")
+    parser.add_argument('--restart', action='store_true', help="ignore the job ledger and fetch everything")
+    parser.add_argument('--no-scorecards', action='store_true')
+    parser.add_argument('--no-commentary', action='store_true')
+    args = parser.parse_args()
+
+    if not args.sources and not args.file:
+        parser.error("give --from and/or --file")
+
+    match_ids = []
+    if args.file:
+        match_ids.extend(match_ids_from_file(args.file))
+    if args.sources:
+        with live_match.get_db_engine() as engine:
+            match_ids.extend(match_ids_from_tables(engine, args.sources))
+    if not match_ids:
+        logger.warning("⚠ No match ids to archive")
+        return
+
+    archive_matches(
+        match_ids, workers=args.workers, batch_size=args.batch_size, ledger_path=args.ledger,
+        scorecards=not args.no_scorecards, commentary=not args.no_commentary, restart=args.restart
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""
+Batched result reader for the dashboard.
+
+pd.read_sql buffers every row as a tuple of Python objects and then converts
+the whole result to pandas in one go. read_frame() streams the result through
+an unbuffered pymysql cursor instead. Rows still arrive from the driver as
+Python tuples; the transfer itself is not Arrow-native (that would need a
+driver such as ADBC or connectorx). What changes is what is kept:
+
+- results under ARROW_ROW_THRESHOLD rows become a DataFrame with
+  DataFrame.from_records(coerce_float=True), as before;
+- larger results are converted BATCH_SIZE rows at a time into typed pyarrow
+  arrays, so only one batch of tuples is alive at once, and the DataFrame is
+  built from the Arrow columns at the end.
+
+Both paths give the same dtypes (ints, floats, Decimals as floats like
+read_sql's coerce_float, datetimes, and the string dtype pandas infers), so a
+query's frame doesn't change type when its result crosses the threshold.
+Without pyarrow every result goes through from_records.
+"""
+import logging
+from typing import Callable, List, Optional, Sequence
+
+import pandas as pd
+
+# Imported on first use: pyarrow is slow to import and small results never need it
+pa = None
+
+logger = logging.getLogger(__name__)
+
+ARROW_ROW_THRESHOLD = 5000
+BATCH_SIZE = 5000
+
+# pymysql.constants.FIELD_TYPE codes
+INT_TYPES = {1, 2, 3, 8, 9, 13}        # TINY, SHORT, LONG, LONGLONG, INT24, YEAR
+FLOAT_TYPES = {4, 5}                   # FLOAT, DOUBLE
+DECIMAL_TYPES = {0, 246}               # DECIMAL, NEWDECIMAL
+
+
+def _load_pyarrow():
+    """Import pyarrow on demand; returns None when it is not installed."""
+    global pa
+    if pa is None:
+        try:
+            import pyarrow
+        except ImportError:
+            return None
+        pa = pyarrow
+    return pa
+
+
+def _to_arrow(values: Sequence, type_code: int):
+    """Build one Arrow column from a batch of cell values."""
+    if type_code in INT_TYPES:
+        return pa.array(values, type=pa.int64())
+    if type_code in FLOAT_TYPES:
+        return pa.array(values, type=pa.float64())
+    if type_code in DECIMAL_TYPES:
+        # Match pd.read_sql(coerce_float=True), which turns Decimals into floats
+        return pa.array(values).cast(pa.float64())
+    try:
+        return pa.array(values)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        return pa.array([None if v is None else str(v) for v in values], type=pa.string())
+
+
+def _batch_to_arrow(rows: List[tuple], columns: List[str], type_codes: List[int]):
+    arrays = [_to_arrow(values, code) for values, code in zip(zip(*rows), type_codes)]
+    return pa.RecordBatch.from_arrays(arrays, names=columns)
+
+
+def _records_string_dtype():
+    """The dtype from_records() gives string columns ('str' on pandas 3), or None for object."""
+    dtype = pd.DataFrame.from_records([('',)], columns=['s'])['s'].dtype
+    return dtype if isinstance(dtype, pd.api.extensions.ExtensionDtype) else None
+
+
+def _arrow_to_pandas(batches: list) -> pd.DataFrame:
+    # Batches may disagree on inferred types (e.g. a batch where a column is all NULL)
+    table = pa.concat_tables(
+        [pa.Table.from_batches([b]) for b in batches], promote_options='permissive'
+    )
+    # Strings get the same dtype as on the from_records() path
+    string_dtype = _records_string_dtype()
+    return table.to_pandas(types_mapper={pa.string(): string_dtype, pa.large_string(): string_dtype}.get)
+
+
+def read_frame(conn, sql: str, params=None, arrow_threshold: int = ARROW_ROW_THRESHOLD,
+               force_arrow: bool = False, max_rows: Optional[int] = None,
+               on_limit: Optional[Callable[[], None]] = None) -> pd.DataFrame:
+    """
+    Run a query on a pymysql connection and return a DataFrame.
+
+    Args:
+        conn: open pymysql connection (left open for the caller to close)
+        sql: query text, with %s placeholders for params
+        params: query parameters
+        arrow_threshold: results with at least this many rows are converted to
+            Arrow batch by batch; smaller ones use DataFrame.from_records
+        force_arrow: always convert through Arrow (used by the benchmark)
+        max_rows: stop reading after this many rows
+        on_limit: called once max_rows rows have been read, before the cursor
+            is closed. Closing an unbuffered cursor reads (and discards) the
+            rest of the result, so this is where the caller stops the query on
+            the server; errors from the stopped query are then ignored.
+    """
+    from pymysql.cursors import SSCursor
+
+    cursor = conn.cursor(SSCursor)
+    remaining = max_rows
+    try:
+        cursor.execute(sql, params)
+        if cursor.description is None:
+            return pd.DataFrame()
+        columns = [d[0] for d in cursor.description]
+        type_codes = [d[1] for d in cursor.description]
+
+        def fetch(size: int) -> list:
+            nonlocal remaining
+            if remaining is not None:
+                size = min(size, remaining)
+                if size <= 0:
+                    return []
+            rows = cursor.fetchmany(size)
+            if remaining is not None:
+                remaining -= len(rows)
+            return rows
+
+        first = fetch(1 if force_arrow else arrow_threshold)
+        if not force_arrow and len(first) < arrow_threshold:
+            return pd.DataFrame.from_records(first, columns=columns, coerce_float=True)
+        if _load_pyarrow() is None:
+            rows = list(first)
+            while True:
+                batch = fetch(BATCH_SIZE)
+                if not batch:
+                    break
+                rows.extend(batch)
+            return pd.DataFrame.from_records(rows, columns=columns, coerce_float=True)
+
+        batches = [_batch_to_arrow(first, columns, type_codes)] if first else []
+        while True:
+            rows = fetch(BATCH_SIZE)
+            if not rows:
+                break
+            batches.append(_batch_to_arrow(rows, columns, type_codes))
+
+        if not batches:
+            return pd.DataFrame(columns=columns)
+        return _arrow_to_pandas(batches)
+    finally:
+        if on_limit is not None and remaining is not None and remaining <= 0:
+            on_limit()
+            try:
+                cursor.close()
+            except Exception as e:
+                # e.g. "Query execution was interrupted" from the stopped query
+                logger.debug(f"Ignoring error closing a stopped query: {e}")
+        else:
+            cursor.close()
@@ -0,0 +1,146 @@
+"""
+Shared pieces for long, resumable API backfills.
+
+- RateLimiter spaces out API calls across all worker threads, replacing the
+  per-loop time.sleep() calls of the one-at-a-time fetchers.
+- JobCheckpoint records finished jobs in a local SQLite file, so a backfill
+  that dies halfway resumes where it stopped instead of starting over.
+- run_jobs() fans jobs out to a thread pool and hands each result back on
+  the calling thread as soon as it arrives, so results can be written to
+  MySQL one job (or one batch of jobs) at a time and checkpointed only
+  after they are stored.
+"""
+import logging
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, Hashable, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+API_CALLS_PER_SECOND = float(os.getenv('API_CALLS_PER_SECOND', 2))
+BACKFILL_WORKERS = int(os.getenv('BACKFILL_WORKERS', 4))
+
+
+class RateLimiter:
+    """Allows at most `calls_per_second` calls to start per second, across threads."""
+
+    def __init__(self, calls_per_second: float = API_CALLS_PER_SECOND):
+        self.interval = 1.0 / calls_per_second if calls_per_second > 0 else 0.0
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        """Block until the caller may make its call."""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class JobCheckpoint:
+    """Finished job keys in a local SQLite file; safe to share between threads."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS finished_jobs (
+                    job_key TEXT PRIMARY KEY,
+                    rows INTEGER,
+                    finished_at REAL
+                )
+            """)
+
+    def finished(self) -> set:
+        with self._lock:
+            return {row[0] for row in self._conn.execute("SELECT job_key FROM finished_jobs")}
+
+    def mark_finished(self, job_key: str, rows: int = 0):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO finished_jobs (job_key, rows, finished_at) VALUES (?, ?, ?)",
+                (job_key, rows, time.time())
+            )
+
+    def reset(self):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM finished_jobs")
+
+    def close(self):
+        self._conn.close()
+
+
+def run_jobs(jobs: Dict[str, Hashable], fetch: Callable, store: Callable,
+             checkpoint: Optional[JobCheckpoint] = None, workers: int = BACKFILL_WORKERS,
+             flush: Optional[Callable] = None, batch_size: int = 1) -> Dict[str, int]:
+    """
+    Run fetch(job) for every job not yet checkpointed and store each result as it arrives.
+
+    Args:
+        jobs: job key -> job passed to fetch()
+        fetch: runs on a worker thread; returns the job's result (None for nothing)
+        store: store(job, result) -> rows written; runs on the calling thread
+        checkpoint: finished jobs are skipped and newly stored ones recorded
+        workers: fetches in flight at once
+        flush: for stores that only buffer rows; called after every batch_size
+            stored jobs (and once at the end) to write them. Jobs are only
+            checkpointed once the flush that wrote them succeeds.
+
+    Returns:
+        job key -> rows stored, for the jobs stored in this run. Jobs whose
+        fetch, store or flush raised are logged and left for the next run.
+    """
+    done = checkpoint.finished() if checkpoint else set()
+    pending = {key: job for key, job in jobs.items() if key not in done}
+    logger.info(f"Backfill: {len(pending)} jobs to run, {len(jobs) - len(pending)} already finished")
+
+    stored: Dict[str, int] = {}
+    unflushed: Dict[str, int] = {}
+    failed = 0
+
+    def commit():
+        nonlocal failed
+        if flush and unflushed:
+            try:
+                flush()
+            except Exception as e:
+                failed += len(unflushed)
+                logger.error(f"✗ Backfill flush of {len(unflushed)} jobs failed: {e}")
+                unflushed.clear()
+                return
+        for key, rows in unflushed.items():
+            if checkpoint:
+                checkpoint.mark_finished(key, rows)
+            stored[key] = rows
+        unflushed.clear()
+
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix='backfill') as executor:
+        futures = {executor.submit(fetch, job): key for key, job in pending.items()}
+        for future in as_completed(futures):
+            key = futures[future]
+            try:
+                unflushed[key] = store(pending[key], future.result()) or 0
+            except Exception as e:
+                failed += 1
+                logger.error(f"✗ Backfill job {key} failed: {e}")
+                continue
+            if not flush or len(unflushed) >= batch_size:
+                commit()
+                logger.info(f"✓ Stored {len(stored)}/{len(pending)} jobs ({failed} failed)")
+        commit()
+
+    if failed:
+        logger.warning(f"⚠ {failed} backfill jobs failed; rerun to retry them")
+    return stored
+
+
+def job_keys(jobs: Iterable[tuple]) -> Dict[str, tuple]:
+    """Key tuple jobs as 'a:b:c' strings for JobCheckpoint."""
+    return {':'.join(str(part) for part in job): job for job in jobs}
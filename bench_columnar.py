@@ -0,0 +1,130 @@
+"""
+Benchmark: dict-per-row accumulation vs columnar.ColumnarBuilder.
+
+Usage:
+    python bench_columnar.py [--rows N] [--repeat N]
+
+Parses a synthetic commentary payload (the widest, most row-heavy live table)
+both ways and reports rows/s and peak Python heap (tracemalloc) for building
+the final DataFrame. No API or database access is needed.
+
+The columnar path also runs classify_commentary, as the live parser does. On
+100k balls it peaks at about a quarter of the dicts' heap but runs ~15% fewer
+rows/s, so the builder is a memory saving, not a speedup.
+"""
+import argparse
+import importlib
+import random
+import re
+import time
+import tracemalloc
+from datetime import datetime
+
+import pandas as pd
+
+from columnar import ColumnarBuilder
+from commentary_classifier import classify_commentary
+
+live_match = importlib.import_module('2Live_match')
+
+EVENTS = ['NONE', 'FOUR', 'SIX', 'WICKET', 'NONE', 'NONE']
+TEXTS = [
+    'no run, defended back to the bowler',
+    '1 run, pushed to long on',
+    'FOUR, driven through the covers',
+    'SIX, over long off',
+    'OUT! caught at slip',
+    '2 runs, worked into the gap',
+]
+
+
+def make_payload(rows: int) -> dict:
+    rng = random.Random(42)
+    comwrapper = []
+    for i in range(rows):
+        k = rng.randrange(len(TEXTS))
+        comwrapper.append({'commentary': {
+            'inningsid': 1 + i // 300,
+            'overnum': f"{(i % 300) // 6}.{i % 6 + 1}",
+            'ballnbr': i % 6 + 1,
+            'timestamp': 1700000000000 + i * 30000,
+            'eventtype': EVENTS[k],
+            'commtxt': f"Bowler to Batter, {TEXTS[k]}",
+            'batteamscore': i,
+            'tosswinnername': 'India',
+        }})
+    return {'comwrapper': comwrapper}
+
+
+def parse_dicts(payload: dict, match_id: int) -> pd.DataFrame:
+    """The previous approach: one dict and one datetime.now() per row."""
+    lines = []
+    for item in payload['comwrapper']:
+        comm = item.get('commentary', {})
+        comm_text = comm.get('commtxt', '')
+        event_type = comm.get('eventtype', '')
+        runs_scored = 0
+        if event_type == 'FOUR':
+            runs_scored = 4
+        elif event_type == 'SIX':
+            runs_scored = 6
+        else:
+            run_match = re.search(r'(\d+)\s+runs?', comm_text)
+            if run_match:
+                runs_scored = int(run_match.group(1))
+        lines.append({
+            'match_id': match_id,
+            'innings': live_match.safe_int(comm.get('inningsid')),
+            'over_number': live_match.safe_float(comm.get('overnum')),
+            'ball_number': live_match.safe_int(comm.get('ballnbr')),
+            'timestamp': live_match.safe_int(comm.get('timestamp')),
+            'event_type': event_type,
+            'commentary_text': comm_text,
+            'runs_scored': runs_scored,
+            'bat_team_score': live_match.safe_int(comm.get('batteamscore')),
+            'toss_winner': comm.get('tosswinnername'),
+            'fetched_at': datetime.now()
+        })
+    return pd.DataFrame(lines)
+
+
+def parse_columnar(payload: dict, match_id: int) -> pd.DataFrame:
+    builder = ColumnarBuilder(live_match.TABLE_COLUMNS['live_commentary'])
+    live_match.extract_commentary_data(payload, match_id, builder)
+    return classify_commentary(builder.to_frame({'fetched_at': datetime.now()}))
+
+
+def measure(label, parser, payload, repeat):
+    best_seconds, peak_bytes, rows = None, 0, 0
+    for _ in range(repeat):
+        tracemalloc.start()
+        started = time.perf_counter()
+        df = parser(payload, 1)
+        elapsed = time.perf_counter() - started
+        _, heap_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        rows = len(df)
+        best_seconds = elapsed if best_seconds is None else min(best_seconds, elapsed)
+        peak_bytes = max(peak_bytes, heap_peak)
+        del df
+
+    rate = rows / best_seconds if best_seconds else 0
+    print(f"  {label:<10} {rows:>9,} rows  {best_seconds * 1000:>9.1f} ms  "
+          f"{rate:>12,.0f} rows/s  peak {peak_bytes / 2**20:>8.1f} MiB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=200000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    payload = make_payload(args.rows)
+    print(f"\nlive_commentary ({args.rows:,} balls)")
+    measure('dicts', parse_dicts, payload, args.repeat)
+    measure('columnar', parse_columnar, payload, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
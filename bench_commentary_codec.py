@@ -0,0 +1,83 @@
+"""
+Benchmark: compact commentary storage size and encode/decode throughput.
+
+Usage:
+    python bench_commentary_codec.py [--lines N]
+
+Builds N synthetic commentary lines ("Bowler to Batter, outcome, description"),
+splits them into the commentary_codec.py columns, rebuilds them and checks
+the round trip, and reports bytes per line for raw TEXT against the compact
+columns (4-byte keys and template id plus text_z), with and without
+compression. No database access is needed.
+"""
+import argparse
+import random
+import time
+
+import commentary_codec
+from commentary_codec import join_commentary, split_commentary
+
+BOWLERS = ['Starc', 'Cummins', 'Hazlewood', 'Zampa', 'Bumrah', 'Siraj', 'Kuldeep', 'Jadeja']
+BATTERS = ['Rohit', 'Gill', 'Kohli', 'Iyer', 'Rahul', 'Head', 'Warner', 'Smith', 'Labuschagne']
+OUTCOMES = ['no run', '1 run', '2 runs', 'B0$ FOUR', 'B0$ SIX', 'wide', '1 leg bye', 'B0$ out Caught by Smith!!']
+DESCRIPTIONS = [
+    'short of a length outside off, defended solidly back to the bowler',
+    'full and wide, driven through the covers',
+    'on the pads, flicked fine to deep square leg',
+    'back of a length, pulled hard to deep midwicket',
+    'slower ball, mistimed towards long on',
+    'B1$ beaten outside off stump, the keeper collects',
+]
+
+
+def make_lines(count: int):
+    rng = random.Random(7)
+    lines = []
+    for i in range(count):
+        if i % 25 == 24:
+            lines.append(f"End of over {i // 25}: {rng.randrange(20)} runs, team at {rng.randrange(300)}/{rng.randrange(10)}")
+            continue
+        description = rng.choice(DESCRIPTIONS)
+        if rng.random() < 0.3:
+            description += f", {rng.choice(BATTERS)} looks to rotate the strike against {rng.choice(BOWLERS)}"
+        lines.append(f"{rng.choice(BOWLERS)} to {rng.choice(BATTERS)}, {rng.choice(OUTCOMES)}, {description}")
+    return lines
+
+
+def measure(label, func, count):
+    started = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - started
+    print(f"  {label:<22} {count:>9,} lines  {elapsed * 1000:>9.1f} ms  {count / elapsed:>11,.0f} lines/s")
+    return result
+
+
+def stored_bytes(parts) -> int:
+    """Bytes of the compact columns, counting each non-NULL key or id as an INT."""
+    ints = sum(parts[c].notna().sum() for c in ('bowler', 'batter', 'template')) * 4
+    return int(ints + parts['text_z'].dropna().map(len).sum())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--lines', type=int, default=200_000)
+    args = parser.parse_args()
+
+    lines = make_lines(args.lines)
+    raw = sum(len(line.encode('utf-8')) for line in lines)
+    print(f"\ncommentary codec ({args.lines:,} lines, {raw / args.lines:.1f} bytes/line as TEXT)")
+
+    for compress in (False, True):
+        commentary_codec.COMMENTARY_COMPRESS = compress
+        parts = measure(f"split ({'zdict' if compress else 'raw'})", lambda: split_commentary(lines), len(lines))
+        texts = measure(f"join ({'zdict' if compress else 'raw'})", lambda: join_commentary(parts), len(lines))
+        if texts != lines:
+            raise SystemExit("✗ Round trip changed the commentary")
+        size = stored_bytes(parts)
+        templates = parts['template'].nunique()
+        print(f"  stored: {size / args.lines:.1f} bytes/line ({raw / size:.1f}x smaller), "
+              f"{templates} templates")
+
+
+if __name__ == "__main__":
+    main()
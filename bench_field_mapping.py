@@ -0,0 +1,124 @@
+"""
+Benchmark: hand-written `.get() or .get()` chains vs compiled field mappings.
+
+Usage:
+    python bench_field_mapping.py [--rows N] [--repeat N]
+
+Extracts synthetic scorecard batting and bowling cards, half with lowercase
+and half with camelCase keys, both ways and reports the median rows/s. The two
+ways run alternately with the garbage collector paused, so neither pays for
+the other's garbage. No API or database access is needed.
+"""
+import argparse
+import gc
+import importlib
+import random
+import statistics
+import time
+
+from field_mapping import safe_float, safe_int
+
+live_match = importlib.import_module('2Live_match')
+
+
+def make_cards(rows: int):
+    rng = random.Random(42)
+    batting, bowling = [], []
+    for i in range(1, rows + 1):
+        runs, balls = rng.randrange(100), rng.randrange(1, 80)
+        if i % 2:
+            batting.append({'batId': i, 'batName': f"Batter {i}", 'runs': runs, 'balls': balls, 'fours': 2,
+                            'sixes': 1, 'strikeRate': f"{runs * 100 / balls:.2f}", 'outDesc': 'c x b y'})
+            bowling.append({'bowlId': i, 'bowlName': f"Bowler {i}", 'overs': '4', 'maidens': 0, 'runs': runs,
+                            'wickets': 1, 'economy': '7.50', 'no_balls': 1})
+        else:
+            batting.append({'id': i, 'name': f"Batter {i}", 'runs': runs, 'balls': balls, 'fours': 2,
+                            'sixes': 1, 'strkrate': f"{runs * 100 / balls:.2f}", 'outdec': 'c x b y'})
+            bowling.append({'id': i, 'name': f"Bowler {i}", 'overs': '4', 'maidens': 0, 'runs': runs,
+                            'wickets': 1, 'economy': '7.50', 'noballs': 1, 'wides': 2})
+    return batting, bowling
+
+
+def extract_chains(batting, bowling):
+    """The previous approach: one hand-written lookup chain per column."""
+    rows = []
+    for position, bat_card in enumerate(batting, start=1):
+        rows.append((
+            1, 1, 'Team',
+            safe_int(bat_card.get('id') or bat_card.get('batId')),
+            bat_card.get('name') or bat_card.get('batName'),
+            position,
+            safe_int(bat_card.get('runs')),
+            safe_int(bat_card.get('balls')),
+            safe_int(bat_card.get('fours')),
+            safe_int(bat_card.get('sixes')),
+            safe_float(bat_card.get('strkrate') or bat_card.get('strikeRate')),
+            bat_card.get('outdec') or bat_card.get('outDesc')
+        ))
+    for bowl_card in bowling:
+        rows.append((
+            1, 1, 'Team',
+            safe_int(bowl_card.get('id') or bowl_card.get('bowlId')),
+            bowl_card.get('name') or bowl_card.get('bowlName'),
+            safe_float(bowl_card.get('overs')),
+            safe_int(bowl_card.get('maidens')),
+            safe_int(bowl_card.get('runs')),
+            safe_int(bowl_card.get('wickets')),
+            safe_float(bowl_card.get('economy')),
+            safe_int(bowl_card.get('noballs') or bowl_card.get('no_balls', 0)),
+            safe_int(bowl_card.get('wides', 0))
+        ))
+    return rows
+
+
+def extract_compiled(batting, bowling):
+    batting_fields = live_match.FIELD_MAPPINGS['live_batting_stats'].extract
+    bowling_fields = live_match.FIELD_MAPPINGS['live_bowling_stats'].extract
+    rows = [batting_fields(bat_card, 1, 1, 'Team', position)
+            for position, bat_card in enumerate(batting, start=1)]
+    rows.extend(bowling_fields(bowl_card, 1, 1, 'Team') for bowl_card in bowling)
+    return rows
+
+
+def timed(extractor, cards):
+    gc.collect()
+    gc.disable()
+    try:
+        started = time.perf_counter()
+        rows = extractor(*cards)
+        return rows, time.perf_counter() - started
+    finally:
+        gc.enable()
+
+
+def measure(extractors, cards, repeat):
+    """Run each (label, extractor) `repeat` times, interleaved; returns the rows of each."""
+    seconds = {label: [] for label, _ in extractors}
+    rows = {}
+    for _ in range(repeat):
+        for label, extractor in extractors:
+            rows[label], elapsed = timed(extractor, cards)
+            seconds[label].append(elapsed)
+
+    for label, _ in extractors:
+        median = statistics.median(seconds[label])
+        rate = len(rows[label]) / median if median else 0
+        print(f"  {label:<10} {len(rows[label]):>9,} rows  {median * 1000:>9.1f} ms  {rate:>12,.0f} rows/s")
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=200000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    cards = make_cards(args.rows)
+    print(f"\nscorecard cards ({args.rows:,} batting + {args.rows:,} bowling)")
+    rows = measure([('chains', extract_chains), ('compiled', extract_compiled)], cards, args.repeat)
+    if rows['chains'] != rows['compiled']:
+        raise SystemExit("✗ Compiled mappings returned different rows")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Benchmark: raw archive append and rebuild throughput.
+
+Usage:
+    python bench_raw_archive.py [--matches N] [--workers N]
+
+Archives synthetic /scard and /comm responses for N matches into a
+temporary directory, then re-parses them into live table frames with one
+worker and with --workers processes, and reports responses/s and the
+compression ratio. No API or database access is needed.
+"""
+import argparse
+import random
+import tempfile
+import time
+
+from raw_archive import RawArchive, rebuild_frames
+
+
+def make_payloads(matches: int):
+    rng = random.Random(42)
+    for match_id in range(1, matches + 1):
+        batsmen = [{'id': i, 'name': f"Batter {i}", 'runs': rng.randrange(100), 'balls': rng.randrange(1, 80),
+                    'fours': 2, 'sixes': 1, 'strkrate': '120.5', 'outdec': 'c x b y'} for i in range(11)]
+        bowlers = [{'id': 100 + i, 'name': f"Bowler {i}", 'overs': '4', 'maidens': 0, 'runs': rng.randrange(50),
+                    'wickets': rng.randrange(4), 'economy': '7.5'} for i in range(6)]
+        yield 'scard', match_id, {'scorecard': [{'inningsId': 1, 'batTeamName': 'Team', 'batsman': batsmen,
+                                                 'bowler': bowlers, 'partnership': {'partnership': []}}]}
+        lines = [{'commentary': {'inningsid': 1, 'overnum': over + ball / 10, 'ballnbr': over * 6 + ball,
+                                 'timestamp': match_id * 1000 + over * 6 + ball, 'eventtype': 'NONE',
+                                 'commtxt': f"Bowler {over % 6} to Batter {ball}, {rng.randrange(7)} runs, driven"}}
+                 for over in range(20) for ball in range(1, 7)]
+        yield 'comm', match_id, {'comwrapper': lines}
+
+
+def measure(label, func, count, unit):
+    started = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - started
+    print(f"  {label:<22} {count:>7,} {unit}  {elapsed * 1000:>9.1f} ms  {count / elapsed:>10,.0f} {unit}/s")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--matches', type=int, default=500)
+    parser.add_argument('--workers', type=int, default=4)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as root:
+        archive = RawArchive(root)
+        payloads = list(make_payloads(args.matches))
+
+        print(f"\nraw archive ({len(payloads):,} responses, {archive.suffix})")
+        measure('append', lambda: [archive.append(e, p, match_id=m) for e, m, p in payloads],
+                len(payloads), 'responses')
+        stats = archive.stats()
+        print(f"  compression: {stats['raw_bytes'].sum():,} -> {stats['stored_bytes'].sum():,} bytes "
+              f"({stats['raw_bytes'].sum() / stats['stored_bytes'].sum():.1f}x)")
+
+        entries = archive.entries()
+        archive.close()
+        serial = measure('rebuild (1 worker)', lambda: rebuild_frames(root, entries, workers=1),
+                         len(entries), 'responses')
+        parallel = measure(f"rebuild ({args.workers} workers)",
+                           lambda: rebuild_frames(root, entries, workers=args.workers), len(entries), 'responses')
+        if {k: len(v) for k, v in serial.items()} != {k: len(v) for k, v in parallel.items()}:
+            raise SystemExit("✗ Parallel rebuild returned different row counts")
+
+
+if __name__ == "__main__":
+    main()
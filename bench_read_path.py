@@ -0,0 +1,87 @@
+"""
+Benchmark: pd.read_sql vs the Arrow read path in arrow_reader.read_frame.
+
+Both read the same Python tuples from pymysql; the Arrow path only differs in
+converting them batch by batch, so expect memory savings rather than a faster
+transfer.
+
+Usage:
+    python bench_read_path.py [table ...] [--repeat N]
+
+Reports rows/s and peak Python heap (tracemalloc) plus Arrow buffer memory for
+each table. Defaults to the wide tables the dashboard loads most often.
+"""
+import argparse
+import os
+import time
+import tracemalloc
+
+import pandas as pd
+import pymysql
+from dotenv import load_dotenv
+
+from arrow_reader import read_frame
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+load_dotenv()
+
+DB_CONFIG = {
+    'host': os.getenv('DB_HOST', 'localhost'),
+    'user': os.getenv('DB_USER', 'root'),
+    'database': os.getenv('DB_NAME', 'cricbuzz2'),
+    'password': os.getenv('DB_PASSWORD', 'Root'),
+    'port': int(os.getenv('DB_PORT', 3306))
+}
+
+DEFAULT_TABLES = ['live_match_info', 'player_stats', 'live_commentary', 'live_partnerships']
+
+
+def measure(label, reader, sql, repeat):
+    """Run reader(conn, sql) `repeat` times and return the best timing and memory."""
+    best_seconds, peak_bytes, rows = None, 0, 0
+    for _ in range(repeat):
+        conn = pymysql.connect(**DB_CONFIG)
+        try:
+            arrow_before = pa.total_allocated_bytes() if pa else 0
+            tracemalloc.start()
+            started = time.perf_counter()
+            df = reader(conn, sql)
+            elapsed = time.perf_counter() - started
+            _, heap_peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            arrow_bytes = (pa.total_allocated_bytes() - arrow_before) if pa else 0
+        finally:
+            conn.close()
+
+        rows = len(df)
+        best_seconds = elapsed if best_seconds is None else min(best_seconds, elapsed)
+        peak_bytes = max(peak_bytes, heap_peak + max(arrow_bytes, 0))
+        del df
+
+    rate = rows / best_seconds if best_seconds else 0
+    print(f"  {label:<10} {rows:>9,} rows  {best_seconds * 1000:>9.1f} ms  "
+          f"{rate:>12,.0f} rows/s  peak {peak_bytes / 2**20:>8.1f} MiB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('tables', nargs='*', default=DEFAULT_TABLES)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    if pa is None:
+        print("pyarrow is not installed; read_frame builds every result row by row")
+
+    for table_name in args.tables:
+        sql = f"SELECT * FROM `{table_name}`"
+        print(f"\n{table_name}")
+        measure('read_sql', lambda conn, q: pd.read_sql(q, conn), sql, args.repeat)
+        measure('arrow', lambda conn, q: read_frame(conn, q, force_arrow=True), sql, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Benchmark: stats_grid decoding throughput.
+
+Usage:
+    python bench_stats_grid.py [--players N] [--repeat N]
+
+Decodes synthetic player batting/bowling grids (stats/v1/player/{id}/...) and
+a topstats grid (stats/v1/topstats/...) with N players and reports players/s.
+No API or database access is needed.
+"""
+import argparse
+import random
+import time
+
+from stats_grid import (BATTING_STATS, BOWLING_STATS, FLOAT, INT, STR,
+                        decode_stat_matrices, decode_stat_rows, nested_stats)
+
+FORMATS = ['Test', 'ODI', 'T20', 'IPL']
+
+
+def make_grids(players: int):
+    rng = random.Random(42)
+
+    def cell(stat_name):
+        if rng.random() < 0.05:
+            return '-'
+        if stat_name in ('highest',):
+            return f"{rng.randrange(300)}*"
+        if stat_name in ('bbi',):
+            return f"{rng.randrange(10)}/{rng.randrange(100)}"
+        if stat_name in ('average', 'sr', 'avg', 'eco'):
+            return f"{rng.uniform(0, 150):.2f}"
+        return str(rng.randrange(20000))
+
+    def grid(stats):
+        return {
+            'headers': ['ROWHEADER'] + FORMATS,
+            'values': [{'values': [name.title()] + [cell(name) for _ in FORMATS]} for name in stats],
+        }
+
+    batting = {player_id: grid(BATTING_STATS) for player_id in range(players)}
+    bowling = {player_id: grid(BOWLING_STATS) for player_id in range(players)}
+    topstats = {'values': [
+        {'values': [str(player_id), f"Player {player_id}", cell('matches'), cell('innings'),
+                    cell('runs'), cell('average')]}
+        for player_id in range(players)
+    ]}
+    return batting, bowling, topstats
+
+
+def measure(label, decode, players, repeat):
+    best_seconds = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        decode()
+        elapsed = time.perf_counter() - started
+        best_seconds = elapsed if best_seconds is None else min(best_seconds, elapsed)
+
+    rate = players / best_seconds if best_seconds else 0
+    print(f"  {label:<18} {players:>7,} players  {best_seconds * 1000:>9.1f} ms  {rate:>12,.0f} players/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--players', type=int, default=2000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    batting, bowling, topstats = make_grids(args.players)
+    topstats_columns = [('player_id', INT), ('player_name', STR), ('matches', INT),
+                        ('innings', INT), ('runs', INT), ('average', FLOAT)]
+
+    print(f"\nstats grids ({args.players:,} players, {len(FORMATS)} formats)")
+    measure('batting matrix', lambda: nested_stats(decode_stat_matrices(batting, BATTING_STATS)),
+            args.players, args.repeat)
+    measure('bowling matrix', lambda: nested_stats(decode_stat_matrices(bowling, BOWLING_STATS)),
+            args.players, args.repeat)
+    measure('topstats rows', lambda: decode_stat_rows(topstats, topstats_columns), args.players, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
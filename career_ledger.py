@@ -0,0 +1,228 @@
+"""
+Per-player, per-format, per-year career totals built from ingested scorecards.
+
+Every completed match that reaches player_batting_stats / player_bowling_stats
+(see derived_tables) is folded into two running ledgers exactly once:
+
+- career_batting: innings, not outs, runs, balls, fours, sixes, ducks,
+  fifties, hundreds and highest score;
+- career_bowling: innings, balls, maidens, runs conceded and wickets.
+
+Folded matches are recorded in ledger_matches, so update_career_ledger()
+can be called after every ingest (or with no ids to catch up on history)
+without double counting. Strike rates, averages and economies are derived
+at lookup time from the primary key (player_id, format, year).
+"""
+import logging
+from typing import Iterable, List, Optional
+
+import pandas as pd
+from sqlalchemy import bindparam, text
+
+logger = logging.getLogger(__name__)
+
+CAREER_LEDGER_DDL = {
+    'ledger_matches': """
+        CREATE TABLE IF NOT EXISTS ledger_matches (
+            match_id BIGINT NOT NULL,
+            ledgered_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (match_id)
+        )
+    """,
+    'career_batting': """
+        CREATE TABLE IF NOT EXISTS career_batting (
+            player_id BIGINT NOT NULL,
+            format VARCHAR(10) NOT NULL,
+            year SMALLINT NOT NULL,
+            player_name VARCHAR(255),
+            innings INT NOT NULL DEFAULT 0,
+            not_outs INT NOT NULL DEFAULT 0,
+            runs INT NOT NULL DEFAULT 0,
+            balls INT NOT NULL DEFAULT 0,
+            fours INT NOT NULL DEFAULT 0,
+            sixes INT NOT NULL DEFAULT 0,
+            ducks INT NOT NULL DEFAULT 0,
+            fifties INT NOT NULL DEFAULT 0,
+            hundreds INT NOT NULL DEFAULT 0,
+            highest INT NOT NULL DEFAULT 0,
+            PRIMARY KEY (player_id, format, year),
+            INDEX idx_year_format (year, format)
+        )
+    """,
+    'career_bowling': """
+        CREATE TABLE IF NOT EXISTS career_bowling (
+            player_id BIGINT NOT NULL,
+            format VARCHAR(10) NOT NULL,
+            year SMALLINT NOT NULL,
+            player_name VARCHAR(255),
+            innings INT NOT NULL DEFAULT 0,
+            balls INT NOT NULL DEFAULT 0,
+            maidens INT NOT NULL DEFAULT 0,
+            runs_conceded INT NOT NULL DEFAULT 0,
+            wickets INT NOT NULL DEFAULT 0,
+            PRIMARY KEY (player_id, format, year),
+            INDEX idx_year_format (year, format)
+        )
+    """,
+}
+
+# Matches in the per-match tables that the ledgers haven't absorbed yet
+PENDING_MATCHES_SQL = """
+    SELECT DISTINCT b.match_id
+    FROM (
+        SELECT match_id FROM player_batting_stats
+        UNION SELECT match_id FROM player_bowling_stats
+    ) b
+    LEFT JOIN ledger_matches l ON l.match_id = b.match_id
+    WHERE l.match_id IS NULL
+"""
+
+# Each statement adds one group of matches to the running totals
+LEDGER_UPDATES = [
+    ('career_batting', """
+        INSERT INTO career_batting (
+            player_id, format, year, player_name, innings, not_outs, runs, balls,
+            fours, sixes, ducks, fifties, hundreds, highest
+        )
+        SELECT player_id, format, YEAR(match_date), MAX(player_name),
+            COUNT(*),
+            SUM(NOT is_out),
+            SUM(runs), SUM(balls_faced), SUM(fours), SUM(sixes),
+            SUM(is_out AND runs = 0),
+            SUM(runs >= 50 AND runs < 100),
+            SUM(runs >= 100),
+            MAX(runs)
+        FROM player_batting_stats
+        WHERE match_id IN :ids AND format IS NOT NULL AND match_date IS NOT NULL
+        GROUP BY player_id, format, YEAR(match_date)
+        ON DUPLICATE KEY UPDATE
+            player_name = VALUES(player_name),
+            innings = innings + VALUES(innings),
+            not_outs = not_outs + VALUES(not_outs),
+            runs = runs + VALUES(runs),
+            balls = balls + VALUES(balls),
+            fours = fours + VALUES(fours),
+            sixes = sixes + VALUES(sixes),
+            ducks = ducks + VALUES(ducks),
+            fifties = fifties + VALUES(fifties),
+            hundreds = hundreds + VALUES(hundreds),
+            highest = GREATEST(highest, VALUES(highest))
+    """),
+    ('career_bowling', """
+        INSERT INTO career_bowling (
+            player_id, format, year, player_name, innings, balls, maidens, runs_conceded, wickets
+        )
+        SELECT bowler_id, format, YEAR(match_date), MAX(bowler_name),
+            COUNT(*),
+            SUM(FLOOR(overs_bowled) * 6 + ROUND((overs_bowled - FLOOR(overs_bowled)) * 10)),
+            SUM(maidens), SUM(runs_conceded), SUM(wickets)
+        FROM player_bowling_stats
+        WHERE match_id IN :ids AND format IS NOT NULL AND match_date IS NOT NULL
+        GROUP BY bowler_id, format, YEAR(match_date)
+        ON DUPLICATE KEY UPDATE
+            player_name = VALUES(player_name),
+            innings = innings + VALUES(innings),
+            balls = balls + VALUES(balls),
+            maidens = maidens + VALUES(maidens),
+            runs_conceded = runs_conceded + VALUES(runs_conceded),
+            wickets = wickets + VALUES(wickets)
+    """),
+]
+
+# Derived figures per kind; format 'All' sums a player's formats for the year
+LOOKUP_SQL = {
+    'batting': """
+        SELECT player_id,
+            SUM(innings) AS ledger_innings,
+            SUM(runs) AS ledger_runs,
+            SUM(balls) AS ledger_balls,
+            ROUND(100 * SUM(runs) / NULLIF(SUM(balls), 0), 2) AS strike_rate,
+            ROUND(SUM(runs) / NULLIF(SUM(innings) - SUM(not_outs), 0), 2) AS ledger_average
+        FROM career_batting
+        WHERE year = :year AND player_id IN :ids {format_filter}
+        GROUP BY player_id
+    """,
+    'bowling': """
+        SELECT player_id,
+            SUM(innings) AS ledger_innings,
+            SUM(wickets) AS ledger_wickets,
+            SUM(balls) AS ledger_balls,
+            ROUND(6 * SUM(runs_conceded) / NULLIF(SUM(balls), 0), 2) AS economy,
+            ROUND(SUM(balls) / NULLIF(SUM(wickets), 0), 2) AS bowling_strike_rate
+        FROM career_bowling
+        WHERE year = :year AND player_id IN :ids {format_filter}
+        GROUP BY player_id
+    """,
+}
+
+
+def ensure_ledger_tables(conn):
+    for ddl in CAREER_LEDGER_DDL.values():
+        conn.execute(text(ddl))
+
+
+def update_career_ledger(engine, match_ids: Optional[Iterable[int]] = None) -> List[int]:
+    """
+    Fold completed matches into the career ledgers, skipping any already folded.
+
+    Args:
+        engine: SQLAlchemy engine for the cricbuzz database
+        match_ids: matches to add (e.g. derive_completed_matches() output);
+            None adds every derived match the ledgers haven't seen
+
+    Returns:
+        The match ids added in this run.
+    """
+    with engine.begin() as conn:
+        ensure_ledger_tables(conn)
+        try:
+            pending = {row[0] for row in conn.execute(text(PENDING_MATCHES_SQL))}
+        except Exception as e:
+            logger.warning(f"⚠ Derived tables not ready for the career ledger: {e}")
+            return []
+
+        new_ids = sorted(pending if match_ids is None else pending.intersection(match_ids))
+        if not new_ids:
+            return []
+
+        conn.execute(
+            text("INSERT IGNORE INTO ledger_matches (match_id) VALUES (:match_id)"),
+            [{'match_id': match_id} for match_id in new_ids]
+        )
+        for table_name, sql in LEDGER_UPDATES:
+            statement = text(sql).bindparams(bindparam('ids', expanding=True))
+            result = conn.execute(statement, {'ids': new_ids})
+            logger.info(f"✓ Updated {result.rowcount} rows of '{table_name}'")
+
+    logger.info(f"Career ledger updated with {len(new_ids)} matches")
+    return new_ids
+
+
+def lookup_career_stats(engine, kind: str, player_ids: Iterable[int], year: int,
+                        format_name: Optional[str] = None) -> pd.DataFrame:
+    """
+    Ledger totals and derived rates for some players in one year.
+
+    Args:
+        kind: 'batting' or 'bowling'
+        format_name: 'Test', 'ODI', 'T20I' or 'T20'; None or 'All' sums all formats
+
+    Returns:
+        DataFrame indexed by player_id (players without ledger rows are absent).
+    """
+    player_ids = sorted({int(p) for p in player_ids if p is not None})
+    if not player_ids:
+        return pd.DataFrame()
+
+    params = {'year': int(year), 'ids': player_ids}
+    format_filter = ''
+    if format_name and format_name != 'All':
+        format_filter = 'AND format = :format'
+        params['format'] = format_name
+
+    statement = text(LOOKUP_SQL[kind].format(format_filter=format_filter)).bindparams(
+        bindparam('ids', expanding=True)
+    )
+    with engine.connect() as conn:
+        df = pd.read_sql(statement, conn, params=params)
+    return df.set_index('player_id')
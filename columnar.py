@@ -0,0 +1,194 @@
+"""
+Column-oriented row accumulation for the API parsers.
+
+Building a dict per row and then pd.DataFrame(list_of_dicts) keeps every key
+string and boxed value alive until the end of the run and makes pandas infer
+each column again. ColumnarBuilder instead appends each value straight into a
+typed per-column array (int64/float64/bool buffers plus a null mask, Python
+lists only for text), fills per-batch columns such as fetched_at once, and
+hands the buffers to pandas or Arrow without copying.
+
+The gain is memory, not speed: bench_columnar.py shows a far lower peak heap
+than dicts, at a somewhat lower row rate.
+"""
+from array import array
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+# Column kinds: typed buffers, plain Python lists, and one value per batch
+INT = 'int'
+FLOAT = 'float'
+BOOL = 'bool'
+STR = 'str'
+OBJECT = 'object'
+BATCH = 'batch'
+
+_TYPECODES = {INT: 'q', FLOAT: 'd', BOOL: 'b'}
+_FILL = {INT: 0, FLOAT: float('nan'), BOOL: 0}
+_NUMPY_DTYPES = {'q': np.int64, 'd': np.float64, 'b': np.int8}
+
+
+class _Column:
+    """One column's values; typed columns fall back to a list if a value doesn't fit."""
+
+    __slots__ = ('kind', 'values', 'mask', 'demoted')
+
+    def __init__(self, kind: str):
+        self.kind = kind
+        self.demoted = False
+        if kind in _TYPECODES:
+            self.values = array(_TYPECODES[kind])
+            self.mask = bytearray()
+        else:
+            self.values = []
+            self.mask = None
+
+    def append(self, value):
+        if self.mask is None:
+            self.values.append(value)
+            return
+        if value is None:
+            self.mask.append(1)
+            self.values.append(_FILL[self.kind])
+            return
+        try:
+            self.values.append(value)
+        except (TypeError, OverflowError):
+            # OverflowError: an int beyond int64 (or a float column's range)
+            self._demote()
+            self.values.append(value)
+            return
+        self.mask.append(0)
+
+    def extend(self, other: '_Column'):
+        """Append another column's values; other is left unusable."""
+        if self.mask is not None and other.mask is not None:
+            self.values.extend(other.values)
+            self.mask.extend(other.mask)
+            return
+        if self.mask is not None:
+            self._demote()
+        if other.mask is not None:
+            other._demote()
+        self.values.extend(other.values)
+
+    def _demote(self):
+        """Unexpected value type (e.g. a string id): keep the column as Python objects."""
+        mask = self.mask
+        self.values = [None if mask[i] else v for i, v in enumerate(self.values)]
+        if self.kind == BOOL:
+            self.values = [None if v is None else bool(v) for v in self.values]
+        self.kind = OBJECT
+        self.mask = None
+        self.demoted = True
+
+    def _buffers(self):
+        # Zero-copy views; the builder replaces its columns after handing them out
+        data = np.frombuffer(self.values, dtype=_NUMPY_DTYPES[self.values.typecode])
+        return data, np.frombuffer(self.mask, dtype=np.bool_)
+
+    def to_pandas(self):
+        if self.demoted:
+            # As objects: pandas would turn e.g. [1, None, 2 ** 70] into lossy floats
+            values = np.empty(len(self.values), dtype=object)
+            values[:] = self.values
+            return values
+        if self.mask is None:
+            return self.values
+        data, nulls = self._buffers()
+        if self.kind == FLOAT:
+            # Missing floats are already stored as NaN
+            return data
+        if self.kind == BOOL:
+            data = data.astype(np.bool_)
+            return pd.arrays.BooleanArray(data, nulls) if nulls.any() else data
+        return pd.arrays.IntegerArray(data, nulls) if nulls.any() else data
+
+    def to_arrow(self, pa):
+        if self.mask is None:
+            return pa.array(self.values, from_pandas=True)
+        data, nulls = self._buffers()
+        if self.kind == BOOL:
+            data = data.astype(np.bool_)
+        return pa.array(data, mask=nulls if nulls.any() else None)
+
+
+class ColumnarBuilder:
+    """
+    Accumulates rows for one output table.
+
+    Args:
+        columns: output column name -> kind (INT, FLOAT, BOOL, STR, OBJECT or BATCH).
+                 BATCH columns are not appended per row; their single value is
+                 passed to to_frame()/to_arrow().
+
+    Rows are appended positionally, in the order of the non-BATCH columns.
+    """
+
+    def __init__(self, columns: Dict[str, str]):
+        self.spec = dict(columns)
+        self.row_columns = [name for name, kind in self.spec.items() if kind != BATCH]
+        self._reset()
+
+    def _reset(self):
+        self._columns = [_Column(self.spec[name]) for name in self.row_columns]
+        self.rows = 0
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def append(self, *values):
+        """Append one row; values follow the order of the non-BATCH columns."""
+        if len(values) != len(self._columns):
+            raise ValueError(f"Expected {len(self._columns)} values, got {len(values)}")
+        for column, value in zip(self._columns, values):
+            column.append(value)
+        self.rows += 1
+
+    def extend(self, other: 'ColumnarBuilder'):
+        """Move all rows of another builder with the same columns to the end of this one."""
+        if other.spec != self.spec:
+            raise ValueError("Builders have different columns")
+        for column, source in zip(self._columns, other._columns):
+            column.extend(source)
+        self.rows += other.rows
+        other._reset()
+
+    def _batch_values(self, batch: Optional[dict]) -> dict:
+        batch = batch or {}
+        missing = [name for name, kind in self.spec.items() if kind == BATCH and name not in batch]
+        if missing:
+            raise ValueError(f"No batch value for columns: {', '.join(missing)}")
+        return batch
+
+    def to_frame(self, batch: Optional[dict] = None) -> pd.DataFrame:
+        """
+        Build a DataFrame from the buffered rows and empty the builder.
+
+        The typed buffers are handed to pandas without copying, so the builder
+        starts new ones for any later rows.
+        """
+        batch = self._batch_values(batch)
+        data = dict(zip(self.row_columns, (c.to_pandas() for c in self._columns)))
+        self._reset()
+        df = pd.DataFrame(data, columns=self.row_columns)
+        for position, name in enumerate(self.spec):
+            if self.spec[name] == BATCH:
+                df.insert(position, name, batch[name])
+        return df
+
+    def to_arrow(self, batch: Optional[dict] = None):
+        """Build a pyarrow Table from the buffered rows and empty the builder."""
+        import pyarrow as pa
+
+        batch = self._batch_values(batch)
+        rows = self.rows
+        arrays = dict(zip(self.row_columns, (c.to_arrow(pa) for c in self._columns)))
+        self._reset()
+        columns = [
+            pa.array([batch[name]] * rows) if self.spec[name] == BATCH else arrays[name]
+            for name in self.spec
+        ]
+        return pa.Table.from_arrays(columns, names=list(self.spec))
@@ -0,0 +1,131 @@
+"""
+Vectorized ball-by-ball commentary classification.
+
+Cricbuzz commentary lines read "Bowler to Batter, <outcome>, <description>",
+e.g. "Starc to Kohli, leg byes, 1 run, ...". classify_commentary() works on a
+whole batch of lines at once with a fixed set of patterns and pandas string
+methods, instead of branching and running a regex per line, and splits each
+delivery into runs off the bat and extras (wides, no-balls, byes, leg-byes).
+"""
+import numpy as np
+import pandas as pd
+
+# Patterns are plain strings so pandas can hand them to pyarrow's compiled
+# regex kernels when the column is Arrow-backed.
+# The outcome is the first two comma-separated segments after "Bowler to Batter"
+OUTCOME = r'^[^,]*,([^,]*(?:,[^,]*)?)'
+DELIVERY = r'^[^,]* to [^,]*,'
+# Runs are read from the outcome token only: the first segment, or the second
+# when the first just names the extra ("leg byes, 1 run"). Descriptions such as
+# "2 runs, six fielders on the off side" can't turn into a boundary that way.
+FIRST_SEGMENT = r',.*$'
+LEADING_SEGMENT = r'^[^,]*,'
+EXTRA_LABEL = r'^\s*(?:wides?|no[\s-]?balls?|(?:leg[\s-]?)?byes?)\s*$'
+# Cricbuzz marks bold text with placeholders ("B0$ FOUR")
+TOKEN_START = r'^\s*(?:b\d+\$\s*)?'
+COUNT = TOKEN_START + r'(\d+)\s+(?:runs?|wides|(?:leg[\s-]?)?byes?)\b'
+WIDES_COUNT = TOKEN_START + r'\d+\s+wides\b'
+FOUR = TOKEN_START + r'four\b'
+SIX = TOKEN_START + r'six\b'
+# Extras are flagged from the extras label ("leg byes, 1 run") or the start of the
+# token ("wide", "3 wides", "1 leg bye"), never from the description that follows
+WIDE = r'wides?\b'
+NO_BALL = r'no[\s-]?balls?\b'
+LEG_BYE = r'leg[\s-]?byes?\b'
+BYE = r'byes?\b'
+EXTRA_TOKEN = TOKEN_START + r'(?:\d+\s+)?'
+OUT = r'^\s*out\b'
+
+CLASSIFICATION_COLUMNS = {
+    'runs_scored': 'INT',
+    'batter_runs': 'INT',
+    'extras': 'INT',
+    'is_wide': 'BOOLEAN',
+    'is_no_ball': 'BOOLEAN',
+    'is_bye': 'BOOLEAN',
+    'is_leg_bye': 'BOOLEAN',
+    'is_wicket': 'BOOLEAN',
+}
+
+
+def classify_commentary(df: pd.DataFrame, text_col: str = 'commentary_text',
+                        event_col: str = 'event_type') -> pd.DataFrame:
+    """
+    Add the CLASSIFICATION_COLUMNS to a batch of commentary lines.
+
+    runs_scored is everything the delivery added to the total: batter_runs
+    (runs off the bat, including boundaries) plus extras.
+    """
+    df = df.copy()
+    if df.empty:
+        for col in CLASSIFICATION_COLUMNS:
+            df[col] = pd.Series(dtype='bool' if CLASSIFICATION_COLUMNS[col] == 'BOOLEAN' else 'int64')
+        return df
+
+    text = df[text_col].fillna('').astype(str).str.lower()
+    event = df[event_col].fillna('').astype(str).str.upper()
+
+    # Lines that don't follow the "X to Y, outcome" layout are classified on their full text
+    outcome = text.str.extract(OUTCOME, expand=False)
+    delivery = text.str.contains(DELIVERY) & outcome.notna()
+    outcome = outcome.where(delivery, text)
+
+    is_wicket = (event.str.contains('WICKET') | outcome.str.contains(OUT)).to_numpy()
+
+    first = outcome.str.replace(FIRST_SEGMENT, '', regex=True)
+    token = first.where(delivery, outcome)
+    is_label = delivery & first.str.contains(EXTRA_LABEL)
+    label = first.where(is_label, '')
+    after_label = is_label & outcome.str.contains(',', regex=False)
+    if after_label.any():
+        token = token.mask(after_label, outcome[after_label].str.replace(LEADING_SEGMENT, '', regex=True))
+
+    def extra(pattern):
+        return (label.str.contains(r'\b' + pattern) | token.str.contains(EXTRA_TOKEN + pattern)).to_numpy()
+
+    is_wide = extra(WIDE)
+    is_no_ball = extra(NO_BALL)
+    is_leg_bye = extra(LEG_BYE)
+    is_bye = extra(BYE) & ~is_leg_bye
+
+    six = (event.str.contains('SIX') | token.str.contains(SIX)).to_numpy()
+    four = (event.str.contains('FOUR') | token.str.contains(FOUR)).to_numpy()
+    # An explicit "<n> runs" ("<n> wides", "<n> leg byes") wins over the event type
+    count = token.str.extract(COUNT, expand=False)
+    has_count = count.notna().to_numpy()
+    number = pd.to_numeric(count, errors='coerce').fillna(0).to_numpy(dtype=np.int64)
+    is_wides_count = token.str.contains(WIDES_COUNT).to_numpy()
+    off_ball = np.where(
+        has_count, np.where(is_wides_count, 0, number), np.select([six, four], [6, 4], default=0)
+    )
+
+    # "wide" alone is one extra; "3 wides" is three
+    wides = np.where(is_wides_count, np.maximum(number, 1), 1)
+    extras = np.where(is_wide, wides, np.where(is_bye | is_leg_bye, off_ball, 0)) + is_no_ball
+    batter_runs = np.where(is_wide | is_bye | is_leg_bye, 0, off_ball)
+
+    df['runs_scored'] = batter_runs + extras
+    df['batter_runs'] = batter_runs
+    df['extras'] = extras
+    df['is_wide'] = is_wide
+    df['is_no_ball'] = is_no_ball
+    df['is_bye'] = is_bye
+    df['is_leg_bye'] = is_leg_bye
+    df['is_wicket'] = is_wicket
+    return df
+
+
+def ensure_classification_columns(engine, table_name: str = 'live_commentary'):
+    """Add the classification columns to an existing commentary table (for append-mode runs)."""
+    from sqlalchemy import inspect, text
+
+    inspector = inspect(engine)
+    if not inspector.has_table(table_name):
+        return
+    existing = {c['name'] for c in inspector.get_columns(table_name)}
+    missing = [(name, sql_type) for name, sql_type in CLASSIFICATION_COLUMNS.items() if name not in existing]
+    if not missing:
+        return
+    with engine.begin() as conn:
+        for name, sql_type in missing:
+            conn.execute(text(f"ALTER TABLE `{table_name}` ADD COLUMN `{name}` {sql_type}"))
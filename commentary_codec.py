@@ -0,0 +1,401 @@
+"""
+Compact storage of commentary text (live_commentary.commentary_text and
+match_commentary.commtxt).
+
+Usage:
+    python commentary_codec.py compact [--batch-size 5000]
+
+Almost every line is "Bowler to Batter, <outcome>, <description>", and the
+outcomes ("no run,", "1 run,", "FOUR,", "B0$ SIX,") repeat thousands of
+times. Instead of the raw text each line is stored in four columns
+(CODEC_COLUMNS):
+
+- bowler_key, batter_key: the "Bowler to Batter," prefix, coded through
+  delivery_players (see delivery_store.py); NULL when the line has none or
+  isn't a ball (no outcome after the prefix, see delivery_store.OUTCOME_TOKEN);
+- template_id: the outcome, up to and including the first comma after the
+  prefix, stored once in commentary_templates (the empty template for
+  lines without a prefix);
+- text_z: the rest of the line, raw-deflated against COMMENTARY_ZDICT
+  (COMMENTARY_COMPRESS=0 stores it uncompressed), NULL when empty.
+
+split_commentary() and join_commentary() do the lossless split and rebuild
+without a database; CommentaryCodec adds the key and template lookups, with
+caches so a long-running ingester and the dashboard only ask about new ones.
+The `compact` command moves match_commentary rows written by earlier
+versions onto the compact columns.
+"""
+import argparse
+import hashlib
+import logging
+import os
+import re
+import threading
+import zlib
+from typing import Dict, Iterable, List, Optional
+
+import pandas as pd
+
+from delivery_store import DELIVERY_TABLE_DDL, OUTCOME_TOKEN, resolve_player_keys
+from dtype_policy import write_frame
+from entity_keys import TransactionCache
+
+logger = logging.getLogger(__name__)
+
+COMMENTARY_COMPRESS = os.getenv('COMMENTARY_COMPRESS', '1') != '0'
+# Longer outcomes are treated as free text rather than templates
+COMMENTARY_TEMPLATE_CHARS = int(os.getenv('COMMENTARY_TEMPLATE_CHARS', 64))
+
+CODEC_COLUMNS = {
+    'bowler_key': 'INT',
+    'batter_key': 'INT',
+    'template_id': 'INT',
+    'text_z': 'BLOB',
+}
+
+COMMENTARY_TEMPLATES_DDL = """
+    CREATE TABLE IF NOT EXISTS commentary_templates (
+        template_id INT AUTO_INCREMENT PRIMARY KEY,
+        template_hash CHAR(32) NOT NULL,
+        template VARCHAR(255) NOT NULL,
+        UNIQUE KEY uq_template_hash (template_hash)
+    )
+"""
+
+# First byte of text_z. Stored rows depend on these forever: a new
+# dictionary needs a new format code, never an edit to COMMENTARY_ZDICT.
+RAW_FORMAT = b'\x00'
+ZDICT_FORMAT = b'\x01'
+
+# Preset deflate dictionary of common commentary wording; the most frequent
+# phrases go last, where deflate finds them with the shortest distances
+COMMENTARY_ZDICT = (
+    b"short of a length outside off stump on the pads flicked fine leg square leg "
+    b"deep midwicket long on long off extra cover point third man slip gully "
+    b"full and wide driven through the covers straight down the ground "
+    b"beaten outside off edged caught behind keeper appeal for lbw not out "
+    b"slower ball yorker bouncer goes over the top back of a length good length "
+    b"tucked away worked off the pads steered pulled hooked cut hard "
+    b"defended solidly back to the bowler dabbed into the off side for a single "
+    b"pushed to cover punched off the back foot on the front foot "
+    b"B0$ B1$ FOUR, SIX, no run, 1 run, 2 runs, wide, leg byes, "
+)
+
+
+def _compress(tail: str) -> bytes:
+    data = tail.encode('utf-8')
+    if COMMENTARY_COMPRESS:
+        deflate = zlib.compressobj(9, zlib.DEFLATED, -15, zdict=COMMENTARY_ZDICT)
+        packed = deflate.compress(data) + deflate.flush()
+        if len(packed) < len(data):
+            return ZDICT_FORMAT + packed
+    return RAW_FORMAT + data
+
+
+def _decompress(blob: bytes) -> str:
+    blob = bytes(blob)
+    if blob[:1] == ZDICT_FORMAT:
+        inflate = zlib.decompressobj(-15, zdict=COMMENTARY_ZDICT)
+        return (inflate.decompress(blob[1:]) + inflate.flush()).decode('utf-8')
+    return blob[1:].decode('utf-8')
+
+
+def _template_hash(template: str) -> str:
+    return hashlib.blake2b(template.encode('utf-8'), digest_size=16).hexdigest()
+
+
+# "Starc to Kohli, ..." with the exact spacing join_commentary() writes back, on ball lines only
+PREFIX = re.compile(r'([^,]+?) to ([^,]+?),')
+OUTCOME = re.compile(OUTCOME_TOKEN)
+
+
+def split_commentary(texts: Iterable[Optional[str]]) -> pd.DataFrame:
+    """
+    Split lines into bowler, batter, template and compressed tail (text_z).
+
+    join_commentary() rebuilds every line exactly; None stays None.
+    """
+    rows = []
+    for text in texts:
+        if text is None or (not isinstance(text, str) and pd.isna(text)):
+            rows.append((None, None, None, None))
+            continue
+        text = str(text)
+        bowler = batter = None
+        match = PREFIX.match(text)
+        if (match and match.group(1).strip() == match.group(1) and match.group(2).strip() == match.group(2)
+                and OUTCOME.match(text, match.end())):
+            bowler, batter = match.group(1), match.group(2)
+            text = text[match.end():]
+        # Only ball lines have a repeating outcome; over summaries and notes are all free text
+        comma = text.find(',')
+        head = text[:comma + 1] if comma >= 0 else text
+        if bowler is None or len(head) > COMMENTARY_TEMPLATE_CHARS:
+            head = ''
+        tail = text[len(head):]
+        rows.append((bowler, batter, head, _compress(tail) if tail else None))
+    return pd.DataFrame(rows, columns=['bowler', 'batter', 'template', 'text_z'])
+
+
+def join_commentary(parts: pd.DataFrame) -> List[Optional[str]]:
+    """Inverse of split_commentary()."""
+    texts = []
+    for bowler, batter, template, text_z in parts[['bowler', 'batter', 'template', 'text_z']].itertuples(index=False):
+        if template is None or (not isinstance(template, str) and pd.isna(template)):
+            texts.append(None)
+            continue
+        prefix = f"{bowler} to {batter}," if isinstance(bowler, str) else ''
+        tail = _decompress(text_z) if isinstance(text_z, (bytes, bytearray, memoryview)) else ''
+        texts.append(prefix + template + tail)
+    return texts
+
+
+def _fetch(conn, sql: str) -> list:
+    """Rows of a query on either a SQLAlchemy or a pymysql (dashboard) connection."""
+    if hasattr(conn, 'cursor'):
+        with conn.cursor() as cursor:
+            cursor.execute(sql)
+            return list(cursor.fetchall())
+    from sqlalchemy import text
+    return conn.execute(text(sql)).fetchall()
+
+
+def _int_list(values) -> str:
+    return ', '.join(str(int(v)) for v in values)
+
+
+def ensure_codec_tables(conn):
+    from sqlalchemy import text
+
+    conn.execute(text(COMMENTARY_TEMPLATES_DDL))
+    conn.execute(text(DELIVERY_TABLE_DDL['delivery_players']))
+
+
+def ensure_codec_columns(conn, table_name: str):
+    """Add the compact columns to a commentary table written by an earlier version."""
+    from sqlalchemy import text
+
+    existing = {row[0] for row in conn.execute(text(f"SHOW COLUMNS FROM {table_name}"))}
+    missing = [(name, sql_type) for name, sql_type in CODEC_COLUMNS.items() if name not in existing]
+    if missing:
+        conn.execute(text(
+            f"ALTER TABLE {table_name} " + ", ".join(f"ADD COLUMN {n} {t}" for n, t in missing)
+        ))
+        logger.info(f"✓ Added compact commentary columns to '{table_name}'")
+
+
+class CommentaryCodec:
+    """
+    Encodes commentary frames for storage and decodes them on read.
+
+    Template ids and player keys never change once assigned, so both are
+    cached for the life of the process; ones this process inserts are only
+    cached once their transaction commits. Safe to share between threads.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.template_ids: Dict[str, int] = {}
+        self.templates: Dict[int, str] = {}
+        self.player_keys: Dict[str, int] = {}
+        self.player_names: Dict[int, str] = {}
+        self.tables_ready = False
+        self.pending = TransactionCache(self._promote)
+
+    def _remember(self, templates: Iterable[tuple] = (), players: Iterable[tuple] = ()):
+        with self._lock:
+            for template_id, template in templates:
+                self.template_ids[template] = template_id
+                self.templates[template_id] = template
+            for key, name in players:
+                self.player_keys[name] = key
+                self.player_names[key] = name
+
+    def _promote(self, name: str, entries: dict):
+        if name == 'templates':
+            self._remember(templates=[(template_id, t) for t, template_id in entries.items()])
+        else:
+            self._remember(players=[(key, n) for n, key in entries.items()])
+
+    def _known(self, conn, name: str, cache: dict, wanted: set) -> dict:
+        """The ids of wanted already known: cached, or inserted by conn's open transaction."""
+        staged = self.pending.get(conn, name)
+        with self._lock:
+            known = {k: cache[k] for k in wanted if k in cache}
+        known.update((k, staged[k]) for k in wanted if k in staged and k not in known)
+        return known
+
+    def _template_ids(self, conn, templates: Iterable[str]) -> Dict[str, int]:
+        from sqlalchemy import bindparam, text
+
+        known = self._known(conn, 'templates', self.template_ids, set(templates))
+        missing = {_template_hash(t): t for t in set(templates) if t not in known}
+        if missing:
+            conn.execute(
+                text("INSERT IGNORE INTO commentary_templates (template_hash, template) VALUES (:hash, :template)"),
+                [{'hash': h, 'template': t} for h, t in missing.items()]
+            )
+            rows = conn.execute(
+                text("SELECT template_hash, template_id FROM commentary_templates WHERE template_hash IN :hashes")
+                .bindparams(bindparam('hashes', expanding=True)),
+                {'hashes': list(missing)}
+            )
+            found = {missing[h]: template_id for h, template_id in rows}
+            self.pending.add(conn, 'templates', found)
+            known.update(found)
+        return known
+
+    def _player_keys(self, conn, names: Iterable[str]) -> Dict[str, int]:
+        known = self._known(conn, 'players', self.player_keys, set(names))
+        missing = [n for n in set(names) if n not in known]
+        if missing:
+            found = resolve_player_keys(conn, missing)
+            self.pending.add(conn, 'players', found)
+            known.update(found)
+        return known
+
+    def encode(self, conn, df: pd.DataFrame, text_column: str) -> pd.DataFrame:
+        """A copy of df with text_column replaced by CODEC_COLUMNS (in its place)."""
+        if not self.tables_ready:
+            ensure_codec_tables(conn)
+            self.tables_ready = True
+        parts = split_commentary(df[text_column].tolist())
+        template_ids = self._template_ids(conn, parts['template'].dropna())
+        player_keys = self._player_keys(conn, pd.concat([parts['bowler'], parts['batter']]).dropna())
+
+        codes = {
+            'bowler_key': pd.array(parts['bowler'].map(player_keys), dtype='Int64'),
+            'batter_key': pd.array(parts['batter'].map(player_keys), dtype='Int64'),
+            'template_id': pd.array(parts['template'].map(template_ids), dtype='Int64'),
+            'text_z': parts['text_z'].to_numpy(dtype=object),
+        }
+        out = {}
+        for column in df.columns:
+            if column == text_column:
+                out.update(codes)
+            else:
+                out[column] = df[column]
+        return pd.DataFrame(out, index=df.index)
+
+    def decode(self, conn, df: pd.DataFrame, text_column: str) -> pd.DataFrame:
+        """
+        A copy of df with CODEC_COLUMNS turned back into text_column.
+
+        Rows written before the compact format keep their stored text.
+        """
+        if 'template_id' not in df.columns:
+            return df
+        template_ids = set(df['template_id'].dropna().astype(int))
+        player_keys = set(pd.concat([df['bowler_key'], df['batter_key']]).dropna().astype(int))
+        with self._lock:
+            template_ids -= set(self.templates)
+            player_keys -= set(self.player_names)
+        if template_ids:
+            self._remember(templates=_fetch(conn, (
+                "SELECT template_id, template FROM commentary_templates "
+                f"WHERE template_id IN ({_int_list(template_ids)})"
+            )))
+        if player_keys:
+            self._remember(players=_fetch(conn, (
+                f"SELECT player_key, name FROM delivery_players WHERE player_key IN ({_int_list(player_keys)})"
+            )))
+
+        def lookup(values: pd.Series, names: Dict[int, str]) -> pd.Series:
+            return values.map(lambda v: None if pd.isna(v) else names.get(int(v)))
+
+        texts = pd.Series(join_commentary(pd.DataFrame({
+            'bowler': lookup(df['bowler_key'], self.player_names),
+            'batter': lookup(df['batter_key'], self.player_names),
+            'template': lookup(df['template_id'], self.templates),
+            'text_z': df['text_z'],
+        }, index=df.index)), index=df.index, dtype=object)
+        if text_column in df.columns:
+            texts = df[text_column].where(df[text_column].notna(), texts)
+
+        out = {}
+        for column in df.columns:
+            if column == 'template_id':
+                out[text_column] = texts
+            elif column not in CODEC_COLUMNS and column != text_column:
+                out[column] = df[column]
+        return pd.DataFrame(out, index=df.index)
+
+
+def write_commentary_frame(conn, table_name: str, df: pd.DataFrame, codec: CommentaryCodec,
+                           if_exists: str = 'append', text_column: str = 'commentary_text',
+                           savings: Optional[Dict[str, List[int]]] = None) -> int:
+    """to_sql() for a live_commentary-style frame, storing its text in the compact columns."""
+    from sqlalchemy import LargeBinary
+
+    if if_exists == 'append':
+        from sqlalchemy import inspect
+        if inspect(conn).has_table(table_name):
+            ensure_codec_columns(conn, table_name)
+    return write_frame(
+        conn, table_name, codec.encode(conn, df, text_column), if_exists,
+        dtype={'text_z': LargeBinary()}, savings=savings
+    )
+
+
+def compact_table(engine, table_name: str = 'match_commentary', text_column: str = 'commtxt',
+                  batch_size: int = 5000) -> int:
+    """
+    Move rows stored as raw text onto the compact columns, batch by batch (by id),
+    then drop the text column; returns the rows compacted.
+    """
+    from sqlalchemy import text
+
+    codec = CommentaryCodec()
+    with engine.begin() as conn:
+        existing = {row[0] for row in conn.execute(text(f"SHOW COLUMNS FROM {table_name}"))}
+        if text_column not in existing:
+            logger.info(f"✓ '{table_name}' is already compact")
+            return 0
+        ensure_codec_columns(conn, table_name)
+
+    compacted, last_id = 0, 0
+    while True:
+        with engine.begin() as conn:
+            batch = pd.read_sql(
+                text(
+                    f"SELECT id, {text_column} FROM {table_name} "
+                    f"WHERE id > :last_id AND {text_column} IS NOT NULL ORDER BY id LIMIT :limit"
+                ),
+                conn, params={'last_id': last_id, 'limit': batch_size}
+            )
+            if batch.empty:
+                break
+            encoded = codec.encode(conn, batch, text_column)
+            records = encoded.astype(object).where(encoded.notna(), None).to_dict('records')
+            conn.execute(
+                text(
+                    f"UPDATE {table_name} SET {', '.join(f'{c} = :{c}' for c in CODEC_COLUMNS)}, "
+                    f"{text_column} = NULL WHERE id = :id"
+                ),
+                records
+            )
+        compacted += len(batch)
+        last_id = int(batch['id'].iloc[-1])
+        logger.info(f"✓ Compacted {compacted} rows of '{table_name}'")
+
+    with engine.begin() as conn:
+        conn.execute(text(f"ALTER TABLE {table_name} DROP COLUMN {text_column}"))
+    logger.info(f"✅ '{table_name}' now stores commentary in compact columns ({compacted} rows moved)")
+    return compacted
+
+
+def main():
+    import importlib
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('command', choices=['compact'])
+    parser.add_argument('--batch-size', type=int, default=5000)
+    args = parser.parse_args()
+
+    live_match = importlib.import_module('2Live_match')
+    with live_match.get_db_engine() as engine:
+        compact_table(engine, batch_size=args.batch_size)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+"""Page modules for MainStreamlit.py, imported only when their page is selected."""
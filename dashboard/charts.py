@@ -0,0 +1,63 @@
+"""
+Server-side reduction of query results before they are charted.
+
+Charting a raw result sends every row to the browser, so a per-player query
+over player_stats can freeze the page. reduce_for_chart() aggregates the
+result per label and keeps only the top values, so the chart payload is
+bounded by CHART_MAX_POINTS whatever the row count.
+"""
+import os
+from typing import Optional, Tuple
+
+import pandas as pd
+
+CHART_MAX_POINTS = int(os.getenv('CHART_MAX_POINTS', 50))
+LABEL_MAX_CHARS = 40
+AGGREGATIONS = ['sum', 'mean', 'max', 'min', 'count']
+
+
+def numeric_columns(df: pd.DataFrame) -> list:
+    return df.select_dtypes(include=['number']).columns.tolist()
+
+
+def default_label_column(df: pd.DataFrame) -> Optional[str]:
+    """player_name when present, else the first non-numeric column."""
+    if 'player_name' in df.columns:
+        return 'player_name'
+    numeric = set(numeric_columns(df))
+    for col in df.columns:
+        if col not in numeric:
+            return col
+    return df.columns[0] if len(df.columns) else None
+
+
+def reduce_for_chart(
+    df: pd.DataFrame,
+    label_col: str,
+    value_col: str,
+    agg: str = 'sum',
+    max_points: int = CHART_MAX_POINTS
+) -> Tuple[pd.Series, Optional[str]]:
+    """
+    Aggregate value_col per label_col and keep the max_points largest groups.
+
+    Returns:
+        (series indexed by label, note describing any reduction or None)
+    """
+    max_points = max(1, min(max_points, CHART_MAX_POINTS))
+    labels = df[label_col].astype(str)
+    values = pd.to_numeric(df[value_col], errors='coerce')
+
+    grouped = values.groupby(labels, sort=False).agg(agg).dropna()
+    reduced = grouped.nlargest(max_points)
+    # Long labels bloat the payload and are unreadable on the axis anyway
+    reduced.index = reduced.index.str.slice(0, LABEL_MAX_CHARS)
+    reduced.index.name = label_col
+    reduced.name = value_col
+
+    notes = []
+    if len(grouped) < len(df):
+        notes.append(f"{agg} of {len(df):,} rows per {label_col}")
+    if len(grouped) > len(reduced):
+        notes.append(f"top {len(reduced)} of {len(grouped):,} {label_col} values")
+    return reduced, ("Showing " + ", ".join(notes)) if notes else None
@@ -0,0 +1,120 @@
+"""CRUD Operations page: admin access to the raw tables."""
+import streamlit as st
+
+from dashboard.data import get_mysql_conn, get_table_data, modify_query
+from entity_keys import FACT_TABLES
+
+
+def render():
+    st.header("⚙️ CRUD Operations (Admin Panel)")
+
+    tables = [
+        "icc_ranks",
+        "live_match_info",
+        "live_venues",
+        "live_teams",
+        "live_batting_stats",
+        "live_bowling_stats",
+        "live_scorecard_metadata",
+        "live_commentary",
+        "live_series",
+        "player_info",
+        "player_stats",
+        "recent_matches",
+        "schedules",
+        "series_list",
+        "team_results",
+        "team_standings",
+        "venues"
+    ]
+    crud_table = st.selectbox("Select Table", tables)
+    action = st.radio("Action", ["Create", "Read", "Update", "Delete"], key="crud_action")
+    # Scorecard tables are views joining names onto keyed facts tables; writes go to the facts table
+    write_table = FACT_TABLES[crud_table]['facts'] if crud_table in FACT_TABLES else crud_table
+    if action != "Read" and write_table != crud_table:
+        st.caption(f"`{crud_table}` is a view; changes are made in `{write_table}`, which holds team and player keys.")
+
+    # Helper: Get primary key of selected table
+    def get_primary_key(table_name):
+        conn = get_mysql_conn()
+        cursor = conn.cursor()
+        cursor.execute(f"SHOW KEYS FROM `{table_name}` WHERE Key_name = 'PRIMARY'")
+        result = cursor.fetchone()
+        conn.close()
+        if result:
+            return result[4]   # Column name of PK
+        return None
+
+    # READ
+    if action == "Read":
+        st.subheader(f"📖 Data from `{crud_table}`")
+        df = get_table_data(crud_table)
+        st.dataframe(df)
+
+    # CREATE
+    elif action == "Create":
+        with st.expander("➕ Insert New Row"):
+            st.write(f"Insert new row into `{write_table}`")
+            new_values = st.text_area("Enter comma-separated values:")
+
+            if st.button("Insert Row"):
+                conn = get_mysql_conn()
+                cursor = conn.cursor()
+                cursor.execute(f"DESCRIBE `{write_table}`;")
+                col_count = len(cursor.fetchall())
+                conn.close()
+
+                placeholders = ",".join(["%s"] * col_count)
+                values = tuple([v.strip() for v in new_values.split(",")])
+
+                try:
+                    modify_query(f"INSERT INTO `{write_table}` VALUES ({placeholders})", values)
+                    st.success("✅ Row inserted successfully!")
+                except Exception as e:
+                    st.error(f"❌ Insert failed: {e}")
+
+    # UPDATE
+    elif action == "Update":
+        with st.expander("✏️ Update Existing Row"):
+            pk_col = get_primary_key(write_table)
+            if not pk_col:
+                st.error(f"⚠️ No primary key found for `{write_table}`. Cannot update.")
+            else:
+                conn = get_mysql_conn()
+                cursor = conn.cursor()
+                cursor.execute(f"DESCRIBE `{write_table}`;")
+                valid_columns = [col[0] for col in cursor.fetchall()]
+                conn.close()
+
+                record_id = st.text_input(f"Enter {pk_col} of row to update:")
+                column = st.selectbox("Column to update:", valid_columns)
+                new_value = st.text_input("New value:")
+
+
+                if st.button("Update Row"):
+                    try:
+                        modify_query(
+                            f"UPDATE `{write_table}` SET `{column}`=%s WHERE `{pk_col}`=%s",
+                            (new_value, record_id)
+                        )
+                        st.success("✅ Row updated successfully!")
+                    except Exception as e:
+                        st.error(f"❌ Update failed: {e}")
+
+    # DELETE
+    elif action == "Delete":
+        with st.expander("🗑️ Delete Row"):
+            pk_col = get_primary_key(write_table)
+            if not pk_col:
+                st.error(f"⚠️ No primary key found for `{write_table}`. Cannot delete.")
+            else:
+                record_id = st.text_input(f"Enter {pk_col} of row to delete:")
+                if st.button("Delete Row"):
+                    try:
+                        modify_query(
+                            f"DELETE FROM `{write_table}` WHERE `{pk_col}`=%s",
+                            (record_id,)
+                        )
+                        st.success("✅ Row deleted successfully!")
+                    except Exception as e:
+                        st.error(f"❌ Delete failed: {e}")
@@ -0,0 +1,225 @@
+"""
+Shared data access for the dashboard pages.
+
+Imported by every page module, so it only pulls in what all pages need; the
+MySQL driver is imported on first connection.
+"""
+import os
+import time
+
+import pandas as pd
+import streamlit as st
+
+from arrow_reader import read_frame
+from commentary_codec import CommentaryCodec
+from dtype_policy import apply_dtype_policy
+from match_cache import ByteBudgetLRU, MatchSnapshotCache
+from match_snapshots import read_match_snapshot
+from query_governor import QueryGovernor
+
+# ------------------ DATABASE CONFIG ------------------
+DB_CONFIG = {
+    'host': 'localhost',
+    'user': 'root',
+    'password': 'Root',
+    'database': 'cricbuzz2',
+    'port': 3306
+}
+
+def get_mysql_conn():
+    import pymysql
+    return pymysql.connect(**DB_CONFIG)
+
+@st.cache_resource
+def get_query_governor():
+    """Process-wide worker pool that applies time budgets and row caps to dashboard queries."""
+    return QueryGovernor(get_mysql_conn)
+
+def query_messages(query):
+    """(streamlit function name, text) pairs describing how a governed query ended."""
+    if query.state == 'timeout':
+        return [('error', f"⏱️ Query exceeded its {query.timeout_ms / 1000:.0f}s time budget and was stopped")]
+    if query.state == 'cancelled':
+        return [('warning', "⏹ Query cancelled")]
+    if query.state == 'error':
+        return [('error', f"Query failed: {query.error}")]
+    if query.truncated:
+        return [('warning', f"✂️ Result capped at the first {query.max_rows:,} rows")]
+    return []
+
+def run_query(sql, params=None):
+    query = get_query_governor().run(sql, params)
+    for level, message in query_messages(query):
+        getattr(st, level)(message)
+    return query.df if query.state == 'done' else pd.DataFrame()
+
+def modify_query(sql, params=None):
+    """
+    Execute INSERT/UPDATE/DELETE.
+    """
+    conn = get_mysql_conn()
+    if conn is None:
+        raise Exception("DB connection not available")
+    cursor = conn.cursor()
+    try:
+        cursor.execute(sql, params or ())
+        conn.commit()
+    except Exception as e:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+        conn.close()
+
+# Tables whose commentary text is stored in the compact columns (see commentary_codec.py)
+COMPACT_TEXT_COLUMNS = {'live_commentary': 'commentary_text', 'match_commentary': 'commtxt'}
+
+@st.cache_data(ttl=30)
+def get_table_data(table_name):
+    df = run_query(f"SELECT * FROM {table_name}")
+    if table_name in COMPACT_TEXT_COLUMNS and 'template_id' in df.columns:
+        conn = get_mysql_conn()
+        try:
+            df = get_commentary_codec().decode(conn, df, COMPACT_TEXT_COLUMNS[table_name])
+        finally:
+            conn.close()
+    return apply_dtype_policy(table_name, df)
+
+# Shared across all sessions of this process
+MATCH_CACHE_BYTES = int(os.getenv('MATCH_CACHE_MB', 256)) * 1024 * 1024
+FIGURE_CACHE_BYTES = int(os.getenv('FIGURE_CACHE_MB', 64)) * 1024 * 1024
+
+@st.cache_resource
+def get_match_cache():
+    return MatchSnapshotCache(max_bytes=MATCH_CACHE_BYTES)
+
+@st.cache_resource
+def get_commentary_codec():
+    """Commentary templates and player names for decoding stored commentary; both never change once written."""
+    return CommentaryCodec()
+
+@st.cache_resource
+def get_figure_cache():
+    return ByteBudgetLRU(max_bytes=FIGURE_CACHE_BYTES)
+
+def get_figure(key, build):
+    """
+    Plotly figure for key, calling build() only on a miss.
+
+    The Figure itself is cached: st.plotly_chart() only converts a Figure to
+    its spec, while a dict or JSON would be validated back into a Figure on
+    every render. Its JSON size, measured once when built, counts against the
+    byte budget. key must include the match's data version so changed data
+    gets a new chart.
+    """
+    cache = get_figure_cache()
+    fig = cache.get(key)
+    if fig is None:
+        fig = build()
+        cache.put(key, fig, len(fig.to_json()))
+    return fig
+
+def get_match_versions():
+    """Current data version per match, bumped by the live ingester."""
+    conn = get_mysql_conn()
+    try:
+        df = read_frame(conn, "SELECT match_id, version FROM match_versions")
+    except Exception:
+        # Table is created by the first ingest that bumps a version
+        return {}
+    finally:
+        conn.close()
+    return dict(zip(df['match_id'], df['version']))
+
+def match_data_version(version):
+    """Cache key for a match's data; without a recorded version it changes every 30 seconds."""
+    if version is None:
+        return f"t{int(time.time() // 30)}"
+    return version
+
+def get_match_data(match_id, version=None):
+    """Get all data for a specific match from the shared per-process cache"""
+    return get_match_cache().get(match_id, match_data_version(version), load_match_data)
+
+@st.cache_data(ttl=30, show_spinner=False)
+def get_match_snapshot(match_id, version=None):
+    """Pre-rendered card data written by the ingester (version only keys the cache); None until one exists."""
+    conn = get_mysql_conn()
+    try:
+        return read_match_snapshot(conn, match_id)
+    except Exception:
+        # Table is created by the first ingest that writes snapshots
+        return None
+    finally:
+        conn.close()
+
+# Tables behind the frames load_match_data() returns, in order
+MATCH_DATA_TABLES = (
+    'live_match_info', 'live_teams', 'live_venues', 'live_batting_stats', 'live_bowling_stats',
+    'live_scorecard_metadata', 'live_commentary',
+)
+
+def load_match_data(match_id):
+    """Get all data for a specific match"""
+    conn = get_mysql_conn()
+    if not conn:
+        return None, None, None, None, None, None, None
+    
+    try:
+        # Get match info
+        match_query = "SELECT * FROM live_match_info WHERE match_id = %s"
+        match_info = pd.read_sql(match_query, conn, params=[match_id])
+        
+        # Get teams
+        teams_query = "SELECT * FROM live_teams WHERE match_id = %s"
+        teams = pd.read_sql(teams_query, conn, params=[match_id])
+        
+        # Get venue
+        venue_query = "SELECT * FROM live_venues WHERE match_id = %s"
+        venue = pd.read_sql(venue_query, conn, params=[match_id])
+        
+        # Get batting stats
+        batting_query = "SELECT * FROM live_batting_stats WHERE match_id = %s"
+        batting_stats = pd.read_sql(batting_query, conn, params=[match_id])
+        
+        # Get bowling stats
+        bowling_query = "SELECT * FROM live_bowling_stats WHERE match_id = %s"
+        bowling_stats = pd.read_sql(bowling_query, conn, params=[match_id])
+        
+        # Get scorecard metadata
+        scorecard_query = "SELECT * FROM live_scorecard_metadata WHERE match_id = %s"
+        scorecard_meta = pd.read_sql(scorecard_query, conn, params=[match_id])
+        
+        # Get commentary
+        commentary_query = "SELECT * FROM live_commentary WHERE match_id = %s ORDER BY timestamp DESC"
+        commentary = pd.read_sql(commentary_query, conn, params=[match_id])
+        commentary = get_commentary_codec().decode(conn, commentary, 'commentary_text')
+
+        # Narrow integer and category columns before the frames are cached (see dtype_policy.py)
+        return tuple(
+            apply_dtype_policy(table_name, df) for table_name, df in zip(MATCH_DATA_TABLES, (
+                match_info, teams, venue, batting_stats, bowling_stats, scorecard_meta, commentary
+            ))
+        )
+    except Exception as e:
+        st.error(f"Error fetching match data: {str(e)}")
+        return None, None, None, None, None, None, None
+    finally:
+        try:
+            conn.close()
+        except:
+            pass
+
+@st.cache_data(ttl=60)
+def get_available_summaries():
+    """Names of the materialized summary tables that currently exist."""
+    df = run_query(
+        "SELECT table_name AS name FROM information_schema.tables "
+        "WHERE table_schema = DATABASE() AND table_name LIKE 'summary%'"
+    )
+    return set(df['name']) if not df.empty else set()
+
+def clean_numeric_column(df, col):
+    if col in df.columns:
+        df[col] = pd.to_numeric(df[col], errors='coerce')
+    return df
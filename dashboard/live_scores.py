@@ -0,0 +1,417 @@
+"""Live Scores page: one expandable card per match in live_match_info."""
+import streamlit as st
+
+from dashboard.data import (
+    clean_numeric_column,
+    get_figure,
+    get_figure_cache,
+    get_match_cache,
+    get_match_data,
+    get_match_snapshot,
+    get_match_versions,
+    get_table_data,
+    match_data_version,
+)
+from match_snapshots import build_match_snapshot, format_score
+
+
+def _records(df):
+    return [] if df is None or df.empty else df.to_dict('records')
+
+
+def _top_chart(df, x, y, title, color_scale):
+    # Only called on a figure cache miss, so plotly is imported on first use
+    import plotly.express as px
+
+    fig = px.bar(
+        df,
+        x=x,
+        y=y,
+        title=title,
+        color=y,
+        color_continuous_scale=color_scale
+    )
+    fig.update_layout(height=300, showlegend=False)
+    return fig
+
+
+def _commentary_card(over_num, ball_num, comm_text, event_type, runs):
+    # Determine event badge
+    event_badge = ""
+    if event_type and str(event_type).lower() == 'wicket':
+        event_badge = "<span class='commentary-event event-wicket'>WICKET!</span>"
+    elif runs == 6:
+        event_badge = "<span class='commentary-event event-six'>SIX!</span>"
+    elif runs == 4:
+        event_badge = "<span class='commentary-event event-boundary'>FOUR!</span>"
+
+    st.markdown(f"""
+    <div class='commentary-card'>
+        <div>
+            <span class='commentary-over'>Over {over_num}.{ball_num}</span>
+            {event_badge}
+        </div>
+        <div class='commentary-text'>{comm_text}</div>
+    </div>
+    """, unsafe_allow_html=True)
+
+
+def render():
+    with st.spinner("Loading live matches..."):
+        live_matches = get_table_data("live_match_info")
+
+    if live_matches.empty:
+        st.warning("No live matches available")
+        return
+
+    # ========== DISPLAY ALL LIVE MATCHES ==========
+    st.markdown("## 🔴 Live Matches")
+
+    match_versions = get_match_versions()
+    cache_stats = get_match_cache().stats()
+    figure_stats = get_figure_cache().stats()
+    st.sidebar.caption(
+        f"🗄️ Match cache: {cache_stats['entries']} matches, "
+        f"{cache_stats['bytes'] / 2**20:.1f}/{cache_stats['max_bytes'] / 2**20:.0f} MB, "
+        f"{cache_stats['hits']} hits / {cache_stats['misses']} misses · "
+        f"charts: {figure_stats['entries']} cached, {figure_stats['hits']} hits / {figure_stats['misses']} misses"
+    )
+
+    for idx, match_row in live_matches.iterrows():
+        match_id = match_row.get('match_id', '')
+        version = match_versions.get(match_id)
+
+        # The card comes from the ingester's pre-rendered snapshot (one primary-key read)
+        frames = None
+        snapshot = get_match_snapshot(match_id, version)
+        if snapshot is None:
+            # No snapshot written yet: assemble the card from the live tables
+            frames = get_match_data(match_id, version)
+            match_info, teams_df, venue_df, batting_df, bowling_df, scorecard_df, commentary_df = frames
+            if match_info is None or match_info.empty:
+                st.warning(f"No data available for Match {match_id}")
+                continue
+            snapshot = build_match_snapshot(
+                match_info.iloc[0].to_dict(),
+                _records(teams_df),
+                (_records(venue_df) or [None])[0],
+                _records(batting_df),
+                _records(bowling_df),
+                _records(commentary_df)
+            )
+
+        # Create expandable match card
+        with st.expander(
+            f"🏏 {snapshot['team1']} vs {snapshot['team2']} - {snapshot.get('match_format') or ''} (Match {match_id})",
+            expanded=(idx == 0)
+        ):
+            render_match_card(snapshot)
+
+            # The full scorecard needs every live table, so it is only loaded on request
+            if st.checkbox("Show full scorecard & commentary", key=f"full_{match_id}"):
+                if frames is None:
+                    frames = get_match_data(match_id, version)
+                if frames[0] is None or frames[0].empty:
+                    st.info("Full scorecard not available yet")
+                else:
+                    render_match_details(match_id, match_data_version(version), *frames)
+
+            st.markdown("<br>", unsafe_allow_html=True)
+
+
+def render_match_card(snapshot):
+    """Header, score, top performers and recent balls from a match snapshot."""
+    # ========== MATCH HEADER ==========
+    col1, col2, col3 = st.columns([1, 2, 1])
+
+    with col1:
+        st.markdown(f"**🏆 Series:** {snapshot.get('series_name') or 'N/A'}")
+        st.markdown(f"**📅 Format:** {snapshot.get('match_format') or 'N/A'}")
+        st.markdown(f"**🎲 Toss:** {snapshot.get('toss_status') or 'N/A'}")
+
+    with col2:
+        st.markdown(f"### 🏟️ {snapshot['venue']}")
+
+        state = snapshot.get('state') or 'Unknown'
+        if state in ['In Progress', 'Live']:
+            st.markdown(f"**📊 Status:** <span class='live-indicator'></span>**{snapshot.get('status') or 'Live'}**", unsafe_allow_html=True)
+        else:
+            st.markdown(f"**📊 Status:** {snapshot.get('status') or 'Complete'}")
+
+    with col3:
+        st.markdown(f"**🆔 Match ID:** {snapshot.get('match_id')}")
+        st.markdown(f"**📍 State:** {state}")
+
+    st.markdown("---")
+
+    # ========== LIVE SCORE ==========
+    st.markdown("### 📊 Match Score")
+
+    for score_col, team in zip(st.columns(2), snapshot['innings']):
+        with score_col:
+            st.markdown(f"#### {team['team']}")
+            for label, score in team['scores']:
+                st.markdown(f"**{label}:** {score}")
+
+    # ========== TOP PERFORMERS ==========
+    if snapshot['top_batters'] or snapshot['top_bowlers']:
+        perf_col1, perf_col2 = st.columns(2)
+        with perf_col1:
+            st.markdown("#### 🏏 Top Batters")
+            for b in snapshot['top_batters']:
+                st.markdown(f"**{b['name']}** ({b['team']}) {b['runs']} ({b['balls']})")
+        with perf_col2:
+            st.markdown("#### 🎳 Top Bowlers")
+            for b in snapshot['top_bowlers']:
+                st.markdown(f"**{b['name']}** ({b['team']}) {b['wickets']}/{b['runs']} ({b['overs']} ov)")
+
+    if snapshot['last_balls']:
+        st.markdown("#### 💬 Recent Balls")
+        for ball in snapshot['last_balls']:
+            _commentary_card(ball['over'], ball['ball'], ball['text'], ball['event'], ball['runs'])
+
+    st.markdown("---")
+
+
+def render_match_details(match_id, version, match_info, teams_df, venue_df, batting_df, bowling_df, scorecard_df, commentary_df):
+    """Full batting, bowling, commentary and match detail tabs from the live tables."""
+    # ========== MATCH TABS ==========
+    tab1, tab2, tab3, tab4 = st.tabs(["🏏 Batting Stats", "🎳 Bowling Stats", "💬 Live Commentary", "📋 Match Details"])
+
+    # BATTING TAB
+    with tab1:
+        if batting_df is None or batting_df.empty:
+            st.info("No batting data available")
+        else:
+            # Clean numeric columns
+            for col in ['runs', 'strike_rate', 'fours', 'sixes', 'balls_faced']:
+                batting_df = clean_numeric_column(batting_df, col)
+
+            # Summary Stats
+            col1, col2, col3, col4, col5 = st.columns(5)
+
+            with col1:
+                total_runs = int(batting_df['runs'].sum(skipna=True))
+                st.metric("Total Runs", total_runs)
+
+            with col2:
+                batsmen = len(batting_df)
+                st.metric("Batsmen", batsmen)
+
+            with col3:
+                avg_sr = batting_df['strike_rate'].mean(skipna=True)
+                st.metric("Avg Strike Rate", f"{avg_sr:.1f}")
+
+            with col4:
+                fours = int(batting_df['fours'].sum(skipna=True))
+                st.metric("Fours", fours)
+
+            with col5:
+                sixes = int(batting_df['sixes'].sum(skipna=True))
+                st.metric("Sixes", sixes)
+
+            st.markdown("<br>", unsafe_allow_html=True)
+
+            # Filter by team
+            selected_team = "All Teams"
+            if 'team_name' in batting_df.columns:
+                teams = ["All Teams"] + sorted(batting_df['team_name'].dropna().unique().tolist())
+                selected_team = st.selectbox(f"Filter by Team", teams, key=f"bat_team_{match_id}")
+
+                if selected_team != "All Teams":
+                    batting_df = batting_df[batting_df['team_name'] == selected_team]
+
+            # Display table
+            display_cols = ['batsman_name', 'team_name', 'runs', 'balls_faced', 'fours', 'sixes', 'strike_rate', 'out_desc']
+            display_df = batting_df[[col for col in display_cols if col in batting_df.columns]]
+            st.dataframe(display_df, use_container_width=True, height=300)
+
+            # Top performers chart
+            if len(batting_df) > 0 and 'batsman_name' in batting_df.columns:
+                top_batsmen = batting_df.nlargest(5, 'runs')
+                if not top_batsmen.empty:
+                    fig = get_figure(
+                        (match_id, version, 'top_batsmen', selected_team),
+                        lambda: _top_chart(top_batsmen, 'batsman_name', 'runs', 'Top 5 Run Scorers', 'Viridis')
+                    )
+                    st.plotly_chart(fig, use_container_width=True)
+
+    # BOWLING TAB
+    with tab2:
+        if bowling_df is None or bowling_df.empty:
+            st.info("No bowling data available")
+        else:
+            # Clean numeric columns
+            for col in ['wickets', 'economy', 'overs', 'runs_conceded']:
+                bowling_df = clean_numeric_column(bowling_df, col)
+
+            # Summary Stats
+            col1, col2, col3, col4 = st.columns(4)
+
+            with col1:
+                total_wickets = int(bowling_df['wickets'].sum(skipna=True))
+                st.metric("Total Wickets", total_wickets)
+
+            with col2:
+                bowlers = len(bowling_df)
+                st.metric("Bowlers", bowlers)
+
+            with col3:
+                avg_econ = bowling_df['economy'].mean(skipna=True)
+                st.metric("Avg Economy", f"{avg_econ:.2f}")
+
+            with col4:
+                total_overs = bowling_df['overs'].sum(skipna=True)
+                st.metric("Total Overs", f"{total_overs:.1f}")
+
+            st.markdown("<br>", unsafe_allow_html=True)
+
+            # Filter by team
+            selected_team = "All Teams"
+            if 'team_name' in bowling_df.columns:
+                teams = ["All Teams"] + sorted(bowling_df['team_name'].dropna().unique().tolist())
+                selected_team = st.selectbox(f"Filter by Team", teams, key=f"bowl_team_{match_id}")
+
+                if selected_team != "All Teams":
+                    bowling_df = bowling_df[bowling_df['team_name'] == selected_team]
+
+            # Display table
+            display_cols = ['bowler_name', 'team_name', 'overs', 'runs_conceded', 'wickets', 'economy', 'maidens']
+            display_df = bowling_df[[col for col in display_cols if col in bowling_df.columns]]
+            st.dataframe(display_df, use_container_width=True, height=300)
+
+            # Top performers chart
+            if len(bowling_df) > 0 and 'bowler_name' in bowling_df.columns:
+                top_bowlers = bowling_df.nlargest(5, 'wickets')
+                if not top_bowlers.empty:
+                    fig = get_figure(
+                        (match_id, version, 'top_bowlers', selected_team),
+                        lambda: _top_chart(top_bowlers, 'bowler_name', 'wickets', 'Top 5 Wicket Takers', 'Reds')
+                    )
+                    st.plotly_chart(fig, use_container_width=True)
+
+    # LIVE COMMENTARY TAB
+    with tab3:
+        if commentary_df is None or commentary_df.empty:
+            st.info("No live commentary available")
+        else:
+            st.markdown("### 💬 Ball-by-Ball Commentary")
+
+            # Commentary filters
+            col1, col2, col3 = st.columns(3)
+
+            with col1:
+                if 'innings' in commentary_df.columns:
+                    innings_options = ["All Innings"] + sorted(commentary_df['innings'].dropna().unique().tolist())
+                    selected_innings = st.selectbox("Filter by Innings", innings_options, key=f"comm_innings_{match_id}")
+                    if selected_innings != "All Innings":
+                        commentary_df = commentary_df[commentary_df['innings'] == selected_innings]
+
+            with col2:
+                show_count = st.slider("Show last N balls", 10, 100, 30, key=f"comm_count_{match_id}")
+
+            with col3:
+                if 'event_type' in commentary_df.columns:
+                    event_filter = st.multiselect(
+                        "Filter by Event",
+                        options=commentary_df['event_type'].dropna().unique().tolist(),
+                        key=f"comm_event_{match_id}"
+                    )
+                    if event_filter:
+                        commentary_df = commentary_df[commentary_df['event_type'].isin(event_filter)]
+
+            st.markdown("<br>", unsafe_allow_html=True)
+
+            # Display commentary
+            commentary_display = commentary_df.head(show_count)
+
+            if len(commentary_display) == 0:
+                st.info("No commentary matches your filters")
+            else:
+                # Nullable integer columns hold pd.NA, which the card can't compare; show them as None
+                commentary_display = commentary_display.astype(object).where(commentary_display.notna(), None)
+                for idx2, row in commentary_display.iterrows():
+                    _commentary_card(
+                        row.get('over_number', 'N/A'),
+                        row.get('ball_number', 'N/A'),
+                        row.get('commentary_text', 'No commentary available'),
+                        row.get('event_type', ''),
+                        row.get('batter_runs', row.get('runs_scored', 0))
+                    )
+
+            st.markdown("<br>", unsafe_allow_html=True)
+
+            # Commentary Statistics
+            if len(commentary_df) > 0:
+                st.markdown("#### 📊 Commentary Statistics")
+
+                stat_col1, stat_col2, stat_col3, stat_col4 = st.columns(4)
+
+                with stat_col1:
+                    total_balls = len(commentary_df)
+                    st.metric("Total Balls", total_balls)
+
+                with stat_col2:
+                    if 'runs_scored' in commentary_df.columns:
+                        total_runs = int(commentary_df['runs_scored'].sum(skipna=True))
+                        st.metric("Total Runs", total_runs)
+
+                with stat_col3:
+                    if 'event_type' in commentary_df.columns:
+                        wickets = len(commentary_df[commentary_df['event_type'].str.lower() == 'wicket'])
+                        st.metric("Wickets", wickets)
+
+                with stat_col4:
+                    if 'runs_scored' in commentary_df.columns:
+                        boundaries = len(commentary_df[commentary_df['runs_scored'].isin([4, 6])])
+                        st.metric("Boundaries", boundaries)
+
+    # MATCH DETAILS TAB
+    with tab4:
+        st.markdown("### 📋 Complete Match Information")
+
+        # Display all match info
+        match_details = match_info.iloc[0].to_dict()
+
+        # Organize into sections
+        col1, col2 = st.columns(2)
+
+        with col1:
+            st.markdown("#### 🏏 Match Details")
+            st.json({
+                "Match ID": match_details.get('match_id'),
+                "Series": match_details.get('series_name'),
+                "Match Description": match_details.get('match_desc'),
+                "Format": match_details.get('match_format'),
+                "State": match_details.get('state'),
+                "Status": match_details.get('status')
+            })
+
+        with col2:
+            st.markdown("#### 📊 Score Summary")
+            st.json({
+                "Team 1 Inn 1": format_score(
+                    match_details.get('team1_inngs1_runs'),
+                    match_details.get('team1_inngs1_wickets'),
+                    match_details.get('team1_inngs1_overs')
+                ),
+                "Team 1 Inn 2": format_score(
+                    match_details.get('team1_inngs2_runs'),
+                    match_details.get('team1_inngs2_wickets'),
+                    match_details.get('team1_inngs2_overs')
+                ),
+                "Team 2 Inn 1": format_score(
+                    match_details.get('team2_inngs1_runs'),
+                    match_details.get('team2_inngs1_wickets'),
+                    match_details.get('team2_inngs1_overs')
+                ),
+                "Team 2 Inn 2": format_score(
+                    match_details.get('team2_inngs2_runs'),
+                    match_details.get('team2_inngs2_wickets'),
+                    match_details.get('team2_inngs2_overs')
+                )
+            })
+
+        if scorecard_df is not None and not scorecard_df.empty:
+            st.markdown("#### 📝 Scorecard Metadata")
+            st.dataframe(scorecard_df, use_container_width=True)
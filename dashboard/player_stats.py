@@ -0,0 +1,45 @@
+"""Player Stats page: ICC ranks, player records and team results."""
+import streamlit as st
+
+from dashboard.data import get_table_data
+
+
+def render():
+    st.header("🌟 Player & Team Statistics")
+
+    icc_ranks = get_table_data("icc_ranks")
+    player_stats = get_table_data("player_stats")
+    team_results = get_table_data("team_results")
+
+    col1, col2, col3 = st.columns(3)
+    col1.metric("🏆 Ranked Players", icc_ranks.shape[0])
+    col2.metric("📊 Player Records", player_stats.shape[0])
+    col3.metric("📌 Team Results", team_results.shape[0])
+
+    tab1, tab2, tab3 = st.tabs(["🏆 ICC Ranks", "🧑‍💻 Player Stats", "👥 Team Results"])
+
+    with tab1:
+        if icc_ranks.empty:
+            st.info("No ICC ranks found in the database.")
+        else:
+            st.subheader("🏆 ICC Player Rankings")
+            st.dataframe(icc_ranks)
+
+    with tab2:
+        if player_stats.empty:
+            st.info("No player stats found in the database.")
+        else:
+            st.subheader("📊 Player Batting & Bowling Stats")
+            format_filter = st.selectbox("Filter by Format", ["All"] + player_stats["format_type"].unique().tolist())
+            if format_filter != "All":
+                player_stats = player_stats[player_stats["format_type"] == format_filter]
+            st.dataframe(player_stats)
+            if "runs" in player_stats.columns:
+                st.bar_chart(player_stats.groupby("player_name")["runs"].sum().sort_values(ascending=False).head(10))
+
+    with tab3:
+        if team_results.empty:
+            st.info("No team results found in the database.")
+        else:
+            st.subheader("👥 Team Match Results")
+            st.dataframe(team_results)
@@ -0,0 +1,364 @@
+"""SQL Analytics page: the curated analytics queries."""
+import time
+
+import pandas as pd
+import streamlit as st
+
+from analytics_engine import run_analytics_query
+from dashboard.charts import (
+    AGGREGATIONS,
+    CHART_MAX_POINTS,
+    default_label_column,
+    numeric_columns,
+    reduce_for_chart,
+)
+from dashboard.data import get_available_summaries, get_query_governor, query_messages
+from summary_tables import SUMMARY_TABLES
+
+
+def render():
+    st.header("📊 SQL Analytics & Insights")
+
+    # Intro Row with Metrics
+    col1, col2, col3 = st.columns(3)
+    col1.metric("📝 Total Queries", 25)
+    col2.metric("🔎 Beginner Queries", 8)
+    col3.metric("⚡ Advanced Queries", 10)
+    st.markdown("---")
+
+    queries = {
+        # Beginner Level
+        "1. Players representing India": """
+            SELECT player_name, playing_role, batting_style, bowling_style
+            FROM player_info
+            WHERE country = 'India';
+        """,
+        "2. Recent cricket matches": """
+            SELECT CONCAT(Team_1, ' vs ', Team_2) AS match_desc, Team_1, Team_2, Venue, Start_Time
+            FROM recent_matches
+            WHERE Start_Time >= DATE_SUB(CURDATE(), INTERVAL 7 DAY)
+            ORDER BY Start_Time DESC;
+        """,
+        "3. Top 10 ODI run scorers": """
+            SELECT player_id, player_name, matches, innings, runs, average, strike_rate, hundreds, fifties
+            FROM player_stats
+            WHERE format_type = 'ODI'
+            ORDER BY runs DESC
+            LIMIT 10;
+        """,
+        "4. Venues with capacity > 50,000": """
+            SELECT venue_name, city, country, capacity
+            FROM venues
+            WHERE capacity > 50000
+            ORDER BY capacity DESC;
+        """,
+        "5. Matches won by team": """
+            SELECT team_name,
+            COUNT(*) as total_wins
+            FROM (
+            SELECT Team_1 as team_name
+            FROM recent_matches 
+            WHERE Status LIKE '%won by%' AND Status LIKE CONCAT(Team_1, '%')
+            UNION ALL
+            SELECT Team_2 as team_name
+            FROM recent_matches 
+            WHERE Status LIKE '%won by%' AND Status LIKE CONCAT(Team_2, '%')
+            ) as wins
+            GROUP BY team_name
+            ORDER BY total_wins DESC;
+        """,
+        "6. Player count by role": """
+            SELECT playing_role, COUNT(*) AS player_count
+            FROM player_info
+            GROUP BY playing_role;
+        """,
+        "7. Highest individual score by format": """
+            SELECT format_type, MAX(runs) AS highest
+            FROM player_stats
+            GROUP BY format_type;
+        """,
+        "8. Series started in 2024": """
+            SELECT Series_ID, Series_Name, Start_Date, End_Date, Year
+            FROM series_list
+        """,
+
+        # Intermediate Level
+        "9. All-rounders with 1000+ runs & 50+ wickets": """
+            SELECT player_name, runs, wickets, format_type
+            FROM player_stats
+            WHERE runs > 1000 AND wickets > 50;
+        """,
+        "10. Last 20 completed matches": """
+            SELECT CONCAT(Team_1, ' vs ', Team_2) AS match_desc, Team_1, Team_2, Status, Venue, Start_Time
+            FROM recent_matches
+            ORDER BY Start_Time DESC
+            LIMIT 20;
+        """,
+        "11. Player performance across formats": """
+            SELECT player_name, 
+                SUM(CASE WHEN format_type='Test' THEN runs ELSE 0 END) AS test_runs,
+                SUM(CASE WHEN format_type='ODI' THEN runs ELSE 0 END) AS odi_runs,
+                SUM(CASE WHEN format_type='T20I' THEN runs ELSE 0 END) AS t20i_runs,
+                AVG(average) AS overall_avg
+            FROM player_stats
+            GROUP BY player_name
+            HAVING COUNT(DISTINCT format_type) >= 2;
+        """,
+        "12. Team home vs away wins": """
+            SELECT t.team_name,
+            SUM(CASE WHEN t.team_name = rm.Team_1 AND rm.Status LIKE CONCAT(t.team_name, '%') THEN 1 ELSE 0 END) AS home_wins,
+            SUM(CASE WHEN t.team_name = rm.Team_2 AND rm.Status LIKE CONCAT(t.team_name, '%') THEN 1 ELSE 0 END) AS away_wins
+            FROM recent_matches rm
+            JOIN (
+            SELECT Team_1 AS team_name FROM recent_matches
+            UNION
+            SELECT Team_2 FROM recent_matches
+            ) t ON t.team_name IN (rm.Team_1, rm.Team_2)
+            GROUP BY t.team_name
+            ORDER BY t.team_name;
+        """,
+        "13. 100+ run partnerships (adjacent batsmen)": """
+            SELECT 
+                bat1_name AS batsman1,
+                bat1_position AS position1,
+                bat2_name AS batsman2,
+                bat2_position AS position2,
+                total_runs AS partnership_runs,
+                innings_id,
+                team_name,
+                match_id
+            FROM live_partnerships
+            WHERE 
+                total_runs >= 100
+                AND is_adjacent = 1
+            ORDER BY 
+                total_runs DESC;
+        """,
+        "14. Bowling performance by venue": """
+        SELECT 
+            ps.player_name,
+            vm.venue_name,
+            AVG(ps.economy_rate) AS avg_economy,
+            SUM(ps.wickets) AS total_wickets,
+            COUNT(*) AS matches
+        FROM player_stats ps
+        JOIN venue_matches vm 
+            ON ps.format_type = vm.match_format
+        WHERE ps.overs_bowled >= 4
+        GROUP BY ps.player_name, vm.venue_name
+        HAVING matches >= 3
+        ORDER BY total_wickets DESC;
+        """,
+        "15. Player performance in close matches": """
+            SELECT series_name, match_type, team_1, team_2, status, start_time
+            FROM recent_matches
+            WHERE status LIKE '%won by % run%'
+                AND CAST(SUBSTRING_INDEX(SUBSTRING_INDEX(status, ' ', -2), ' ', 1) AS UNSIGNED) < 50
+                OR status LIKE '%won by % wkt%'
+                AND CAST(SUBSTRING_INDEX(SUBSTRING_INDEX(status, ' ', -2), ' ', 1) AS UNSIGNED) < 5
+            ORDER BY start_time DESC;
+        """,
+        "16. Batting performance by year (since 2020)": """
+            SELECT 
+                player_name,
+                format_type,
+                AVG(runs) AS avg_runs,
+                AVG(strike_rate) AS avg_sr,
+                COUNT(*) AS records
+            FROM player_stats
+            GROUP BY player_name, format_type
+            HAVING records >= 5;
+        """,
+        # Advanced Level
+        "17. Toss win advantage analysis": """
+            SELECT toss_decision, 
+                ROUND(100 * SUM(CASE WHEN toss_winner = match_winner THEN 1 ELSE 0 END)/COUNT(*),2) AS win_pct
+            FROM live_matches
+            GROUP BY toss_decision;
+        """,
+        "18. Most economical bowlers (ODI & T20)": """
+            SELECT bowler_name, AVG(economy_rate) AS avg_economy, SUM(wickets) AS total_wickets, COUNT(*) AS matches
+            FROM player_bowling_stats
+            WHERE format IN ('ODI', 'T20I')
+            GROUP BY bowler_name
+            HAVING matches >= 10 AND AVG(overs_bowled) >= 2
+            ORDER BY avg_economy ASC;
+        """,
+        "19. Most consistent batsmen (since 2022)": """
+            SELECT player_name, AVG(runs) AS avg_runs, STDDEV(runs) AS run_stddev
+            FROM player_batting_stats
+            WHERE balls_faced >= 10 AND match_date >= '2022-01-01'
+            GROUP BY player_name
+            HAVING COUNT(*) >= 5
+            ORDER BY run_stddev ASC;
+        """,
+        "20. Player matches & averages by format": """
+            SELECT player_name, 
+                SUM(CASE WHEN format='Test' THEN 1 ELSE 0 END) AS test_matches,
+                SUM(CASE WHEN format='ODI' THEN 1 ELSE 0 END) AS odi_matches,
+                SUM(CASE WHEN format='T20I' THEN 1 ELSE 0 END) AS t20_matches,
+                AVG(CASE WHEN format='Test' THEN batting_average END) AS test_avg,
+                AVG(CASE WHEN format='ODI' THEN batting_average END) AS odi_avg,
+                AVG(CASE WHEN format='T20I' THEN batting_average END) AS t20_avg
+            FROM player_batting_stats
+            GROUP BY player_name
+            HAVING (test_matches + odi_matches + t20_matches) >= 20;
+        """,
+        "21. Player performance ranking": """
+            SELECT player_name,
+                (runs * 0.01 + batting_average * 0.5 + strike_rate * 0.3) +
+                (wickets * 2 + (50-bowling_average)*0.5 + (6-economy_rate)*2) +
+                (catches + stumpings) AS total_points
+            FROM player_stats
+            ORDER BY total_points DESC
+            LIMIT 20;
+        """,
+        "22. Head-to-head team analysis (last 3 years)": """
+            SELECT team1, team2, COUNT(*) AS matches_played,
+                SUM(CASE WHEN winner = team1 THEN 1 ELSE 0 END) AS team1_wins,
+                SUM(CASE WHEN winner = team2 THEN 1 ELSE 0 END) AS team2_wins,
+                AVG(CASE WHEN winner = team1 THEN victory_margin END) AS team1_avg_margin,
+                AVG(CASE WHEN winner = team2 THEN victory_margin END) AS team2_avg_margin
+            FROM matches
+            WHERE match_date >= DATE_SUB(CURDATE(), INTERVAL 3 YEAR)
+            GROUP BY team1, team2
+            HAVING matches_played >= 5;
+        """,
+        "23. Recent player form & momentum": """
+            SELECT player_name,
+                AVG(CASE WHEN match_num > 5 THEN runs END) AS avg_last_10,
+                AVG(CASE WHEN match_num <= 5 THEN runs END) AS avg_last_5,
+                SUM(CASE WHEN runs >= 50 THEN 1 ELSE 0 END) AS scores_50plus,
+                STDDEV(runs) AS consistency_score
+            FROM (
+                SELECT player_name, runs, ROW_NUMBER() OVER (PARTITION BY player_name ORDER BY match_date DESC) AS match_num
+                FROM player_batting_stats
+            ) AS recent
+            WHERE match_num <= 10
+            GROUP BY player_name;
+        """,
+        "24. Best batting partnerships": """
+            SELECT p1.player_name AS batsman1, p2.player_name AS batsman2,
+                AVG(partnership_runs) AS avg_runs,
+                SUM(CASE WHEN partnership_runs > 50 THEN 1 ELSE 0 END) AS fifty_plus,
+                MAX(partnership_runs) AS highest,
+                COUNT(*) AS total_partnerships
+            FROM partnerships
+            JOIN player_info p1 ON partnerships.batsman1_id = p1.player_id
+            JOIN player_info p2 ON partnerships.batsman2_id = p2.player_id
+            WHERE ABS(partnerships.batsman1_pos - partnerships.batsman2_pos) = 1
+            GROUP BY batsman1, batsman2
+            HAVING total_partnerships >= 5
+            ORDER BY avg_runs DESC;
+        """,
+        "25. Player performance time-series analysis": """
+            SELECT player_name, 
+                CONCAT(YEAR(match_date), '-Q', QUARTER(match_date)) AS quarter,
+                AVG(runs) AS avg_runs, AVG(strike_rate) AS avg_sr, COUNT(*) AS matches
+            FROM player_batting_stats
+            GROUP BY player_name, quarter
+            HAVING COUNT(*) >= 3
+            ORDER BY player_name, quarter;
+        """
+    }
+    # Aggregations that the ingesters keep materialized (see summary_tables.py)
+    summary_backed = {
+        "5. Matches won by team": "summary_team_wins",
+        "11. Player performance across formats": "summary_player_formats",
+        "17. Toss win advantage analysis": "summary_toss_decisions",
+        "24. Best batting partnerships": "summary_partnership_pairs",
+    }
+
+    query_choice = st.selectbox("🔍 Choose a query to run:", list(queries.keys()))
+    if st.button("▶ Run Query"):
+        sql = queries[query_choice]
+        messages = []
+        summary_name = summary_backed.get(query_choice)
+        if summary_name and summary_name in get_available_summaries():
+            sql = SUMMARY_TABLES[summary_name]['query']
+            messages.append(('caption', f"⚡ Served from materialized summary `{summary_name}`"))
+
+        # Prefer the DuckDB snapshot so analytics don't compete with ingestion writes
+        df = run_analytics_query(sql)
+        if df is not None:
+            messages.append(('caption', "🦆 Served from the DuckDB analytics snapshot"))
+            # Kept in the session so changing the chart options doesn't rerun the query
+            st.session_state['sql_result'] = {'query': query_choice, 'df': df, 'messages': messages}
+        else:
+            # MySQL queries run on the governor's worker pool so they can be timed out or cancelled
+            st.session_state.pop('sql_result', None)
+            st.session_state['sql_pending'] = {
+                'query': query_choice,
+                'token': get_query_governor().submit(sql),
+                'messages': messages,
+            }
+
+    pending = st.session_state.get('sql_pending')
+    if pending:
+        governor = get_query_governor()
+        running = governor.status(pending['token'])
+        if running is None:
+            # Governor was recreated (e.g. the server restarted); the query is gone
+            del st.session_state['sql_pending']
+        elif not running.done.is_set():
+            st.info(
+                f"⏳ Running **{pending['query']}** for {running.elapsed:.1f}s "
+                f"(budget {running.timeout_ms / 1000:.0f}s)"
+            )
+            if st.button("⏹ Cancel query"):
+                governor.cancel(pending['token'])
+            time.sleep(0.5)
+            st.rerun()
+        else:
+            governor.pop(pending['token'])
+            del st.session_state['sql_pending']
+            st.session_state['sql_result'] = {
+                'query': pending['query'],
+                'df': running.df if running.state == 'done' else pd.DataFrame(),
+                'messages': pending['messages'] + query_messages(running),
+                'failed': running.state != 'done',
+            }
+
+    result = st.session_state.get('sql_result')
+    if result and result['query'] == query_choice:
+        df = result['df']
+        for level, message in result['messages']:
+            getattr(st, level)(message)
+
+        if df.empty:
+            if not result.get('failed'):
+                st.warning("No results found for this query.")
+        else:
+            st.markdown("""
+            <div style="background:#ffffff;
+                        padding:15px;
+                        border-radius:12px;
+                        box-shadow:0 2px 10px rgba(0,0,0,0.1);
+                        margin-bottom:15px;">
+                <h4 style="color:#0B6623;">📊 Query Results</h4>
+            </div>
+            """, unsafe_allow_html=True)
+
+            st.dataframe(df)
+
+            numeric_cols = numeric_columns(df)
+
+            if len(numeric_cols) > 0:
+                st.subheader("📈 Quick Visualization")
+
+                label_options = list(df.columns)
+                default_label = default_label_column(df)
+                viz_col1, viz_col2, viz_col3, viz_col4 = st.columns(4)
+                label_col = viz_col1.selectbox("Label", label_options, index=label_options.index(default_label), key="viz_label")
+                value_options = [c for c in numeric_cols if c != label_col] or numeric_cols
+                value_col = viz_col2.selectbox("Value", value_options, key="viz_value")
+                agg = viz_col3.selectbox("Aggregate", AGGREGATIONS, key="viz_agg")
+                max_points = viz_col4.number_input("Top N", 1, CHART_MAX_POINTS, min(20, CHART_MAX_POINTS), key="viz_top")
+
+                try:
+                    series, note = reduce_for_chart(df, label_col, value_col, agg, int(max_points))
+                    if note:
+                        st.caption(f"✂️ {note}")
+                    st.bar_chart(series)
+                except Exception as e:
+                    st.error(f"⚠️ Could not render chart: {e}")
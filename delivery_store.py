@@ -0,0 +1,220 @@
+"""
+Structured ball-by-ball deliveries derived from commentary.
+
+Commentary is stored as free text, so every ball-level question ("how many
+dot balls did X bowl to Y?") would otherwise re-parse it. This module turns
+classified commentary (see commentary_classifier) into one integer-coded
+row per delivery, legal or not:
+
+    match_id, innings, over_num, ball_num, timestamp,
+    bowler_id, batter_id, runs, batter_runs, extras, extras_type, wicket_kind
+
+Bowler and batter come from the "Bowler to Batter," prefix of each ball's line
+(followed by its outcome, see OUTCOME_TOKEN) and
+are coded through the delivery_players table (name -> player_key); extras
+and dismissals are small integer codes (EXTRAS_TYPES, WICKET_KINDS).
+
+Deliveries are upserted per batch into the `deliveries` MySQL table by
+store_deliveries() (or write_deliveries() inside the caller's transaction).
+"""
+import logging
+from typing import Dict, Iterable
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# What a ball's line says first after "Bowler to Batter,": "no run", "2 runs", "FOUR",
+# "B0$ SIX" (bold markup), "wide", "3 wides", "leg byes", "no ball", "out ...".
+# "Kohli comes to the crease, ..." or "drinks break, ..." have the prefix's shape but not this.
+OUTCOME_TOKEN = (
+    r'\s*(?i:(?:b\d+\$\s*)?(?:no runs?|\d+\s+(?:runs?|wides?|(?:leg[\s-]?)?byes?|no[\s-]?balls?)'
+    r'|four|six|wides?|no[\s-]?balls?|(?:leg[\s-]?)?byes?|out)\b)'
+)
+# "Starc to Kohli, 1 run, ..." -> ("Starc", "Kohli"); other lines are not deliveries
+DELIVERY_PREFIX = r'^\s*([^,]+?)\s+to\s+([^,]+?)\s*,' + OUTCOME_TOKEN
+
+EXTRAS_TYPES = {0: None, 1: 'wide', 2: 'no ball', 3: 'leg bye', 4: 'bye'}
+WICKET_KINDS = {
+    0: None, 1: 'bowled', 2: 'caught', 3: 'lbw', 4: 'run out',
+    5: 'stumped', 6: 'hit wicket', 7: 'other',
+}
+# Checked in order on lines classified as wickets; the first match wins
+WICKET_PATTERNS = [
+    (4, r'\brun out\b'),
+    (5, r'\bstumped\b'),
+    (6, r'\bhit wicket\b'),
+    (3, r'\blbw\b'),
+    (2, r'\bcaught\b|\bc & b\b'),
+    (1, r'\bbowled\b'),
+]
+
+DELIVERY_DTYPE = np.dtype([
+    ('match_id', np.int64),
+    ('innings', np.int8),
+    ('over_num', np.int16),
+    ('ball_num', np.int8),
+    ('timestamp', np.int64),
+    ('bowler_id', np.int32),
+    ('batter_id', np.int32),
+    ('runs', np.int16),
+    ('batter_runs', np.int16),
+    ('extras', np.int16),
+    ('extras_type', np.int8),
+    ('wicket_kind', np.int8),
+])
+DELIVERY_KEY = ['match_id', 'innings', 'timestamp']
+# parse_deliveries() output: DELIVERY_DTYPE with player names instead of keys
+PARSED_COLUMNS = [
+    'match_id', 'innings', 'over_num', 'ball_num', 'timestamp', 'bowler', 'batter',
+    'runs', 'batter_runs', 'extras', 'extras_type', 'wicket_kind',
+]
+
+DELIVERY_TABLE_DDL = {
+    'delivery_players': """
+        CREATE TABLE IF NOT EXISTS delivery_players (
+            player_key INT NOT NULL AUTO_INCREMENT,
+            name VARCHAR(100) NOT NULL,
+            PRIMARY KEY (player_key),
+            UNIQUE KEY uq_name (name)
+        )
+    """,
+    'deliveries': """
+        CREATE TABLE IF NOT EXISTS deliveries (
+            match_id BIGINT NOT NULL,
+            innings TINYINT NOT NULL,
+            over_num SMALLINT NOT NULL,
+            ball_num TINYINT NOT NULL,
+            timestamp BIGINT NOT NULL,
+            bowler_id INT NOT NULL,
+            batter_id INT NOT NULL,
+            runs SMALLINT NOT NULL,
+            batter_runs SMALLINT NOT NULL,
+            extras SMALLINT NOT NULL,
+            extras_type TINYINT NOT NULL,
+            wicket_kind TINYINT NOT NULL,
+            PRIMARY KEY (match_id, innings, timestamp),
+            INDEX idx_bowler (bowler_id),
+            INDEX idx_batter (batter_id)
+        )
+    """,
+}
+
+
+def parse_deliveries(commentary: pd.DataFrame) -> pd.DataFrame:
+    """
+    Delivery rows from a classified live_commentary frame, with player names still as text.
+
+    Lines without a "Bowler to Batter, <outcome>" start (over summaries, notes) or
+    without a timestamp are dropped.
+    """
+    if commentary.empty:
+        return pd.DataFrame(columns=PARSED_COLUMNS)
+
+    text = commentary['commentary_text'].fillna('').astype(str)
+    names = text.str.extract(DELIVERY_PREFIX)
+    timestamp = pd.to_numeric(commentary['timestamp'], errors='coerce')
+    keep = (names[0].notna() & timestamp.notna()).to_numpy()
+
+    df = commentary.loc[keep]
+    text = text[keep].str.lower()
+    over_number = pd.to_numeric(df['over_number'], errors='coerce').fillna(0).to_numpy()
+    over_num = np.floor(over_number)
+
+    is_wide = df['is_wide'].to_numpy(dtype=bool)
+    is_no_ball = df['is_no_ball'].to_numpy(dtype=bool)
+    is_leg_bye = df['is_leg_bye'].to_numpy(dtype=bool)
+    is_bye = df['is_bye'].to_numpy(dtype=bool)
+    extras_type = np.select([is_wide, is_no_ball, is_leg_bye, is_bye], [1, 2, 3, 4], default=0)
+
+    is_wicket = df['is_wicket'].to_numpy(dtype=bool)
+    wicket_kind = np.select(
+        [text.str.contains(pattern).to_numpy() for _, pattern in WICKET_PATTERNS],
+        [code for code, _ in WICKET_PATTERNS],
+        default=7
+    )
+    wicket_kind = np.where(is_wicket, wicket_kind, 0)
+
+    return pd.DataFrame({
+        'match_id': df['match_id'].to_numpy(dtype=np.int64),
+        'innings': pd.to_numeric(df['innings'], errors='coerce').fillna(0).to_numpy(dtype=np.int8),
+        'over_num': over_num.astype(np.int16),
+        'ball_num': np.rint((over_number - over_num) * 10).astype(np.int8),
+        'timestamp': timestamp[keep].to_numpy(dtype=np.int64),
+        'bowler': names[0][keep].str.strip().to_numpy(dtype=object),
+        'batter': names[1][keep].str.strip().to_numpy(dtype=object),
+        'runs': df['runs_scored'].to_numpy(dtype=np.int16),
+        'batter_runs': df['batter_runs'].to_numpy(dtype=np.int16),
+        'extras': df['extras'].to_numpy(dtype=np.int16),
+        'extras_type': extras_type.astype(np.int8),
+        'wicket_kind': wicket_kind.astype(np.int8),
+    }).drop_duplicates(subset=DELIVERY_KEY, keep='last')
+
+
+def to_array(deliveries: pd.DataFrame, player_keys: Dict[str, int]) -> np.ndarray:
+    """Code bowler/batter names with player_keys and pack the rows into DELIVERY_DTYPE."""
+    array = np.empty(len(deliveries), dtype=DELIVERY_DTYPE)
+    for name in DELIVERY_DTYPE.names:
+        if name == 'bowler_id':
+            array[name] = deliveries['bowler'].map(player_keys).to_numpy()
+        elif name == 'batter_id':
+            array[name] = deliveries['batter'].map(player_keys).to_numpy()
+        else:
+            array[name] = deliveries[name].to_numpy()
+    return array
+
+
+def resolve_player_keys(conn, names: Iterable[str]) -> Dict[str, int]:
+    """delivery_players keys of commentary names, adding names not seen before."""
+    from sqlalchemy import bindparam, text
+
+    names = sorted(set(names))
+    if not names:
+        return {}
+    conn.execute(text("INSERT IGNORE INTO delivery_players (name) VALUES (:name)"), [{'name': n} for n in names])
+    rows = conn.execute(
+        text("SELECT name, player_key FROM delivery_players WHERE name IN :names")
+        .bindparams(bindparam('names', expanding=True)),
+        {'names': names}
+    )
+    return {name: key for name, key in rows}
+
+
+def write_deliveries(conn, commentary: pd.DataFrame) -> int:
+    """
+    Upsert the deliveries in a batch of classified commentary on an open connection,
+    so they commit (or roll back) with the caller's other writes.
+
+    Returns:
+        Number of deliveries written.
+    """
+    from sqlalchemy import text
+
+    deliveries = parse_deliveries(commentary)
+    if deliveries.empty:
+        return 0
+
+    columns = list(DELIVERY_DTYPE.names)
+    updates = ", ".join(f"{c} = VALUES({c})" for c in columns if c not in DELIVERY_KEY)
+    for ddl in DELIVERY_TABLE_DDL.values():
+        conn.execute(text(ddl))
+    player_keys = resolve_player_keys(conn, pd.concat([deliveries['bowler'], deliveries['batter']]))
+    array = to_array(deliveries, player_keys)
+    conn.execute(
+        text(
+            f"INSERT INTO deliveries ({', '.join(columns)}) "
+            f"VALUES ({', '.join(':' + c for c in columns)}) "
+            f"ON DUPLICATE KEY UPDATE {updates}"
+        ),
+        [dict(zip(columns, row)) for row in array.tolist()]
+    )
+
+    logger.info(f"✓ Stored {len(array)} deliveries")
+    return len(array)
+
+
+def store_deliveries(engine, commentary: pd.DataFrame) -> int:
+    """Upsert the deliveries in a batch of classified commentary into the deliveries table, in their own transaction."""
+    with engine.begin() as conn:
+        return write_deliveries(conn, commentary)
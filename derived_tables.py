@@ -0,0 +1,312 @@
+"""
+Derived analytics tables built from the ingested live data.
+
+The SQL Analytics page queries `matches`, `live_matches`, `player_batting_stats`,
+`player_bowling_stats` and `partnerships`, which no API script produces
+directly. derive_completed_matches() fills them from the live_* tables and
+match_headers, appending only matches that finished since the last run.
+
+player_batting_stats.batting_average holds the player's career average in
+that format (total runs / dismissals over all their stored innings, NULL
+until first dismissed), refreshed on every row of the players a run touched,
+so query 20's AVG(batting_average) per format is that average.
+"""
+import logging
+from typing import List
+
+from sqlalchemy import bindparam, text
+
+logger = logging.getLogger(__name__)
+
+DERIVED_TABLE_DDL = {
+    'matches': """
+        CREATE TABLE IF NOT EXISTS matches (
+            match_id BIGINT NOT NULL,
+            match_date DATE,
+            format VARCHAR(10),
+            series_id BIGINT,
+            team1 VARCHAR(255),
+            team2 VARCHAR(255),
+            winner VARCHAR(255),
+            victory_margin INT,
+            margin_type VARCHAR(10),
+            derived_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (match_id),
+            INDEX idx_match_date (match_date),
+            INDEX idx_teams (team1, team2)
+        )
+    """,
+    'live_matches': """
+        CREATE TABLE IF NOT EXISTS live_matches (
+            match_id BIGINT NOT NULL,
+            toss_winner VARCHAR(255),
+            toss_decision VARCHAR(10),
+            match_winner VARCHAR(255),
+            derived_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (match_id),
+            INDEX idx_toss_decision (toss_decision)
+        )
+    """,
+    'player_batting_stats': """
+        CREATE TABLE IF NOT EXISTS player_batting_stats (
+            match_id BIGINT NOT NULL,
+            innings_id INT NOT NULL,
+            player_id BIGINT NOT NULL,
+            player_name VARCHAR(255),
+            team_name VARCHAR(255),
+            format VARCHAR(10),
+            match_date DATE,
+            batting_position TINYINT,
+            runs INT,
+            balls_faced INT,
+            fours INT,
+            sixes INT,
+            strike_rate DECIMAL(6,2),
+            is_out TINYINT(1),
+            batting_average DECIMAL(6,2),
+            PRIMARY KEY (match_id, innings_id, player_id),
+            INDEX idx_player_date (player_name, match_date),
+            INDEX idx_format (format),
+            INDEX idx_match_date (match_date)
+        )
+    """,
+    'player_bowling_stats': """
+        CREATE TABLE IF NOT EXISTS player_bowling_stats (
+            match_id BIGINT NOT NULL,
+            innings_id INT NOT NULL,
+            bowler_id BIGINT NOT NULL,
+            bowler_name VARCHAR(255),
+            team_name VARCHAR(255),
+            format VARCHAR(10),
+            match_date DATE,
+            overs_bowled DECIMAL(5,1),
+            maidens INT,
+            runs_conceded INT,
+            wickets INT,
+            economy_rate DECIMAL(5,2),
+            PRIMARY KEY (match_id, innings_id, bowler_id),
+            INDEX idx_bowler_format (bowler_name, format),
+            INDEX idx_match_date (match_date)
+        )
+    """,
+    'partnerships': """
+        CREATE TABLE IF NOT EXISTS partnerships (
+            match_id BIGINT NOT NULL,
+            innings_id INT NOT NULL,
+            partnership_number TINYINT NOT NULL,
+            team_name VARCHAR(255),
+            batsman1_id BIGINT,
+            batsman2_id BIGINT,
+            batsman1_pos TINYINT,
+            batsman2_pos TINYINT,
+            partnership_runs INT,
+            partnership_balls INT,
+            PRIMARY KEY (match_id, innings_id, partnership_number),
+            INDEX idx_batsmen (batsman1_id, batsman2_id)
+        )
+    """,
+}
+
+# Cricbuzz reports 'TEST'/'ODI'/'T20'; the analytics queries use 'Test'/'ODI'/'T20I'
+FORMAT_EXPR = """
+    CASE UPPER(mi.match_format)
+        WHEN 'TEST' THEN 'Test'
+        WHEN 'ODI' THEN 'ODI'
+        WHEN 'T20' THEN IF(ls.match_type = 'International', 'T20I', 'T20')
+        ELSE mi.match_format
+    END
+"""
+
+# Shared FROM clause giving every completed match its format and date
+MATCH_CONTEXT = f"""
+    SELECT mi.match_id,
+        MAX({FORMAT_EXPR}) AS format,
+        MAX(DATE(FROM_UNIXTIME(mi.start_date / 1000))) AS match_date
+    FROM live_match_info mi
+    LEFT JOIN (
+        SELECT match_id, MAX(match_type) AS match_type
+        FROM live_series
+        GROUP BY match_id
+    ) ls ON ls.match_id = mi.match_id
+    WHERE mi.match_id IN :ids
+    GROUP BY mi.match_id
+"""
+
+# Each scorecard poll appends a new snapshot in append mode; batting, bowling and
+# partnership figures only grow during a match, so MAX() picks the final value.
+# A batting row counts as an innings once the batter faced a ball or has an
+# out_desc (run out without facing, or not out on 0*); rows with neither are
+# batters who did not bat.
+DERIVATIONS = [
+    ('matches', """
+        INSERT IGNORE INTO matches (
+            match_id, match_date, format, series_id, team1, team2,
+            winner, victory_margin, margin_type
+        )
+        SELECT mi.match_id,
+            ctx.match_date,
+            ctx.format,
+            MAX(mi.series_id),
+            MAX(CASE WHEN t.team_role = 'team1' THEN t.team_name END),
+            MAX(CASE WHEN t.team_role = 'team2' THEN t.team_name END),
+            MAX(CASE WHEN mi.status LIKE '% won by %'
+                THEN SUBSTRING_INDEX(mi.status, ' won by ', 1) END),
+            MAX(CASE WHEN mi.status LIKE '% won by %'
+                THEN CAST(SUBSTRING_INDEX(SUBSTRING_INDEX(mi.status, ' won by ', -1), ' ', 1) AS UNSIGNED) END),
+            MAX(CASE WHEN mi.status LIKE '% won by % run%' THEN 'runs'
+                WHEN mi.status LIKE '% won by % wkt%' THEN 'wickets' END)
+        FROM live_match_info mi
+        JOIN ({context}) ctx ON ctx.match_id = mi.match_id
+        LEFT JOIN live_teams t ON t.match_id = mi.match_id
+        GROUP BY mi.match_id, ctx.match_date, ctx.format
+    """),
+    ('live_matches', """
+        INSERT IGNORE INTO live_matches (match_id, toss_winner, toss_decision, match_winner)
+        SELECT mi.match_id,
+            MAX(SUBSTRING_INDEX(mi.toss_status, ' opt', 1)),
+            MAX(CASE WHEN mi.toss_status LIKE '%bat%' THEN 'bat'
+                WHEN mi.toss_status LIKE '%bowl%' OR mi.toss_status LIKE '%field%' THEN 'bowl' END),
+            MAX(CASE WHEN mi.status LIKE '% won by %'
+                THEN SUBSTRING_INDEX(mi.status, ' won by ', 1) END)
+        FROM live_match_info mi
+        WHERE mi.match_id IN :ids AND mi.toss_status LIKE '% opt to %'
+        GROUP BY mi.match_id
+    """),
+    ('player_batting_stats', """
+        INSERT INTO player_batting_stats (
+            match_id, innings_id, player_id, player_name, team_name, format, match_date,
+            batting_position, runs, balls_faced, fours, sixes, strike_rate, is_out
+        )
+        SELECT b.match_id, b.innings_id, b.batsman_id,
+            MAX(b.batsman_name), MAX(b.team_name), ctx.format, ctx.match_date,
+            MIN(b.batting_position),
+            MAX(b.runs), MAX(b.balls_faced), MAX(b.fours), MAX(b.sixes),
+            ROUND(100 * MAX(b.runs) / NULLIF(MAX(b.balls_faced), 0), 2),
+            MAX(b.out_desc IS NOT NULL AND b.out_desc NOT IN ('', 'not out', 'batting'))
+        FROM live_batting_stats b
+        JOIN ({context}) ctx ON ctx.match_id = b.match_id
+        WHERE b.batsman_id IS NOT NULL
+        GROUP BY b.match_id, b.innings_id, b.batsman_id, ctx.format, ctx.match_date
+        HAVING MAX(b.balls_faced) > 0 OR MAX(COALESCE(b.out_desc, '') <> '')
+        ON DUPLICATE KEY UPDATE runs = VALUES(runs), balls_faced = VALUES(balls_faced), is_out = VALUES(is_out)
+    """),
+    ('player_bowling_stats', """
+        INSERT INTO player_bowling_stats (
+            match_id, innings_id, bowler_id, bowler_name, team_name, format, match_date,
+            overs_bowled, maidens, runs_conceded, wickets, economy_rate
+        )
+        SELECT bw.match_id, bw.innings_id, bw.bowler_id,
+            MAX(bw.bowler_name), MAX(bw.team_name), ctx.format, ctx.match_date,
+            MAX(bw.overs), MAX(bw.maidens), MAX(bw.runs_conceded), MAX(bw.wickets),
+            ROUND(6 * MAX(bw.runs_conceded) / NULLIF(
+                FLOOR(MAX(bw.overs)) * 6 + ROUND((MAX(bw.overs) - FLOOR(MAX(bw.overs))) * 10), 0), 2)
+        FROM live_bowling_stats bw
+        JOIN ({context}) ctx ON ctx.match_id = bw.match_id
+        WHERE bw.bowler_id IS NOT NULL
+        GROUP BY bw.match_id, bw.innings_id, bw.bowler_id, ctx.format, ctx.match_date
+        ON DUPLICATE KEY UPDATE wickets = VALUES(wickets), runs_conceded = VALUES(runs_conceded)
+    """),
+    ('partnerships', """
+        INSERT IGNORE INTO partnerships (
+            match_id, innings_id, partnership_number, team_name,
+            batsman1_id, batsman2_id, batsman1_pos, batsman2_pos,
+            partnership_runs, partnership_balls
+        )
+        SELECT p.match_id, p.innings_id, p.partnership_number, MAX(p.team_name),
+            MAX(p.bat1_id), MAX(p.bat2_id), MAX(p.bat1_position), MAX(p.bat2_position),
+            MAX(p.total_runs), MAX(p.total_balls)
+        FROM live_partnerships p
+        WHERE p.match_id IN :ids
+        GROUP BY p.match_id, p.innings_id, p.partnership_number
+    """),
+]
+
+# Career average per player and format, written onto every innings row of the
+# players who batted in the matches just derived
+CAREER_AVERAGE_SQL = """
+    UPDATE player_batting_stats p
+    JOIN (
+        SELECT player_id, format, ROUND(SUM(runs) / NULLIF(SUM(is_out), 0), 2) AS average
+        FROM player_batting_stats
+        WHERE player_id IN (SELECT player_id FROM player_batting_stats WHERE match_id IN :ids)
+        GROUP BY player_id, format
+    ) c ON c.player_id = p.player_id AND c.format <=> p.format
+    SET p.batting_average = c.average
+"""
+
+# match_headers (12Commentaries.py, archive_backfill.py) carries toss and result keys for archived matches
+COMMENTARY_TOSS_SQL = """
+    INSERT IGNORE INTO live_matches (match_id, toss_winner, toss_decision, match_winner)
+    SELECT h.match_id,
+        tw.team_name,
+        CASE WHEN LOWER(h.toss_decision) LIKE 'bat%' THEN 'bat'
+            WHEN LOWER(h.toss_decision) IN ('bowl', 'bowling', 'field', 'fielding') THEN 'bowl' END,
+        w.team_name
+    FROM match_headers h
+    LEFT JOIN teams tw ON tw.team_key = h.toss_winner_key
+    LEFT JOIN teams w ON w.team_key = h.winning_team_key
+    LEFT JOIN live_matches lm ON lm.match_id = h.match_id
+    WHERE lm.match_id IS NULL AND h.winning_team_key IS NOT NULL
+"""
+
+NEW_COMPLETED_MATCHES_SQL = """
+    SELECT DISTINCT mi.match_id
+    FROM live_match_info mi
+    LEFT JOIN live_scorecard_metadata sm ON sm.match_id = mi.match_id
+    LEFT JOIN matches d ON d.match_id = mi.match_id
+    WHERE d.match_id IS NULL
+        AND (sm.is_match_complete = 1 OR mi.state = 'Complete')
+"""
+
+
+def ensure_derived_tables(engine):
+    """Create any missing derived tables."""
+    with engine.begin() as conn:
+        for ddl in DERIVED_TABLE_DDL.values():
+            conn.execute(text(ddl))
+
+
+def derive_completed_matches(engine, include_commentary: bool = True) -> List[int]:
+    """
+    Append newly completed matches to the derived analytics tables.
+
+    Args:
+        engine: SQLAlchemy engine for the cricbuzz database
+        include_commentary: also derive toss/result rows from match_headers (archived commentary)
+
+    Returns:
+        The match ids that were derived in this run.
+    """
+    ensure_derived_tables(engine)
+
+    with engine.begin() as conn:
+        try:
+            new_ids = [row[0] for row in conn.execute(text(NEW_COMPLETED_MATCHES_SQL))]
+        except Exception as e:
+            logger.warning(f"⚠ Live tables not ready for derivation: {e}")
+            new_ids = []
+
+        if new_ids:
+            context = MATCH_CONTEXT
+            for table_name, sql in DERIVATIONS:
+                statement = text(sql.format(context=context)).bindparams(
+                    bindparam('ids', expanding=True)
+                )
+                result = conn.execute(statement, {'ids': new_ids})
+                logger.info(f"✓ Derived {result.rowcount} rows into '{table_name}'")
+
+            result = conn.execute(
+                text(CAREER_AVERAGE_SQL).bindparams(bindparam('ids', expanding=True)),
+                {'ids': new_ids}
+            )
+            logger.info(f"✓ Updated career batting averages on {result.rowcount} innings")
+
+        if include_commentary:
+            try:
+                result = conn.execute(text(COMMENTARY_TOSS_SQL))
+                logger.info(f"✓ Derived {result.rowcount} toss results from match_headers")
+            except Exception as e:
+                logger.warning(f"⚠ Could not derive toss results from match_headers: {e}")
+
+    logger.info(f"Derived tables updated for {len(new_ids)} newly completed matches")
+    return new_ids
@@ -0,0 +1,255 @@
+"""
+Write-once handling of the static per-match tables of the live feed.
+
+A live match's venue, teams, umpires and series don't change while it is
+live, yet every poll used to re-extract and rewrite live_venues, live_teams,
+live_officials and live_series (the latter with a fresh fetched_at on every
+row). These tables are now keyed per match and role, and each row carries
+row_hash, a hash of the API fields it is extracted from:
+
+- dimension_hash() hashes a row's source fields before it is extracted;
+- DimensionCache remembers the persisted hash (and row) of every key, in
+  process across polls and loaded from the tables themselves on first use,
+  so unchanged rows are neither extracted nor written;
+- write_dimension_rows() upserts new or changed rows by key.
+"""
+import hashlib
+import json
+import logging
+import threading
+from functools import lru_cache
+from typing import Dict, Iterable, List
+
+import pandas as pd
+
+from field_mapping import Field, FieldMapping
+
+logger = logging.getLogger(__name__)
+
+# Key of each dimension table; one row per match and role
+DIMENSION_KEYS = {
+    'live_venues': ['match_id'],
+    'live_teams': ['match_id', 'team_role'],
+    'live_officials': ['match_id', 'role'],
+    'live_series': ['match_id'],
+}
+
+DIMENSION_DDL = {
+    'live_venues': """
+        CREATE TABLE IF NOT EXISTS {table} (
+            match_id BIGINT NOT NULL,
+            venue_id BIGINT,
+            ground VARCHAR(255),
+            city VARCHAR(255),
+            timezone VARCHAR(16),
+            latitude VARCHAR(32),
+            longitude VARCHAR(32),
+            row_hash CHAR(32),
+            PRIMARY KEY (match_id)
+        )
+    """,
+    'live_teams': """
+        CREATE TABLE IF NOT EXISTS {table} (
+            match_id BIGINT NOT NULL,
+            team_role VARCHAR(10) NOT NULL,
+            team_id BIGINT,
+            team_name VARCHAR(255),
+            team_sname VARCHAR(32),
+            row_hash CHAR(32),
+            PRIMARY KEY (match_id, team_role)
+        )
+    """,
+    'live_officials': """
+        CREATE TABLE IF NOT EXISTS {table} (
+            match_id BIGINT NOT NULL,
+            role VARCHAR(16) NOT NULL,
+            official_id BIGINT,
+            name VARCHAR(255),
+            country VARCHAR(100),
+            row_hash CHAR(32),
+            PRIMARY KEY (match_id, role)
+        )
+    """,
+    'live_series': """
+        CREATE TABLE IF NOT EXISTS {table} (
+            series_id BIGINT,
+            series_name VARCHAR(255),
+            match_type VARCHAR(50),
+            series_type VARCHAR(50),
+            match_id BIGINT NOT NULL,
+            series_start_dt VARCHAR(32),
+            series_end_dt VARCHAR(32),
+            fetched_at DATETIME,
+            row_hash CHAR(32),
+            PRIMARY KEY (match_id),
+            INDEX idx_series (series_id)
+        )
+    """,
+}
+
+
+@lru_cache(maxsize=None)
+def _source_keys(mapping: FieldMapping) -> tuple:
+    """Top-level source keys a mapping reads."""
+    return tuple(sorted({
+        path[0]
+        for field in mapping.fields.values() if isinstance(field, Field)
+        for path in field.paths
+    }))
+
+
+def dimension_hash(mapping: FieldMapping, source: dict, *args) -> str:
+    """Hash of the fields `mapping` would extract from `source` (plus its Arg values)."""
+    values = [source.get(key) for key in _source_keys(mapping)]
+    payload = json.dumps([args, values], default=str, separators=(',', ':'))
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+
+def _records(df: pd.DataFrame) -> List[dict]:
+    """Rows as dicts of plain Python values (None for missing), ready for executemany."""
+    values = df.astype(object).where(df.notna(), None)
+    for column in df.select_dtypes('datetime').columns:
+        values[column] = pd.Series(
+            [None if pd.isna(v) else v.to_pydatetime() for v in df[column]], index=df.index, dtype=object
+        )
+    return values.to_dict('records')
+
+
+def ensure_dimension_tables(conn):
+    """Create the dimension tables, moving tables written by earlier versions onto the keyed layout."""
+    from sqlalchemy import text
+
+    for table_name, ddl in DIMENSION_DDL.items():
+        conn.execute(text(ddl.format(table=table_name)))
+        if conn.execute(text(f"SHOW KEYS FROM {table_name} WHERE Key_name = 'PRIMARY'")).first():
+            continue
+
+        # Unkeyed table created by to_sql: copy the latest row of each key into a keyed one
+        shadow, retired = f"{table_name}__new", f"{table_name}__old"
+        conn.execute(text(f"DROP TABLE IF EXISTS {shadow}, {retired}"))
+        conn.execute(text(ddl.format(table=shadow)))
+        legacy = {row[0] for row in conn.execute(text(f"SHOW COLUMNS FROM {table_name}"))}
+        columns = ", ".join(
+            row[0] for row in conn.execute(text(f"SHOW COLUMNS FROM {shadow}")) if row[0] in legacy
+        )
+        not_null = " AND ".join(f"{c} IS NOT NULL" for c in DIMENSION_KEYS[table_name])
+        # REPLACE keeps the last row it sees per key, so feed the rows oldest first
+        order = " ORDER BY fetched_at" if 'fetched_at' in legacy else ""
+        conn.execute(text(
+            f"REPLACE INTO {shadow} ({columns}) SELECT {columns} FROM {table_name} WHERE {not_null}{order}"
+        ))
+        conn.execute(text(f"RENAME TABLE {table_name} TO {retired}, {shadow} TO {table_name}"))
+        conn.execute(text(f"DROP TABLE {retired}"))
+        logger.info(f"✓ Moved '{table_name}' onto keys ({', '.join(DIMENSION_KEYS[table_name])})")
+
+
+def write_dimension_rows(conn, table_name: str, df: pd.DataFrame) -> int:
+    """Upsert rows into a dimension table by key; returns the rows sent."""
+    from sqlalchemy import text
+
+    if df.empty:
+        return 0
+    columns = list(df.columns)
+    updates = ", ".join(f"{c} = VALUES({c})" for c in columns if c not in DIMENSION_KEYS[table_name])
+    conn.execute(
+        text(
+            f"INSERT INTO {table_name} ({', '.join(columns)}) "
+            f"VALUES ({', '.join(':' + c for c in columns)}) "
+            f"ON DUPLICATE KEY UPDATE {updates}"
+        ),
+        _records(df)
+    )
+    return len(df)
+
+
+class DimensionCache:
+    """
+    Persisted dimension rows by table and key, shared by the parse and write stages.
+
+    The parse stage asks changed() before extracting a row; the write stage
+    calls store() once the rows are upserted, so a failed write leaves the
+    rows to be extracted again on the next poll.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.rows: Dict[str, Dict[tuple, dict]] = {table_name: {} for table_name in DIMENSION_KEYS}
+        self.loaded_ids = set()
+        self.tables_ready = False
+
+    def _key(self, table_name: str, record: dict) -> tuple:
+        return tuple(record[column] for column in DIMENSION_KEYS[table_name])
+
+    def load(self, engine, match_ids: Iterable[int]):
+        """Read the persisted rows of matches this process hasn't seen yet."""
+        from sqlalchemy import bindparam, text
+
+        match_ids = sorted({int(m) for m in match_ids} - self.loaded_ids)
+        with engine.begin() as conn:
+            if not self.tables_ready:
+                ensure_dimension_tables(conn)
+                self.tables_ready = True
+            if not match_ids:
+                return
+            for table_name in DIMENSION_KEYS:
+                statement = text(f"SELECT * FROM {table_name} WHERE match_id IN :ids").bindparams(
+                    bindparam('ids', expanding=True)
+                )
+                self._remember(table_name, pd.read_sql(statement, conn, params={'ids': match_ids}))
+        self.loaded_ids.update(match_ids)
+
+    def _remember(self, table_name: str, df: pd.DataFrame):
+        rows = self.rows[table_name]
+        with self._lock:
+            for record in _records(df):
+                rows[self._key(table_name, record)] = record
+
+    def changed(self, table_name: str, key: tuple, row_hash: str) -> bool:
+        """True if the row under `key` isn't persisted with this hash."""
+        record = self.rows[table_name].get(key)
+        return record is None or record.get('row_hash') != row_hash
+
+    def store(self, conn, table_name: str, df: pd.DataFrame) -> int:
+        """Upsert new or changed rows and remember them."""
+        written = write_dimension_rows(conn, table_name, df)
+        self._remember(table_name, df)
+        return written
+
+    def frames(self, match_ids: Iterable[int]) -> Dict[str, pd.DataFrame]:
+        """The persisted rows of some matches, for writers that need whole matches (e.g. snapshots)."""
+        match_ids = {int(m) for m in match_ids}
+        with self._lock:
+            return {
+                table_name: pd.DataFrame([r for key, r in rows.items() if key[0] in match_ids])
+                for table_name, rows in self.rows.items()
+            }
+
+    def retain(self, live_ids: Iterable[int]):
+        """Forget matches that dropped out of the live feed."""
+        live_ids = {int(m) for m in live_ids}
+        with self._lock:
+            for rows in self.rows.values():
+                for key in [k for k in rows if k[0] not in live_ids]:
+                    del rows[key]
+            self.loaded_ids &= live_ids
+
+
+def prune_dimension_rows(engine, live_ids: Iterable[int]) -> List[str]:
+    """Delete the dimension rows of matches no longer live; returns the tables that changed."""
+    from sqlalchemy import bindparam, text
+
+    live_ids = sorted({int(m) for m in live_ids})
+    if not live_ids:
+        return []
+    changed = []
+    with engine.begin() as conn:
+        for table_name in DIMENSION_KEYS:
+            result = conn.execute(
+                text(f"DELETE FROM {table_name} WHERE match_id NOT IN :ids")
+                .bindparams(bindparam('ids', expanding=True)),
+                {'ids': live_ids}
+            )
+            if result.rowcount:
+                logger.info(f"✓ Pruned {result.rowcount} rows of finished matches from '{table_name}'")
+                changed.append(table_name)
+    return changed
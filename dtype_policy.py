@@ -0,0 +1,226 @@
+"""
+Narrow pandas dtypes and matching SQL column types for the live tables.
+
+Usage:
+    python dtype_policy.py report [--tables live_commentary live_batting_stats ...]
+
+Left to itself to_sql() stores every integer as BIGINT and every string as
+TEXT, and pd.read_sql() hands them back as int64 and object. DTYPE_POLICY
+lists, per table, the narrowest integer type each column needs and the
+low-cardinality text columns to keep as categories:
+
+- apply_dtype_policy() converts a frame, checking every value fits and
+  widening a column instead of truncating it (or leaving it alone if it
+  isn't numeric after all);
+- sql_dtypes() gives the SQL types that match a converted frame, for
+  to_sql(dtype=...): TINYINT/SMALLINT/INT/BIGINT and VARCHAR for categories;
+- write_frame() does both around to_sql(), and is what the ingesters use.
+
+The dashboard applies the same policy when it reads these tables back.
+Floats are left as float64: overs are stored as x.y, which float32 turns
+into 4.300000190734863.
+"""
+import argparse
+import logging
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+INT8, INT16, INT32, INT64 = 'Int8', 'Int16', 'Int32', 'Int64'
+CATEGORY = 'category'
+
+# Widening order when a column's values don't fit its policy type
+INT_DTYPES = [INT8, INT16, INT32, INT64]
+CATEGORY_CHARS = 255
+
+_INNINGS_POLICY = {
+    f"{team}_inngs{n}_{field}": dtype
+    for team in ('team1', 'team2')
+    for n in (1, 2)
+    for field, dtype in (('runs', INT16), ('wickets', INT8))
+}
+
+DTYPE_POLICY: Dict[str, Dict[str, str]] = {
+    'live_match_info': {
+        'match_id': INT32, 'series_id': INT32, 'series_name': CATEGORY, 'match_desc': CATEGORY,
+        'match_format': CATEGORY, 'start_date': INT64, 'state': CATEGORY, 'curr_bat_team_id': INT32,
+        **_INNINGS_POLICY,
+    },
+    'live_venues': {
+        'match_id': INT32, 'venue_id': INT32, 'city': CATEGORY, 'timezone': CATEGORY,
+    },
+    'live_teams': {
+        'match_id': INT32, 'team_role': CATEGORY, 'team_id': INT32, 'team_name': CATEGORY,
+        'team_sname': CATEGORY,
+    },
+    'live_officials': {
+        'match_id': INT32, 'role': CATEGORY, 'official_id': INT32, 'country': CATEGORY,
+    },
+    'live_series': {
+        'series_id': INT32, 'series_name': CATEGORY, 'match_type': CATEGORY, 'series_type': CATEGORY,
+        'match_id': INT32,
+    },
+    'live_batting_stats': {
+        'match_id': INT32, 'innings_id': INT8, 'team_name': CATEGORY, 'team_key': INT32,
+        'batsman_id': INT32, 'batsman_key': INT32, 'batting_position': INT8, 'runs': INT16,
+        'balls_faced': INT16, 'fours': INT8, 'sixes': INT8,
+    },
+    'live_bowling_stats': {
+        'match_id': INT32, 'innings_id': INT8, 'team_name': CATEGORY, 'team_key': INT32,
+        'bowler_id': INT32, 'bowler_key': INT32, 'maidens': INT8, 'runs_conceded': INT16,
+        'wickets': INT8, 'no_balls': INT8, 'wides': INT8,
+    },
+    'live_partnerships': {
+        'match_id': INT32, 'innings_id': INT8, 'team_name': CATEGORY, 'team_key': INT32,
+        'partnership_number': INT8,
+        **{
+            f"bat{n}_{field}": dtype
+            for n in (1, 2)
+            for field, dtype in (('id', INT32), ('key', INT32), ('runs', INT16), ('balls', INT16),
+                                 ('fours', INT8), ('sixes', INT8), ('position', INT8))
+        },
+        'total_runs': INT16, 'total_balls': INT16,
+    },
+    'live_scorecard_metadata': {
+        'match_id': INT32, 'match_status': CATEGORY,
+    },
+    'live_commentary': {
+        'match_id': INT32, 'innings': INT8, 'ball_number': INT16, 'timestamp': INT64,
+        'event_type': CATEGORY, 'bat_team_score': INT16, 'toss_winner': CATEGORY,
+        'runs_scored': INT16, 'batter_runs': INT16, 'extras': INT16,
+        'bowler_key': INT32, 'batter_key': INT32, 'template_id': INT32,
+    },
+}
+# Scorecard facts tables (entity_keys.py) share their view's policy
+DTYPE_POLICY['live_batting_facts'] = DTYPE_POLICY['live_batting_stats']
+DTYPE_POLICY['live_bowling_facts'] = DTYPE_POLICY['live_bowling_stats']
+DTYPE_POLICY['live_partnership_facts'] = DTYPE_POLICY['live_partnerships']
+
+
+def _fits(values: np.ndarray, dtype: str) -> bool:
+    info = np.iinfo(dtype.lower())
+    return values.min() >= info.min and values.max() <= info.max
+
+
+def _narrow_int(column: pd.Series, dtype: str, label: str) -> pd.Series:
+    numbers = pd.to_numeric(column, errors='coerce')
+    present = numbers.notna()
+    # Not numeric, or not whole numbers: leave the column as it is
+    if present.sum() != column.notna().sum():
+        return column
+    values = numbers[present].to_numpy(dtype=np.float64)
+    if not np.array_equal(values, np.floor(values)):
+        return column
+    if not len(values):
+        return numbers.astype(dtype)
+    for candidate in INT_DTYPES[INT_DTYPES.index(dtype):]:
+        if _fits(values, candidate):
+            if candidate != dtype:
+                logger.warning(f"⚠ {label} doesn't fit {dtype}; kept as {candidate}")
+            return numbers.astype(candidate)
+    return column
+
+
+def apply_dtype_policy(table_name: str, df: Optional[pd.DataFrame],
+                       savings: Optional[Dict[str, List[int]]] = None) -> Optional[pd.DataFrame]:
+    """
+    A copy of df with the table's DTYPE_POLICY applied (columns not in the policy are kept).
+
+    When savings is given, savings[table_name] accumulates [bytes before, bytes after].
+    """
+    policy = DTYPE_POLICY.get(table_name)
+    if df is None or not policy:
+        return df
+    out = df.copy(deep=False)
+    for column, dtype in policy.items():
+        if column not in out.columns or str(out[column].dtype) == dtype:
+            continue
+        if dtype == CATEGORY:
+            if pd.api.types.is_string_dtype(out[column].dtype) or out[column].dtype == object:
+                out[column] = out[column].astype(CATEGORY)
+        else:
+            out[column] = _narrow_int(out[column], dtype, f"{table_name}.{column}")
+    if savings is not None:
+        totals = savings.setdefault(table_name, [0, 0])
+        totals[0] += int(df.memory_usage(deep=True).sum())
+        totals[1] += int(out.memory_usage(deep=True).sum())
+    return out
+
+
+def sql_dtypes(df: pd.DataFrame) -> dict:
+    """to_sql() column types for the narrowed integer and category columns of df."""
+    from sqlalchemy import BigInteger, Integer, SmallInteger, String, Text
+    from sqlalchemy.dialects import mysql
+
+    types = {
+        INT8: SmallInteger().with_variant(mysql.TINYINT(), 'mysql'),
+        INT16: SmallInteger(),
+        INT32: Integer(),
+        INT64: BigInteger(),
+        CATEGORY: String(CATEGORY_CHARS),
+    }
+    out = {column: types[str(dtype)] for column, dtype in df.dtypes.items() if str(dtype) in types}
+    for column, sql_type in out.items():
+        # A category with an unexpectedly long value stays TEXT rather than failing the insert
+        if sql_type is types[CATEGORY] and df[column].cat.categories.astype(str).str.len().max() > CATEGORY_CHARS:
+            out[column] = Text()
+    return out
+
+
+def write_frame(con, table_name: str, df: pd.DataFrame, if_exists: str = 'append',
+                dtype: Optional[dict] = None, savings: Optional[Dict[str, List[int]]] = None) -> int:
+    """to_sql() with the table's dtype policy and matching SQL column types; returns rows written."""
+    df = apply_dtype_policy(table_name, df, savings)
+    df.to_sql(
+        table_name, con=con, if_exists=if_exists, index=False, chunksize=1000,
+        dtype={**sql_dtypes(df), **(dtype or {})}
+    )
+    return len(df)
+
+
+def log_savings(savings: Dict[str, List[int]]):
+    """Log the memory the dtype policy saved, per table."""
+    for table_name, (before, after) in sorted(savings.items()):
+        if before:
+            logger.info(
+                f"✓ {table_name}: {before / 1024:,.0f} KB -> {after / 1024:,.0f} KB "
+                f"with narrow dtypes ({1 - after / before:.0%} smaller)"
+            )
+
+
+def report(engine, tables: Optional[Iterable[str]] = None) -> pd.DataFrame:
+    """Read each table and return its in-memory size as read and with the policy applied."""
+    rows = []
+    for table_name in tables or [t for t in DTYPE_POLICY if not t.endswith('_facts')]:
+        try:
+            df = pd.read_sql(f"SELECT * FROM {table_name}", engine)
+        except Exception as e:
+            logger.warning(f"⚠ Could not read '{table_name}': {e}")
+            continue
+        before = int(df.memory_usage(deep=True).sum())
+        after = int(apply_dtype_policy(table_name, df).memory_usage(deep=True).sum())
+        rows.append({
+            'table': table_name, 'rows': len(df), 'bytes_before': before, 'bytes_after': after,
+            'saved_pct': round(100 * (1 - after / before), 1) if before else 0.0,
+        })
+    return pd.DataFrame(rows, columns=['table', 'rows', 'bytes_before', 'bytes_after', 'saved_pct'])
+
+
+def main():
+    import importlib
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('command', choices=['report'])
+    parser.add_argument('--tables', nargs='+', choices=list(DTYPE_POLICY))
+    args = parser.parse_args()
+
+    live_match = importlib.import_module('2Live_match')
+    with live_match.get_db_engine() as engine:
+        print(report(engine, args.tables).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
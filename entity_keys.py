@@ -0,0 +1,435 @@
+"""
+Normalized players, teams, series and match header tables with integer keys.
+
+The scorecard tables used to repeat team and player names on every row, and
+match_commentary copied its match's header onto every ball. The names now
+live once in:
+
+- players: player_key, Cricbuzz player_id (when known) and name;
+- teams: team_key, name and Cricbuzz team_id;
+- series: series_id and name;
+- match_headers: one row per match, with team and toss/result keys.
+
+KeyResolver maps names and ids to keys, inserting missing dimension rows,
+and caches them so a long-running ingester only asks the database about
+players and teams it hasn't met yet. Keys it inserts are only cached once the
+transaction that inserted them commits (see TransactionCache).
+
+live_batting_stats, live_bowling_stats and live_partnerships are stored as
+*_facts tables holding keys instead of names, with views under the old names
+that join the names back, so dashboard and analytics SQL keeps working.
+"""
+import logging
+import threading
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import pandas as pd
+
+from dtype_policy import write_frame
+
+logger = logging.getLogger(__name__)
+
+ENTITY_DDL = {
+    'players': """
+        CREATE TABLE IF NOT EXISTS players (
+            player_key INT AUTO_INCREMENT PRIMARY KEY,
+            player_id BIGINT,
+            player_name VARCHAR(255) NOT NULL,
+            UNIQUE KEY uq_player_id (player_id),
+            INDEX idx_player_name (player_name)
+        )
+    """,
+    'teams': """
+        CREATE TABLE IF NOT EXISTS teams (
+            team_key INT AUTO_INCREMENT PRIMARY KEY,
+            team_name VARCHAR(255) NOT NULL,
+            team_id BIGINT,
+            UNIQUE KEY uq_team_name (team_name)
+        )
+    """,
+    'series': """
+        CREATE TABLE IF NOT EXISTS series (
+            series_id BIGINT NOT NULL,
+            series_name VARCHAR(255),
+            PRIMARY KEY (series_id)
+        )
+    """,
+    'match_headers': """
+        CREATE TABLE IF NOT EXISTS match_headers (
+            match_id BIGINT NOT NULL,
+            series_id BIGINT,
+            match_desc VARCHAR(255),
+            format VARCHAR(50),
+            state VARCHAR(50),
+            status VARCHAR(255),
+            team1_key INT,
+            team2_key INT,
+            toss_winner_key INT,
+            toss_decision VARCHAR(50),
+            winning_team_key INT,
+            PRIMARY KEY (match_id)
+        )
+    """,
+}
+
+# Scorecard tables stored by key: facts table, team name column, and
+# player key column -> (player id column, player name column)
+FACT_TABLES = {
+    'live_batting_stats': {
+        'facts': 'live_batting_facts',
+        'team': 'team_name',
+        'players': {'batsman_key': ('batsman_id', 'batsman_name')},
+    },
+    'live_bowling_stats': {
+        'facts': 'live_bowling_facts',
+        'team': 'team_name',
+        'players': {'bowler_key': ('bowler_id', 'bowler_name')},
+    },
+    'live_partnerships': {
+        'facts': 'live_partnership_facts',
+        'team': 'team_name',
+        'players': {'bat1_key': ('bat1_id', 'bat1_name'), 'bat2_key': ('bat2_id', 'bat2_name')},
+    },
+}
+
+
+def _present(value) -> bool:
+    return value is not None and not pd.isna(value) and value != ''
+
+
+def ensure_entity_tables(conn):
+    from sqlalchemy import text
+
+    for ddl in ENTITY_DDL.values():
+        conn.execute(text(ddl))
+
+
+def fact_view_sql(table_name: str) -> str:
+    """The view that presents a facts table under its old name, with names joined back."""
+    spec = FACT_TABLES[table_name]
+    names = [f"t.team_name AS {spec['team']}"]
+    joins = ["LEFT JOIN teams t ON t.team_key = f.team_key"]
+    for i, (key_column, (_, name_column)) in enumerate(spec['players'].items()):
+        names.append(f"p{i}.player_name AS {name_column}")
+        joins.append(f"LEFT JOIN players p{i} ON p{i}.player_key = f.{key_column}")
+    return (
+        f"CREATE OR REPLACE VIEW {table_name} AS "
+        f"SELECT f.*, {', '.join(names)} FROM {spec['facts']} f {' '.join(joins)}"
+    )
+
+
+class TransactionCache:
+    """
+    Cache entries learnt inside a transaction, held per connection until it ends.
+
+    Rows inserted by a transaction that rolls back are gone, so their keys
+    must not outlive it: add() stages entries on the connection, and they
+    are handed to promote(name, entries) when its transaction commits, or
+    dropped when it rolls back.
+    """
+
+    def __init__(self, promote: Callable[[str, dict], None]):
+        self._lock = threading.Lock()
+        self._promote = promote
+        self._staged: Dict[int, Dict[str, dict]] = {}
+
+    def get(self, conn, name: str) -> dict:
+        """Entries staged under name by conn's open transaction."""
+        with self._lock:
+            return dict(self._staged.get(id(conn), {}).get(name, {}))
+
+    def add(self, conn, name: str, entries: dict):
+        from sqlalchemy import event
+
+        if not entries:
+            return
+        conn_id = id(conn)
+        with self._lock:
+            staged = self._staged.get(conn_id)
+            if staged is None:
+                staged = self._staged[conn_id] = {}
+                event.listen(conn, 'commit', lambda _: self._settle(conn_id, staged, True), once=True)
+                event.listen(conn, 'rollback', lambda _: self._settle(conn_id, staged, False), once=True)
+            staged.setdefault(name, {}).update(entries)
+
+    def _settle(self, conn_id: int, staged: Dict[str, dict], committed: bool):
+        with self._lock:
+            # The other listener of a finished transaction may still fire later
+            if self._staged.get(conn_id) is not staged:
+                return
+            del self._staged[conn_id]
+        if committed:
+            for name, entries in staged.items():
+                self._promote(name, entries)
+
+
+class KeyResolver:
+    """
+    Name/id -> integer key lookups for teams and players, cached for the life of the ingester.
+
+    Safe to share between threads; misses are resolved in one batch per call.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.team_keys: Dict[str, int] = {}
+        # ('id', player_id) or ('name', player_name) -> player_key
+        self.player_keys: Dict[tuple, int] = {}
+        self.series_ids = set()
+        self.tables_ready = False
+        self.views_ready = set()
+        self.pending = TransactionCache(self._promote)
+
+    def _promote(self, name: str, entries: dict):
+        with self._lock:
+            if name == 'series':
+                self.series_ids.update(entries)
+            else:
+                {'teams': self.team_keys, 'players': self.player_keys}[name].update(entries)
+
+    def _known(self, conn, name: str, cache: dict, wanted: Iterable) -> dict:
+        """The keys of wanted already known: cached, or inserted by conn's open transaction."""
+        staged = self.pending.get(conn, name)
+        with self._lock:
+            known = {k: cache[k] for k in wanted if k in cache}
+        known.update((k, staged[k]) for k in wanted if k in staged and k not in known)
+        return known
+
+    def ensure_tables(self, conn):
+        if not self.tables_ready:
+            ensure_entity_tables(conn)
+            self.tables_ready = True
+
+    def teams(self, conn, teams: Iterable[Tuple[str, Optional[int]]]) -> Dict[str, int]:
+        """(team name, Cricbuzz team id or None) pairs -> {name: team_key}."""
+        from sqlalchemy import bindparam, text
+
+        wanted = {}
+        for name, team_id in teams:
+            if _present(name):
+                wanted[name] = wanted.get(name) if not _present(team_id) else int(team_id)
+        known = self._known(conn, 'teams', self.team_keys, wanted)
+        missing = [name for name in wanted if name not in known]
+        if missing:
+            self.ensure_tables(conn)
+            conn.execute(
+                text(
+                    "INSERT INTO teams (team_name, team_id) VALUES (:name, :team_id) "
+                    "ON DUPLICATE KEY UPDATE team_id = COALESCE(VALUES(team_id), team_id)"
+                ),
+                [{'name': name, 'team_id': wanted[name]} for name in missing]
+            )
+            rows = conn.execute(
+                text("SELECT team_name, team_key FROM teams WHERE team_name IN :names")
+                .bindparams(bindparam('names', expanding=True)),
+                {'names': missing}
+            )
+            found = {name: key for name, key in rows}
+            self.pending.add(conn, 'teams', found)
+            known.update(found)
+        return {name: known[name] for name in wanted}
+
+    def players(self, conn, players: Iterable[Tuple[Optional[int], Optional[str]]]) -> Dict[tuple, int]:
+        """
+        (player id, name) pairs -> {('id', player_id) or ('name', name): player_key}.
+
+        Players are keyed by Cricbuzz id when there is one; players only known
+        by name (e.g. first seen in commentary) resolve to a row with that
+        name, preferring one that has an id.
+        """
+        from sqlalchemy import bindparam, text
+
+        by_id, by_name = {}, set()
+        for player_id, name in players:
+            if _present(player_id):
+                by_id[int(player_id)] = name if _present(name) else by_id.get(int(player_id))
+            elif _present(name):
+                by_name.add(name)
+
+        wanted = [('id', p) for p in by_id] + [('name', n) for n in by_name]
+        known = self._known(conn, 'players', self.player_keys, wanted)
+        missing_ids = [p for p in by_id if ('id', p) not in known]
+        missing_names = [n for n in by_name if ('name', n) not in known]
+
+        if missing_ids:
+            self.ensure_tables(conn)
+            conn.execute(
+                text(
+                    "INSERT INTO players (player_id, player_name) VALUES (:player_id, :name) "
+                    "ON DUPLICATE KEY UPDATE player_name = COALESCE(NULLIF(VALUES(player_name), ''), player_name)"
+                ),
+                [{'player_id': p, 'name': by_id[p] or ''} for p in missing_ids]
+            )
+            rows = conn.execute(
+                text("SELECT player_id, player_key FROM players WHERE player_id IN :ids")
+                .bindparams(bindparam('ids', expanding=True)),
+                {'ids': missing_ids}
+            )
+            found = {('id', p): key for p, key in rows}
+            self.pending.add(conn, 'players', found)
+            known.update(found)
+
+        if missing_names:
+            self.ensure_tables(conn)
+            select = text(
+                "SELECT player_name, player_key FROM players WHERE player_name IN :names "
+                "ORDER BY player_id IS NOT NULL, player_key"
+            ).bindparams(bindparam('names', expanding=True))
+            found = dict(conn.execute(select, {'names': missing_names}).fetchall())
+            unknown = [n for n in missing_names if n not in found]
+            if unknown:
+                conn.execute(text("INSERT INTO players (player_name) VALUES (:name)"),
+                             [{'name': n} for n in unknown])
+                found.update(dict(conn.execute(select, {'names': unknown}).fetchall()))
+            found = {('name', n): key for n, key in found.items()}
+            self.pending.add(conn, 'players', found)
+            known.update(found)
+
+        return {k: known[k] for k in wanted}
+
+    def series(self, conn, series: Iterable[Tuple[int, Optional[str]]]):
+        """Record (series_id, name) pairs not seen yet."""
+        from sqlalchemy import text
+
+        staged = self.pending.get(conn, 'series')
+        with self._lock:
+            new = {int(s): name for s, name in series
+                   if _present(s) and int(s) not in self.series_ids and int(s) not in staged}
+        if not new:
+            return
+        self.ensure_tables(conn)
+        conn.execute(
+            text(
+                "INSERT INTO series (series_id, series_name) VALUES (:series_id, :name) "
+                "ON DUPLICATE KEY UPDATE series_name = COALESCE(VALUES(series_name), series_name)"
+            ),
+            [{'series_id': s, 'name': name} for s, name in new.items()]
+        )
+        self.pending.add(conn, 'series', new)
+
+    def to_facts(self, conn, table_name: str, df: pd.DataFrame) -> pd.DataFrame:
+        """Replace a scorecard frame's team and player names with their keys."""
+        spec = FACT_TABLES[table_name]
+        team_keys = self.teams(conn, ((name, None) for name in df[spec['team']].dropna().unique()))
+
+        pairs = []
+        for id_column, name_column in spec['players'].values():
+            pairs.extend(zip(df[id_column], df[name_column]))
+        player_keys = self.players(conn, pairs)
+
+        def player_key(player_id, name):
+            if _present(player_id):
+                return player_keys[('id', int(player_id))]
+            return player_keys.get(('name', name)) if _present(name) else None
+
+        facts = {}
+        key_of = {name: key for key, (_, name) in spec['players'].items()}
+        for column in df.columns:
+            if column == spec['team']:
+                facts['team_key'] = df[column].map(team_keys).astype('Int64')
+            elif column in key_of:
+                id_column = spec['players'][key_of[column]][0]
+                facts[key_of[column]] = pd.array(
+                    [player_key(p, n) for p, n in zip(df[id_column], df[column])], dtype='Int64'
+                )
+            else:
+                facts[column] = df[column]
+        return pd.DataFrame(facts, index=df.index)
+
+
+def _is_base_table(conn, table_name: str) -> bool:
+    from sqlalchemy import text
+
+    row = conn.execute(
+        text(
+            "SELECT TABLE_TYPE FROM information_schema.TABLES "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :name"
+        ),
+        {'name': table_name}
+    ).first()
+    return row is not None and row[0] == 'BASE TABLE'
+
+
+def write_fact_rows(conn, table_name: str, df: pd.DataFrame, keys: KeyResolver,
+                    if_exists: str = 'append', savings: Optional[Dict[str, List[int]]] = None,
+                    replace_matches: bool = False) -> int:
+    """
+    Store a live_batting_stats / live_bowling_stats / live_partnerships frame as keyed facts.
+
+    A table of that name written by an earlier version is moved into the
+    facts table first and replaced by the view. With replace_matches, rows
+    already stored for the frame's match ids are deleted before appending.
+    """
+    from sqlalchemy import bindparam, text
+
+    facts_table = FACT_TABLES[table_name]['facts']
+    if table_name not in keys.views_ready and _is_base_table(conn, table_name):
+        moved = 0
+        for chunk in pd.read_sql(text(f"SELECT * FROM {table_name}"), conn, chunksize=50000):
+            write_frame(conn, facts_table, keys.to_facts(conn, table_name, chunk))
+            moved += len(chunk)
+        conn.execute(text(f"DROP TABLE {table_name}"))
+        logger.info(f"✓ Moved {moved} rows of '{table_name}' into '{facts_table}'")
+
+    if replace_matches and if_exists == 'append' and _is_base_table(conn, facts_table):
+        conn.execute(
+            text(f"DELETE FROM {facts_table} WHERE match_id IN :ids")
+            .bindparams(bindparam('ids', expanding=True)),
+            {'ids': [int(m) for m in df['match_id'].dropna().unique()]}
+        )
+
+    write_frame(conn, facts_table, keys.to_facts(conn, table_name, df), if_exists, savings=savings)
+    # A replaced facts table may have new columns; the view's f.* is fixed when it is created
+    if if_exists == 'replace' or table_name not in keys.views_ready:
+        conn.execute(text(fact_view_sql(table_name)))
+        keys.views_ready.add(table_name)
+    return len(df)
+
+
+def _header_rows(keys: KeyResolver, conn, headers: List[dict]) -> List[dict]:
+    """match_headers rows from MATCH_FIELDS dicts, with team names resolved to keys."""
+    team_keys = keys.teams(conn, [
+        (h[f'{side}_name'], h[f'{side}_id']) for h in headers for side in ('team1', 'team2', 'toss_winner')
+    ])
+    keys.series(conn, [(h['series_id'], h['series_name']) for h in headers])
+
+    rows = []
+    for h in headers:
+        ids = {h['team1_id']: h['team1_name'], h['team2_id']: h['team2_name']}
+        winner = ids.get(h['winning_team_id']) if _present(h['winning_team_id']) else None
+        rows.append({
+            'match_id': h['match_id'],
+            'series_id': h['series_id'],
+            'match_desc': h['match_desc'],
+            'format': h['format'],
+            'state': h['state'],
+            'status': h['status'],
+            'team1_key': team_keys.get(h['team1_name']),
+            'team2_key': team_keys.get(h['team2_name']),
+            'toss_winner_key': team_keys.get(h['toss_winner_name']),
+            'toss_decision': h['toss_decision'],
+            'winning_team_key': team_keys.get(winner),
+        })
+    return rows
+
+
+def store_match_headers(conn, headers: List[dict], keys: Optional[KeyResolver] = None) -> int:
+    """Upsert match_headers rows (and their teams and series) from MATCH_FIELDS dicts."""
+    from sqlalchemy import text
+
+    if not headers:
+        return 0
+    keys = keys or KeyResolver()
+    keys.ensure_tables(conn)
+    rows = _header_rows(keys, conn, headers)
+    columns = list(rows[0])
+    updates = ", ".join(f"{c} = VALUES({c})" for c in columns if c != 'match_id')
+    conn.execute(
+        text(
+            f"INSERT INTO match_headers ({', '.join(columns)}) "
+            f"VALUES ({', '.join(':' + c for c in columns)}) "
+            f"ON DUPLICATE KEY UPDATE {updates}"
+        ),
+        rows
+    )
+    return len(rows)
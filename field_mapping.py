@@ -0,0 +1,154 @@
+"""
+Declarative field mapping for the Cricbuzz API parsers.
+
+The API returns the same payloads with camelCase or lowercase keys depending
+on the endpoint version ('matchId'/'matchid', 'batId'/'id', ...). Instead of
+hand-written `a.get(x) or a.get(y)` chains in every script, each output table
+declares its fields once:
+
+    BATTING = FieldMapping({
+        'match_id': Arg(),
+        'batsman_id': Field('id', 'batId', coerce=safe_int),
+        'strike_rate': Field('strkrate', 'strikeRate', coerce=safe_float),
+    })
+    row = BATTING.extract(bat_card, match_id)
+
+FieldMapping compiles the spec once into a single Python function (plain
+dict lookups, no loops over the spec per record) that returns the row as a
+tuple, ready for ColumnarBuilder.append(*row) or cursor.executemany(). The
+defaults and coercions it needs are closure variables, and `src.get` is looked
+up once per record.
+"""
+import re
+from typing import Callable, Dict, Optional
+
+NUMBER = re.compile(r"[-+]?\d*\.?\d+")
+
+
+def safe_float(val):
+    """Convert value to float safely, return None if invalid."""
+    if val is None or val == '':
+        return None
+    try:
+        if isinstance(val, (int, float)):
+            return float(val)
+        if isinstance(val, str):
+            match = NUMBER.search(val)
+            if match:
+                return float(match.group())
+        return None
+    except (ValueError, TypeError):
+        return None
+
+
+def safe_int(val):
+    """Convert value to int safely, return None if invalid."""
+    if val is None or val == '':
+        return None
+    try:
+        if isinstance(val, bool):
+            return int(val)
+        return int(float(val))
+    except (ValueError, TypeError):
+        return None
+
+
+# Values that already have the target type skip the coercion call entirely
+_PASSTHROUGH_TYPES = {safe_int: int, safe_float: float}
+
+
+class Field:
+    """
+    One output column read from the source record.
+
+    Args:
+        *paths: source keys to try in order; the first that is not None wins.
+                Nested keys are dotted ('team1.teamid').
+        coerce: conversion applied to the value (e.g. safe_int), after default
+        default: value used when no path is present
+    """
+
+    __slots__ = ('paths', 'coerce', 'default')
+
+    def __init__(self, *paths: str, coerce: Optional[Callable] = None, default=None):
+        if not paths:
+            raise ValueError("Field needs at least one source path")
+        self.paths = [path.split('.') for path in paths]
+        self.coerce = coerce
+        self.default = default
+
+
+class Arg:
+    """An output column passed to extract() by the caller (match_id, innings_id, ...)."""
+
+    __slots__ = ()
+
+
+def _lookup_lines(path, indent: str) -> list:
+    """Source lines that set `v` to the value at a (possibly nested) path, or None."""
+    lines = [f"{indent}v = get({path[0]!r})"]
+    for key in path[1:]:
+        lines.append(f"{indent}v = v.get({key!r}) if isinstance(v, dict) else None")
+    return lines
+
+
+class FieldMapping:
+    """
+    A table's output columns and how to read each one, compiled to one function.
+
+    Columns keep the order of the spec; Arg columns are taken from extract()'s
+    extra positional arguments in that same order.
+    """
+
+    def __init__(self, fields: Dict[str, object], name: str = 'extract'):
+        self.fields = dict(fields)
+        self.columns = list(self.fields)
+        self.args = [column for column, field in self.fields.items() if isinstance(field, Arg)]
+        self.source, self.extract = self._compile(name)
+
+    def _compile(self, name: str):
+        constants = {}
+        params = ['src'] + [f"a{i}" for i in range(len(self.args))]
+        lines = [f"def {name}({', '.join(params)}):", "    get = src.get"]
+        outputs = []
+        arg_index = 0
+
+        for position, (column, field) in enumerate(self.fields.items()):
+            if isinstance(field, Arg):
+                outputs.append(f"a{arg_index}")
+                arg_index += 1
+                continue
+            if not isinstance(field, Field):
+                raise TypeError(f"Column {column!r} must be a Field or Arg, got {type(field).__name__}")
+
+            lines.append(f"    # {column}")
+            if len(field.paths) == 1 and len(field.paths[0]) == 1 and field.default is None and field.coerce is None:
+                lines.append(f"    f{position} = get({field.paths[0][0]!r})")
+                outputs.append(f"f{position}")
+                continue
+            lines.extend(_lookup_lines(field.paths[0], '    '))
+            for path in field.paths[1:]:
+                lines.append("    if v is None:")
+                lines.extend(_lookup_lines(path, '        '))
+            if field.default is not None:
+                constants[f"_d{position}"] = field.default
+                lines.append("    if v is None:")
+                lines.append(f"        v = _d{position}")
+            if field.coerce in _PASSTHROUGH_TYPES:
+                constants[f"_c{position}"] = field.coerce
+                constants[f"_t{position}"] = _PASSTHROUGH_TYPES[field.coerce]
+                lines.append(f"    f{position} = v if v.__class__ is _t{position} else _c{position}(v)")
+            elif field.coerce is not None:
+                constants[f"_c{position}"] = field.coerce
+                lines.append(f"    f{position} = _c{position}(v)")
+            else:
+                lines.append(f"    f{position} = v")
+            outputs.append(f"f{position}")
+
+        lines.append(f"    return ({', '.join(outputs)},)")
+        # Wrapped in a factory so the constants are closure cells, not global lookups
+        lines = [f"def _make({', '.join(constants)}):"] + ['    ' + line for line in lines] + [f"    return {name}"]
+        source = "\n".join(lines) + "\n"
+        namespace = {}
+        exec(compile(source, f"<field_mapping {name}>", 'exec'), namespace)
+        return source, namespace['_make'](**constants)
@@ -0,0 +1,155 @@
+"""
+Shared in-process cache for per-match dashboard data.
+
+st.cache_data pickles and copies every cached DataFrame for every session on
+every hit. The dashboard instead keeps one MatchSnapshotCache per process (via
+st.cache_resource): each match's frames are compacted once, kept under an LRU
+byte budget, and handed to sessions as shallow copy-on-write views (deep
+copies on pandas < 3, where copy-on-write is off by default). Entries are
+keyed on the match version the ingester bumps in `match_versions`.
+"""
+import logging
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Iterable, Optional, Tuple
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Shallow copies are only safe views when pandas copies on write (always from 3.0);
+# older pandas gets deep copies rather than a process-wide option change
+SHALLOW_VIEWS = int(pd.__version__.split('.')[0]) >= 3
+
+MATCH_VERSIONS_DDL = """
+    CREATE TABLE IF NOT EXISTS match_versions (
+        match_id BIGINT NOT NULL,
+        version BIGINT NOT NULL DEFAULT 1,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+        PRIMARY KEY (match_id)
+    )
+"""
+
+# Bookkeeping columns the dashboard never shows
+DROP_COLUMNS = {'fetched_at'}
+
+
+def bump_match_versions(engine, match_ids: Iterable):
+    """Mark matches as changed so dashboard caches reload them (called by ingesters)."""
+    from sqlalchemy import text
+
+    match_ids = [int(m) for m in dict.fromkeys(match_ids)]
+    if not match_ids:
+        return
+    with engine.begin() as conn:
+        conn.execute(text(MATCH_VERSIONS_DDL))
+        conn.execute(
+            text(
+                "INSERT INTO match_versions (match_id, version) VALUES (:match_id, 1) "
+                "ON DUPLICATE KEY UPDATE version = version + 1"
+            ),
+            [{'match_id': m} for m in match_ids]
+        )
+    logger.info(f"✓ Bumped data version for {len(match_ids)} matches")
+
+
+def compact_frame(df: Optional[pd.DataFrame]) -> Optional[pd.DataFrame]:
+    """Drop bookkeeping columns and dictionary-encode repetitive string columns."""
+    if df is None:
+        return None
+    df = df.drop(columns=[c for c in df.columns if c in DROP_COLUMNS])
+    for col in df.columns:
+        if pd.api.types.is_string_dtype(df[col].dtype) and len(df) > 1 and df[col].nunique(dropna=True) <= len(df) // 2:
+            df[col] = df[col].astype('category')
+    return df
+
+
+def session_view(df: Optional[pd.DataFrame]) -> Optional[pd.DataFrame]:
+    """Copy of a cached frame that a session can modify without touching the cache."""
+    return None if df is None else df.copy(deep=not SHALLOW_VIEWS)
+
+
+def frame_nbytes(df: Optional[pd.DataFrame]) -> int:
+    return int(df.memory_usage(deep=True).sum()) if df is not None else 0
+
+
+class ByteBudgetLRU:
+    """Thread-safe LRU mapping that evicts least recently used entries past a byte budget."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Hashable, Tuple[object, int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: Hashable, value, nbytes: int):
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            if nbytes > self.max_bytes:
+                return
+            self._entries[key] = (value, nbytes)
+            self._bytes += nbytes
+            while self._bytes > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._bytes -= evicted
+
+    def pop(self, key: Hashable):
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self._bytes -= entry[1]
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+            }
+
+
+class MatchSnapshotCache:
+    """Per-match frame tuples shared by every dashboard session."""
+
+    def __init__(self, max_bytes: int):
+        self._lru = ByteBudgetLRU(max_bytes)
+
+    def get(self, match_id, version, loader: Callable[[object], tuple]) -> tuple:
+        """
+        Return views of the match's frames, loading them on a miss or version change.
+
+        loader(match_id) must return a tuple of DataFrames (entries may be None);
+        a tuple whose first frame is None is treated as a failed load and not cached.
+        """
+        entry = self._lru.get(match_id)
+        if entry is not None and entry[0] == version:
+            return tuple(session_view(df) for df in entry[1])
+
+        frames = loader(match_id)
+        if frames is None or frames[0] is None:
+            return frames
+        frames = tuple(compact_frame(df) for df in frames)
+        self._lru.put(match_id, (version, frames), sum(frame_nbytes(df) for df in frames))
+        return tuple(session_view(df) for df in frames)
+
+    def invalidate(self, match_id):
+        self._lru.pop(match_id)
+
+    def stats(self) -> Dict[str, int]:
+        return self._lru.stats()
@@ -0,0 +1,181 @@
+"""
+Row layout of the match_commentary archive table (12Commentaries.py, archive_backfill.py).
+
+Each row is one commentary line (LINE_FIELDS) and its match_id, with the
+text (commtxt) stored in the compact columns of commentary_codec.py. The
+match's header fields (MATCH_FIELDS) are read once per match and stored once
+in match_headers, with team and series names in the teams and series tables
+(see entity_keys.py); see field_mapping.py for the mappings.
+"""
+import logging
+
+import pandas as pd
+
+from commentary_classifier import classify_commentary
+from commentary_codec import CODEC_COLUMNS, CommentaryCodec, ensure_codec_columns
+from entity_keys import ensure_entity_tables
+from field_mapping import Arg, Field, FieldMapping
+
+logger = logging.getLogger(__name__)
+
+MATCH_COMMENTARY_DDL = """
+CREATE TABLE IF NOT EXISTS match_commentary (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    match_id INT,
+    innings_id INT,
+    innings_name VARCHAR(100),
+    overnum FLOAT,
+    ballnbr INT,
+    eventtype VARCHAR(100),
+    timestamp BIGINT,
+    batscore INT,
+    bowler_key INT,
+    batter_key INT,
+    template_id INT,
+    text_z BLOB,
+    INDEX idx_match (match_id)
+)
+"""
+
+MATCH_FIELDS = FieldMapping({
+    "match_id": Arg(),
+    "series_id": Field("seriesId", "seriesid", "series.id"),
+    "series_name": Field("seriesName", "seriesname", "series.name"),
+    "match_desc": Field("matchDesc", "matchdesc", "matchDescription"),
+    "format": Field("matchFormat", "matchformat"),
+    "state": Field("state"),
+    "status": Field("status"),
+    "team1_id": Field("team1.id", "team1.teamid"),
+    "team1_name": Field("team1.name", "team1.teamname"),
+    "team2_id": Field("team2.id", "team2.teamid"),
+    "team2_name": Field("team2.name", "team2.teamname"),
+    "toss_winner_id": Field("tossResults.tossWinnerId", "tossResults.winnerId", "tossresults.tosswinnerid"),
+    "toss_winner_name": Field("tossResults.tossWinnerName", "tossResults.winnerName", "tossresults.tosswinnername"),
+    "toss_decision": Field("tossResults.decision", "tossresults.decision"),
+    "winning_team_id": Field("winningTeamId", "winningteamid", "result.winningteamId"),
+}, name="match_fields")
+
+LINE_FIELDS = FieldMapping({
+    "innings_id": Field("inningsId", "inningsid"),
+    "innings_name": Field("inningsName", "inningsname"),
+    "overnum": Field("overNumber", "overnum"),
+    "ballnbr": Field("ballNbr", "ballnbr"),
+    "eventtype": Field("event", "eventtype"),
+    "commtxt": Field("commText", "commtxt"),
+    "timestamp": Field("timestamp"),
+    "batscore": Field("batTeamScore", "batteamscore"),
+}, name="line_fields")
+
+# Where the header and the lines sit in the mcenter and comm responses
+INFO_FIELDS = FieldMapping({"match": Field("matchInfo", "matchheaders", default={})}, name="info_fields")
+COMM_FIELDS = FieldMapping({"lines": Field("commLines", "comwrapper", default=[])}, name="comm_fields")
+
+# match_commentary columns as stored: commtxt becomes the codec columns
+STORED_COLUMNS = ["match_id"] + [
+    column for field in LINE_FIELDS.columns
+    for column in (list(CODEC_COLUMNS) if field == "commtxt" else [field])
+]
+INSERT_COMMENTARY = f"""
+    INSERT INTO match_commentary ({", ".join(STORED_COLUMNS)})
+    VALUES ({", ".join(":" + column for column in STORED_COLUMNS)})
+"""
+
+# Tables written before match_headers repeat these header columns on every line;
+# ensure_commentary_tables() folds them into the entity tables once
+LEGACY_HEADER_MIGRATION = [
+    """
+    INSERT INTO series (series_id, series_name)
+    SELECT series_id, MAX(series_name) FROM match_commentary
+    WHERE series_id IS NOT NULL GROUP BY series_id
+    ON DUPLICATE KEY UPDATE series_name = COALESCE(series.series_name, VALUES(series_name))
+    """,
+    """
+    INSERT IGNORE INTO teams (team_name, team_id)
+    SELECT name, MAX(id) FROM (
+        SELECT team1_name AS name, team1_id AS id FROM match_commentary
+        UNION ALL SELECT team2_name, team2_id FROM match_commentary
+    ) named
+    WHERE name IS NOT NULL GROUP BY name
+    """,
+    """
+    INSERT IGNORE INTO match_headers (
+        match_id, series_id, match_desc, format, state, status,
+        team1_key, team2_key, toss_winner_key, toss_decision, winning_team_key
+    )
+    SELECT mc.match_id, MAX(mc.series_id), MAX(mc.match_desc), MAX(mc.format), MAX(mc.state), MAX(mc.status),
+        MAX(t1.team_key), MAX(t2.team_key), MAX(tw.team_key), MAX(mc.toss_decision),
+        MAX(CASE WHEN mc.winning_team_id = mc.team1_id THEN t1.team_key
+            WHEN mc.winning_team_id = mc.team2_id THEN t2.team_key END)
+    FROM match_commentary mc
+    LEFT JOIN teams t1 ON t1.team_name = mc.team1_name
+    LEFT JOIN teams t2 ON t2.team_name = mc.team2_name
+    LEFT JOIN teams tw ON tw.team_name = mc.toss_winner_name
+    WHERE mc.match_id IS NOT NULL
+    GROUP BY mc.match_id
+    """,
+]
+
+# LINE_FIELDS columns under their live_commentary names, for the deliveries table
+LIVE_COMMENTARY_NAMES = {
+    "innings_id": "innings",
+    "overnum": "over_number",
+    "ballnbr": "ball_number",
+    "eventtype": "event_type",
+    "commtxt": "commentary_text",
+}
+
+
+def ensure_commentary_tables(conn):
+    """Create match_commentary and the entity tables, moving old per-line header columns to match_headers."""
+    from sqlalchemy import text
+
+    ensure_entity_tables(conn)
+    conn.execute(text(MATCH_COMMENTARY_DDL))
+    existing = {row[0] for row in conn.execute(text("SHOW COLUMNS FROM match_commentary"))}
+    if "commtxt" in existing:
+        # Older rows keep their text until `python commentary_codec.py compact`
+        ensure_codec_columns(conn, "match_commentary")
+    legacy = [column for column in MATCH_FIELDS.columns[1:] if column in existing]
+    if not legacy:
+        return
+    for sql in LEGACY_HEADER_MIGRATION:
+        conn.execute(text(sql))
+    conn.execute(text(
+        "ALTER TABLE match_commentary " + ", ".join(f"DROP COLUMN {column}" for column in legacy)
+    ))
+    logger.info(f"✓ Moved {len(legacy)} header columns of match_commentary into match_headers")
+
+
+def store_commentary_rows(conn, rows, codec: CommentaryCodec) -> int:
+    """Insert commentary_rows() rows into match_commentary, with the text in the codec columns."""
+    from sqlalchemy import text
+
+    if not rows:
+        return 0
+    lines = codec.encode(conn, pd.DataFrame(rows, columns=["match_id"] + LINE_FIELDS.columns), "commtxt")
+    conn.execute(text(INSERT_COMMENTARY), lines.astype(object).where(lines.notna(), None).to_dict("records"))
+    return len(rows)
+
+
+def commentary_rows(match_id, info, comm_data):
+    """
+    One match's header, its match_commentary rows, and its lines as a classified live_commentary-style frame.
+
+    info is the mcenter/v1/{id} response, comm_data the .../comm response.
+    The header is a MATCH_FIELDS dict for entity_keys.store_match_headers().
+    """
+    headers_info, = INFO_FIELDS.extract(info or {})
+    header = dict(zip(MATCH_FIELDS.columns, MATCH_FIELDS.extract(headers_info, match_id)))
+    line_fields = LINE_FIELDS.extract
+
+    comm_lines, = COMM_FIELDS.extract(comm_data or {})
+    rows = [
+        (match_id,) + line_fields(wrapper.get("commentary", wrapper))
+        for wrapper in comm_lines
+    ]
+
+    lines = pd.DataFrame(
+        [row[1:] for row in rows], columns=LINE_FIELDS.columns
+    ).rename(columns=LIVE_COMMENTARY_NAMES)
+    lines.insert(0, "match_id", match_id)
+    return header, rows, classify_commentary(lines)
@@ -0,0 +1,316 @@
+"""
+Pre-rendered match cards for the Live Scores page.
+
+Rendering a card from the live tables means reading seven tables per match and
+formatting scores, team names and the venue in the dashboard on every rerun.
+After each update the ingester instead writes one compact snapshot per match
+(formatted innings scores, top performers, venue line and the last few balls)
+to `match_snapshots`, so the card is a single primary-key read. The snapshot
+is MessagePack-encoded when msgpack is installed and JSON otherwise.
+"""
+import json
+import logging
+import os
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+logger = logging.getLogger(__name__)
+
+# Number of most recent deliveries kept in each snapshot
+SNAPSHOT_BALLS = int(os.getenv('SNAPSHOT_BALLS', 12))
+TOP_PERFORMERS = 3
+
+MATCH_SNAPSHOTS_DDL = """
+    CREATE TABLE IF NOT EXISTS match_snapshots (
+        match_id BIGINT NOT NULL,
+        encoding VARCHAR(8) NOT NULL,
+        payload MEDIUMBLOB NOT NULL,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+        PRIMARY KEY (match_id)
+    )
+"""
+
+
+def _missing(value) -> bool:
+    """True for None, NaN and pandas NA."""
+    try:
+        return value is None or bool(value != value)
+    except TypeError:
+        return True
+
+
+def _clean(value):
+    """Turn numpy scalars and NaN into plain values that encode cleanly."""
+    if _missing(value):
+        return None
+    if hasattr(value, 'item'):
+        return value.item()
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def _clean_tree(value):
+    if isinstance(value, dict):
+        return {k: _clean_tree(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_clean_tree(v) for v in value]
+    return _clean(value)
+
+
+def format_score(runs, wickets, overs, declared=False):
+    """Format score as 'runs/wickets (overs)'"""
+    if _missing(runs):
+        return "Yet to bat"
+
+    try:
+        # cast to int if possible
+        runs_int = int(runs)
+    except (TypeError, ValueError):
+        runs_int = runs
+    score = f"{runs_int}"
+    if not _missing(wickets):
+        try:
+            wickets_int = int(wickets)
+            score += f"/{wickets_int}"
+        except (TypeError, ValueError):
+            score += f"/{wickets}"
+    if not _missing(overs):
+        score += f" ({overs} ov)"
+    if not _missing(declared) and declared:
+        score += " dec"
+
+    return score
+
+
+def _number(value, default=0):
+    return default if _missing(value) else value
+
+
+def _count(value):
+    """Whole-number stats come back as floats when their column has NULLs."""
+    if _missing(value):
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return value
+
+
+def build_match_snapshot(
+    info: dict,
+    teams: List[dict],
+    venue: Optional[dict],
+    batting: List[dict],
+    bowling: List[dict],
+    commentary: List[dict]
+) -> dict:
+    """
+    Build the card data for one match from its live table rows.
+
+    Args:
+        info: the match's live_match_info row
+        teams, batting, bowling, commentary: the match's rows from the live tables
+        venue: the match's live_venues row, if any
+    """
+    team_names = {'team1': 'Team 1', 'team2': 'Team 2'}
+    for team in teams:
+        if team.get('team_role') in team_names and not _missing(team.get('team_name')):
+            team_names[team['team_role']] = team['team_name']
+
+    innings = []
+    for role in ('team1', 'team2'):
+        scores = []
+        for number in (1, 2):
+            prefix = f"{role}_inngs{number}_"
+            # A second innings is only shown once it has started
+            if number == 2 and _missing(info.get(f"{prefix}runs")):
+                continue
+            scores.append([f"Innings {number}", format_score(
+                info.get(f"{prefix}runs"),
+                info.get(f"{prefix}wickets"),
+                info.get(f"{prefix}overs"),
+                info.get(f"{prefix}declared", False)
+            )])
+        innings.append({'team': team_names[role], 'scores': scores})
+
+    venue_line = "Unknown Venue"
+    if venue:
+        venue_line = f"{venue.get('ground') or 'Unknown'}, {venue.get('city') or ''}"
+
+    batters = [b for b in batting if not _missing(b.get('runs'))]
+    batters.sort(key=lambda b: (-_number(b.get('runs')), _number(b.get('balls_faced'))))
+    bowlers = [b for b in bowling if not _missing(b.get('wickets'))]
+    bowlers.sort(key=lambda b: (-_number(b.get('wickets')), _number(b.get('runs_conceded'))))
+
+    balls = sorted(
+        commentary,
+        key=lambda c: (_number(c.get('innings')), _number(c.get('over_number')), _number(c.get('ball_number'))),
+        reverse=True
+    )
+
+    snapshot = {
+        'match_id': info.get('match_id'),
+        'series_name': info.get('series_name'),
+        'match_desc': info.get('match_desc'),
+        'match_format': info.get('match_format'),
+        'toss_status': info.get('toss_status'),
+        'state': info.get('state'),
+        'status': info.get('status'),
+        'team1': team_names['team1'],
+        'team2': team_names['team2'],
+        'venue': venue_line,
+        'innings': innings,
+        'top_batters': [
+            {
+                'name': b.get('batsman_name'),
+                'team': b.get('team_name'),
+                'runs': _count(b.get('runs')),
+                'balls': _count(b.get('balls_faced')),
+            }
+            for b in batters[:TOP_PERFORMERS]
+        ],
+        'top_bowlers': [
+            {
+                'name': b.get('bowler_name'),
+                'team': b.get('team_name'),
+                'wickets': _count(b.get('wickets')),
+                'runs': _count(b.get('runs_conceded')),
+                'overs': b.get('overs'),
+            }
+            for b in bowlers[:TOP_PERFORMERS]
+        ],
+        'last_balls': [
+            {
+                'over': c.get('over_number'),
+                'ball': _count(c.get('ball_number')),
+                'text': c.get('commentary_text'),
+                'event': c.get('event_type'),
+                'runs': _count(c.get('batter_runs', c.get('runs_scored'))),
+            }
+            for c in balls[:SNAPSHOT_BALLS]
+        ],
+        'built_at': datetime.now().isoformat(timespec='seconds'),
+    }
+    return _clean_tree(snapshot)
+
+
+def encode_snapshot(snapshot: dict) -> Tuple[str, bytes]:
+    """Serialize a snapshot; returns (encoding, payload)."""
+    if msgpack is not None:
+        return 'msgpack', msgpack.packb(snapshot, use_bin_type=True)
+    return 'json', json.dumps(snapshot, separators=(',', ':')).encode('utf-8')
+
+
+def decode_snapshot(encoding: str, payload: bytes) -> dict:
+    if encoding == 'msgpack':
+        if msgpack is None:
+            raise RuntimeError("Snapshot is MessagePack-encoded but msgpack is not installed")
+        return msgpack.unpackb(payload, raw=False)
+    return json.loads(payload)
+
+
+def _records_by_match(df) -> Dict[int, List[dict]]:
+    if df is None or df.empty or 'match_id' not in df.columns:
+        return {}
+    grouped: Dict[int, List[dict]] = {}
+    for record in df.to_dict('records'):
+        grouped.setdefault(int(record['match_id']), []).append(record)
+    return grouped
+
+
+def write_match_snapshots(engine, tables: Dict, prune: bool = False) -> int:
+    """
+    Build and store a snapshot for every match in tables['live_match_info'].
+
+    Args:
+        engine: SQLAlchemy engine for the cricbuzz database
+        tables: the DataFrames the ingester just wrote, keyed by table name
+        prune: drop snapshots of matches that are no longer in live_match_info
+
+    Returns:
+        Number of snapshots written.
+    """
+    from sqlalchemy import text
+
+    match_info = tables.get('live_match_info')
+    if match_info is None or match_info.empty:
+        return 0
+
+    teams = _records_by_match(tables.get('live_teams'))
+    venues = _records_by_match(tables.get('live_venues'))
+    batting = _records_by_match(tables.get('live_batting_stats'))
+    bowling = _records_by_match(tables.get('live_bowling_stats'))
+    commentary = _records_by_match(tables.get('live_commentary'))
+
+    rows = {}
+    for info in match_info.to_dict('records'):
+        match_id = int(info['match_id'])
+        snapshot = build_match_snapshot(
+            info,
+            teams.get(match_id, []),
+            (venues.get(match_id) or [None])[-1],
+            batting.get(match_id, []),
+            bowling.get(match_id, []),
+            commentary.get(match_id, [])
+        )
+        encoding, payload = encode_snapshot(snapshot)
+        rows[match_id] = {'match_id': match_id, 'encoding': encoding, 'payload': payload}
+
+    with engine.begin() as conn:
+        conn.execute(text(MATCH_SNAPSHOTS_DDL))
+        conn.execute(
+            text(
+                "INSERT INTO match_snapshots (match_id, encoding, payload) "
+                "VALUES (:match_id, :encoding, :payload) "
+                "ON DUPLICATE KEY UPDATE encoding = VALUES(encoding), payload = VALUES(payload)"
+            ),
+            list(rows.values())
+        )
+        if prune:
+            _prune(conn, list(rows))
+
+    logger.info(f"✓ Wrote {len(rows)} match snapshots")
+    return len(rows)
+
+
+def _prune(conn, match_ids: List[int]):
+    from sqlalchemy import bindparam, text
+
+    conn.execute(
+        text("DELETE FROM match_snapshots WHERE match_id NOT IN :ids")
+        .bindparams(bindparam('ids', expanding=True)),
+        {'ids': match_ids}
+    )
+
+
+def prune_match_snapshots(engine, match_ids: Iterable) -> None:
+    """Drop the snapshots of every match not in match_ids (for ingesters that write match by match)."""
+    from sqlalchemy import text
+
+    match_ids = [int(m) for m in dict.fromkeys(match_ids)]
+    if not match_ids:
+        return
+    with engine.begin() as conn:
+        conn.execute(text(MATCH_SNAPSHOTS_DDL))
+        _prune(conn, match_ids)
+
+
+def read_match_snapshot(conn, match_id) -> Optional[dict]:
+    """Load one match's snapshot over a pymysql connection; None if there is none yet."""
+    cursor = conn.cursor()
+    try:
+        cursor.execute(
+            "SELECT encoding, payload FROM match_snapshots WHERE match_id = %s", (int(match_id),)
+        )
+        row = cursor.fetchone()
+    finally:
+        cursor.close()
+    if row is None:
+        return None
+    return decode_snapshot(row[0], row[1])
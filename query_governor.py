@@ -0,0 +1,231 @@
+"""
+Execution budgets, row caps and cancellation for dashboard SQL.
+
+Every dashboard query goes through one QueryGovernor per process (held by
+st.cache_resource). Queries run on a small worker pool so a slow analytics
+query never blocks the Streamlit script thread. Each query gets:
+
+- a MAX_EXECUTION_TIME optimizer hint, so MySQL aborts SELECTs that overrun
+  their budget;
+- a server-side `KILL QUERY` if it is still running after the budget plus a
+  grace period (statements the hint does not cover), sent by a watchdog timer
+  rather than waiting for the next status poll, or when a user cancels it;
+- a row cap, so a runaway result can't exhaust the dashboard's memory. Once
+  the cap is reached the rest of the result is stopped with `KILL QUERY`
+  before the cursor closes, as closing an unbuffered cursor would otherwise
+  read every remaining row from the server.
+"""
+import logging
+import os
+import re
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+from arrow_reader import read_frame
+
+logger = logging.getLogger(__name__)
+
+QUERY_TIMEOUT_MS = int(os.getenv('QUERY_TIMEOUT_MS', 15000))
+QUERY_MAX_ROWS = int(os.getenv('QUERY_MAX_ROWS', 50000))
+QUERY_WORKERS = int(os.getenv('QUERY_WORKERS', 4))
+KILL_GRACE_SECONDS = 2.0
+# Finished queries nobody collected (e.g. the session went away) are dropped after this
+FINISHED_TTL_SECONDS = 600
+
+# MySQL error codes
+ER_QUERY_INTERRUPTED = 1317
+ER_QUERY_TIMEOUT = 3024
+
+SELECT_START = re.compile(r'^\s*SELECT\b', re.IGNORECASE)
+
+
+def add_execution_hint(sql: str, timeout_ms: int) -> str:
+    """Add a MAX_EXECUTION_TIME hint to a top-level SELECT (other statements are left as is)."""
+    if timeout_ms <= 0 or 'MAX_EXECUTION_TIME' in sql.upper():
+        return sql
+    return SELECT_START.sub(lambda m: f"{m.group(0)} /*+ MAX_EXECUTION_TIME({int(timeout_ms)}) */", sql, count=1)
+
+
+def _error_code(error: Exception) -> Optional[int]:
+    return error.args[0] if error.args and isinstance(error.args[0], int) else None
+
+
+class RunningQuery:
+    """State of one submitted query; state is queued, running, done, error, timeout or cancelled."""
+
+    def __init__(self, sql: str, timeout_ms: int, max_rows: int):
+        self.sql = sql
+        self.timeout_ms = timeout_ms
+        self.max_rows = max_rows
+        self.state = 'queued'
+        self.submitted = time.monotonic()
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+        self.thread_id: Optional[int] = None
+        self.df = None
+        self.truncated = False
+        self.error: Optional[str] = None
+        self.cancel_requested = False
+        self.killed = False
+        self.done = threading.Event()
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds spent executing so far (0 while still queued)."""
+        if self.started is None:
+            return 0.0
+        return (self.finished or time.monotonic()) - self.started
+
+
+class QueryGovernor:
+    """Runs dashboard SELECTs on a worker pool with time budgets, row caps and cancellation."""
+
+    def __init__(self, connect: Callable, workers: int = QUERY_WORKERS,
+                 timeout_ms: int = QUERY_TIMEOUT_MS, max_rows: int = QUERY_MAX_ROWS):
+        """
+        Args:
+            connect: returns a new pymysql connection
+            workers: queries allowed to run at once; later ones queue
+            timeout_ms: default execution budget per query
+            max_rows: default cap on returned rows
+        """
+        self._connect = connect
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='dashboard-query')
+        self._queries: Dict[str, RunningQuery] = {}
+        self._lock = threading.Lock()
+        self.timeout_ms = timeout_ms
+        self.max_rows = max_rows
+
+    def submit(self, sql: str, params=None, timeout_ms: Optional[int] = None,
+               max_rows: Optional[int] = None) -> str:
+        """Queue a query and return a token for status(), cancel() and pop()."""
+        query = RunningQuery(
+            sql,
+            self.timeout_ms if timeout_ms is None else timeout_ms,
+            self.max_rows if max_rows is None else max_rows
+        )
+        token = uuid.uuid4().hex
+        now = time.monotonic()
+        with self._lock:
+            for stale in [t for t, q in self._queries.items()
+                          if q.finished is not None and now - q.finished > FINISHED_TTL_SECONDS]:
+                del self._queries[stale]
+            self._queries[token] = query
+        self._executor.submit(self._execute, query, params)
+        return token
+
+    def _execute(self, query: RunningQuery, params):
+        if query.cancel_requested:
+            self._finish(query, 'cancelled')
+            return
+
+        conn = None
+        watchdog = None
+        try:
+            conn = self._connect()
+            query.thread_id = conn.thread_id()
+            if query.cancel_requested:
+                self._finish(query, 'cancelled')
+                return
+            query.started = time.monotonic()
+            query.state = 'running'
+            if query.timeout_ms > 0:
+                watchdog = threading.Timer(query.timeout_ms / 1000 + KILL_GRACE_SECONDS, self._enforce_budget, (query,))
+                watchdog.daemon = True
+                watchdog.start()
+            df = read_frame(
+                conn,
+                add_execution_hint(query.sql, query.timeout_ms),
+                params=params,
+                max_rows=query.max_rows + 1,
+                on_limit=lambda: self._kill(query)
+            )
+            if len(df) > query.max_rows:
+                df = df.iloc[:query.max_rows]
+                query.truncated = True
+            query.df = df
+            self._finish(query, 'done')
+        except Exception as e:
+            query.error = str(e)
+            if query.cancel_requested:
+                self._finish(query, 'cancelled')
+            elif _error_code(e) == ER_QUERY_TIMEOUT or (query.killed and _error_code(e) == ER_QUERY_INTERRUPTED):
+                self._finish(query, 'timeout')
+            else:
+                self._finish(query, 'error')
+        finally:
+            if watchdog is not None:
+                watchdog.cancel()
+            if conn is not None:
+                try:
+                    conn.close()
+                except Exception:
+                    pass
+
+    @staticmethod
+    def _finish(query: RunningQuery, state: str):
+        query.state = state
+        query.finished = time.monotonic()
+        query.done.set()
+        if state != 'done':
+            logger.info(f"Dashboard query {state} after {query.elapsed:.1f}s")
+
+    def _kill(self, query: RunningQuery):
+        """Stop the query on the server from a separate connection."""
+        if query.thread_id is None or query.done.is_set():
+            return
+        try:
+            conn = self._connect()
+            try:
+                with conn.cursor() as cursor:
+                    cursor.execute(f"KILL QUERY {int(query.thread_id)}")
+            finally:
+                conn.close()
+            logger.info(f"Killed MySQL query on thread {query.thread_id}")
+        except Exception as e:
+            logger.warning(f"⚠ Could not kill query on thread {query.thread_id}: {e}")
+
+    def _enforce_budget(self, query: RunningQuery):
+        if (query.state == 'running' and not query.killed and query.timeout_ms > 0
+                and query.elapsed >= query.timeout_ms / 1000 + KILL_GRACE_SECONDS):
+            query.killed = True
+            self._kill(query)
+
+    def status(self, token: str) -> Optional[RunningQuery]:
+        """Current state of a query, killing it if it has overrun its budget."""
+        with self._lock:
+            query = self._queries.get(token)
+        if query is not None:
+            self._enforce_budget(query)
+        return query
+
+    def cancel(self, token: str):
+        query = self.status(token)
+        if query is None or query.done.is_set():
+            return
+        query.cancel_requested = True
+        self._kill(query)
+
+    def pop(self, token: str) -> Optional[RunningQuery]:
+        """Forget a query (call once its result has been used)."""
+        with self._lock:
+            return self._queries.pop(token, None)
+
+    def wait(self, token: str, poll_seconds: float = 0.1) -> Optional[RunningQuery]:
+        query = self.status(token)
+        while query is not None and not query.done.wait(poll_seconds):
+            self._enforce_budget(query)
+        return query
+
+    def run(self, sql: str, params=None, **kwargs) -> RunningQuery:
+        """Run a query to completion on the worker pool and return its final state."""
+        token = self.submit(sql, params, **kwargs)
+        self.wait(token)
+        return self.pop(token)
+
+    def active(self) -> List[RunningQuery]:
+        with self._lock:
+            return [q for q in self._queries.values() if not q.done.is_set()]
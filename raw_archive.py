@@ -0,0 +1,346 @@
+"""
+Append-only archive of raw API responses, and table rebuilds from it.
+
+Ingestion runs in two stages. The fetch stage (2Live_match.fetch_api_data
+with a raw_key, used by 2Live_match.py and archive_backfill.py) appends
+every response here before anything parses it. The parse/load stage
+(2Live_match.parse_payload) can then run again over the archive at any
+time. After a parser fix, the affected tables are rebuilt from disk with no
+API calls:
+
+    python raw_archive.py rebuild --tables live_commentary --workers 8
+    python raw_archive.py stats
+
+Layout under RAW_ARCHIVE_DIR (default raw_archive/, empty disables it):
+
+- {endpoint}/{YYYY-MM-DD}-{pid}.jsonl.zst: one compressed frame per
+  response, holding a JSON line {"endpoint", "match_id", "fetched_at",
+  "payload"}. Files are only ever appended to, one per writing process.
+  Without the optional zstandard package, frames are gzip members
+  (.jsonl.gz) instead.
+- index.sqlite: one row per response (endpoint, match_id, fetched_at, path,
+  offset, length), so a rebuild can seek straight to the frames it needs.
+"""
+import argparse
+import gzip
+import importlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+import pandas as pd
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+RAW_ARCHIVE_DIR = os.getenv('RAW_ARCHIVE_DIR', 'raw_archive')
+RAW_ARCHIVE_WORKERS = int(os.getenv('RAW_ARCHIVE_WORKERS', os.cpu_count() or 1))
+ZSTD_LEVEL = 3
+# Archived responses fetched within this many seconds of each other get one fetched_at
+POLL_BATCH_SECONDS = 60
+
+INDEX_DDL = """
+    CREATE TABLE IF NOT EXISTS payloads (
+        id INTEGER PRIMARY KEY,
+        endpoint TEXT NOT NULL,
+        match_id INTEGER,
+        fetched_at REAL NOT NULL,
+        path TEXT NOT NULL,
+        offset INTEGER NOT NULL,
+        length INTEGER NOT NULL,
+        raw_bytes INTEGER NOT NULL
+    )
+"""
+INDEX_COLUMNS = ['id', 'endpoint', 'match_id', 'fetched_at', 'path', 'offset', 'length']
+
+
+def _compress(data: bytes) -> bytes:
+    if zstandard is not None:
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+    return gzip.compress(data)
+
+
+def _decompress(frame: bytes, path: str) -> bytes:
+    if path.endswith('.zst'):
+        if zstandard is None:
+            raise RuntimeError(f"zstandard is needed to read {path}")
+        return zstandard.ZstdDecompressor().decompress(frame)
+    return gzip.decompress(frame)
+
+
+class RawArchive:
+    """Appends responses to the archive files and records them in the index; thread-safe."""
+
+    def __init__(self, root: str = RAW_ARCHIVE_DIR):
+        self.root = root
+        self.suffix = '.jsonl.zst' if zstandard is not None else '.jsonl.gz'
+        self._lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+        self._index = sqlite3.connect(os.path.join(root, 'index.sqlite'), timeout=30, check_same_thread=False)
+        with self._index:
+            self._index.execute(INDEX_DDL)
+            self._index.execute(
+                "CREATE INDEX IF NOT EXISTS idx_endpoint_match ON payloads (endpoint, match_id, fetched_at)"
+            )
+
+    def append(self, endpoint: str, payload, match_id: Optional[int] = None,
+               fetched_at: Optional[float] = None) -> int:
+        """Archive one response; returns its index id."""
+        fetched_at = time.time() if fetched_at is None else fetched_at
+        line = json.dumps({
+            'endpoint': endpoint, 'match_id': match_id, 'fetched_at': fetched_at, 'payload': payload,
+        }, separators=(',', ':')).encode() + b'\n'
+        frame = _compress(line)
+
+        day = datetime.fromtimestamp(fetched_at).strftime('%Y-%m-%d')
+        path = os.path.join(endpoint, f"{day}-{os.getpid()}{self.suffix}")
+        with self._lock:
+            os.makedirs(os.path.join(self.root, endpoint), exist_ok=True)
+            with open(os.path.join(self.root, path), 'ab') as f:
+                offset = f.tell()
+                f.write(frame)
+            with self._index:
+                cursor = self._index.execute(
+                    "INSERT INTO payloads (endpoint, match_id, fetched_at, path, offset, length, raw_bytes) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (endpoint, match_id, fetched_at, path, offset, len(frame), len(line))
+                )
+        return cursor.lastrowid
+
+    def entries(self, endpoints: Optional[Iterable[str]] = None, match_ids: Optional[Iterable[int]] = None,
+                since: Optional[float] = None, until: Optional[float] = None,
+                latest: bool = True) -> List[tuple]:
+        """
+        Index rows (INDEX_COLUMNS) of matching responses, oldest first.
+
+        latest=True keeps only the newest response per endpoint and match;
+        responses without a match id (e.g. the live match list) are all kept.
+        """
+        where, params = [], []
+        if endpoints is not None:
+            endpoints = list(endpoints)
+            where.append(f"endpoint IN ({', '.join('?' * len(endpoints))})")
+            params.extend(endpoints)
+        if match_ids is not None:
+            match_ids = [int(m) for m in match_ids]
+            where.append(f"(match_id IS NULL OR match_id IN ({', '.join('?' * len(match_ids))}))")
+            params.extend(match_ids)
+        if since is not None:
+            where.append("fetched_at >= ?")
+            params.append(since)
+        if until is not None:
+            where.append("fetched_at < ?")
+            params.append(until)
+        condition = ' AND '.join(where) or '1'
+
+        query = f"SELECT {', '.join(INDEX_COLUMNS)} FROM payloads WHERE {condition}"
+        if latest:
+            query += (
+                f" AND (match_id IS NULL OR id IN ("
+                f"SELECT MAX(id) FROM payloads WHERE {condition} AND match_id IS NOT NULL "
+                f"GROUP BY endpoint, match_id))"
+            )
+            params = params * 2
+        query += " ORDER BY fetched_at, id"
+        with self._lock:
+            return self._index.execute(query, params).fetchall()
+
+    def stats(self) -> pd.DataFrame:
+        with self._lock:
+            return pd.read_sql(
+                "SELECT endpoint, COUNT(*) AS responses, COUNT(DISTINCT match_id) AS matches, "
+                "SUM(raw_bytes) AS raw_bytes, SUM(length) AS stored_bytes, "
+                "MIN(fetched_at) AS first_fetched, MAX(fetched_at) AS last_fetched "
+                "FROM payloads GROUP BY endpoint",
+                self._index
+            )
+
+    def close(self):
+        self._index.close()
+
+
+def read_payloads(root: str, entries: Iterable[tuple]):
+    """Yield (endpoint, match_id, fetched_at, payload) for index rows, reading each frame by offset."""
+    handles = {}
+    try:
+        for _, endpoint, match_id, fetched_at, path, offset, length in entries:
+            f = handles.get(path)
+            if f is None:
+                f = handles[path] = open(os.path.join(root, path), 'rb')
+            f.seek(offset)
+            record = json.loads(_decompress(f.read(length), path))
+            yield endpoint, match_id, fetched_at, record['payload']
+    finally:
+        for f in handles.values():
+            f.close()
+
+
+def _parse_chunk(args) -> Dict[str, pd.DataFrame]:
+    """Process-pool worker: parse one run of archived responses into live table frames."""
+    root, entries = args
+    live_match = importlib.import_module('2Live_match')
+    builders = live_match.new_builders()
+    parts: Dict[str, List[pd.DataFrame]] = {}
+    batch_started = None
+
+    def flush():
+        frames = live_match.builders_to_frames(builders, datetime.fromtimestamp(batch_started))
+        for table_name, df in frames.items():
+            parts.setdefault(table_name, []).append(df)
+
+    for endpoint, match_id, fetched_at, payload in read_payloads(root, entries):
+        # Responses of one poll share its fetched_at, as in fetch_and_store_all()
+        if batch_started is not None and fetched_at - batch_started > POLL_BATCH_SECONDS:
+            flush()
+            batch_started = None
+        if batch_started is None:
+            batch_started = fetched_at
+        try:
+            live_match.parse_payload(endpoint, payload, match_id, builders)
+        except Exception as e:
+            logger.error(f"✗ Could not parse archived {endpoint} for match {match_id}: {e}")
+    if batch_started is not None:
+        flush()
+
+    return {
+        table_name: pd.concat([df for df in frames if not df.empty] or frames[:1], ignore_index=True)
+        for table_name, frames in parts.items()
+    }
+
+
+def rebuild_frames(root: str, entries: List[tuple], workers: int = RAW_ARCHIVE_WORKERS) -> Dict[str, pd.DataFrame]:
+    """
+    Parse archived responses into live table frames on a process pool.
+
+    Entries are split into contiguous runs, one per worker, so concatenating
+    the results keeps them in fetch order and later snapshots still win.
+    """
+    if not entries:
+        return {}
+    workers = max(1, min(workers, len(entries)))
+    size = -(-len(entries) // workers)
+    chunks = [(root, entries[i:i + size]) for i in range(0, len(entries), size)]
+
+    if workers == 1:
+        results = [_parse_chunk(chunk) for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_parse_chunk, chunks))
+
+    frames = {}
+    for result in results:
+        for table_name, df in result.items():
+            if table_name not in frames or frames[table_name].empty:
+                frames[table_name] = df
+            elif not df.empty:
+                frames[table_name] = pd.concat([frames[table_name], df], ignore_index=True)
+    return frames
+
+
+def rebuild_tables(tables: Optional[List[str]] = None, match_ids: Optional[List[int]] = None,
+                   since: Optional[float] = None, all_snapshots: bool = False, append: bool = False,
+                   workers: int = RAW_ARCHIVE_WORKERS, root: str = RAW_ARCHIVE_DIR) -> Dict[str, int]:
+    """
+    Rebuild live tables from the archive and write them to MySQL; returns rows written per table.
+
+    Without append, each rebuilt table replaces the existing one.
+    """
+    from sqlalchemy import text
+
+    from analytics_engine import snapshot_tables
+    from commentary_codec import CommentaryCodec, write_commentary_frame
+    from delivery_store import store_deliveries
+    from dimension_cache import DIMENSION_KEYS, ensure_dimension_tables, write_dimension_rows
+    from dtype_policy import write_frame
+    from entity_keys import FACT_TABLES, KeyResolver, write_fact_rows
+
+    live_match = importlib.import_module('2Live_match')
+    archive = RawArchive(root)
+    try:
+        entries = archive.entries(
+            endpoints=live_match.endpoints_for(tables), match_ids=match_ids, since=since,
+            latest=not all_snapshots
+        )
+    finally:
+        archive.close()
+
+    started = time.perf_counter()
+    frames = rebuild_frames(root, entries, workers)
+    logger.info(f"✓ Parsed {len(entries)} archived responses in {time.perf_counter() - started:.1f}s")
+
+    written = {}
+    keys, codec = KeyResolver(), CommentaryCodec()
+    with live_match.get_db_engine() as engine:
+        for table_name, df in frames.items():
+            if tables and table_name not in tables:
+                continue
+            if df.empty:
+                logger.warning(f"⚠ No archived data for '{table_name}'. Skipped.")
+                continue
+            df = live_match.drop_duplicate_rows(table_name, df)
+            if table_name in DIMENSION_KEYS:
+                # Keyed tables: replacing means clearing them, not dropping the keys
+                with engine.begin() as conn:
+                    ensure_dimension_tables(conn)
+                    if not append:
+                        conn.execute(text(f"DELETE FROM {table_name}"))
+                    write_dimension_rows(conn, table_name, df)
+            elif table_name in FACT_TABLES:
+                with engine.begin() as conn:
+                    write_fact_rows(conn, table_name, df, keys, 'append' if append else 'replace')
+            elif table_name == 'live_commentary':
+                with engine.begin() as conn:
+                    write_commentary_frame(conn, table_name, df, codec, 'append' if append else 'replace')
+            else:
+                write_frame(engine, table_name, df, 'append' if append else 'replace')
+            written[table_name] = len(df)
+            logger.info(f"✓ Rebuilt '{table_name}' with {len(df)} rows")
+        if 'live_commentary' in written:
+            store_deliveries(engine, frames['live_commentary'])
+        if written:
+            snapshot_tables(engine, list(written))
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--root', default=RAW_ARCHIVE_DIR)
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    rebuild = commands.add_parser('rebuild', help="re-parse archived responses into the live tables")
+    rebuild.add_argument('--tables', nargs='+', help="only these tables (default: every live table)")
+    rebuild.add_argument('--match-ids', type=int, nargs='+')
+    rebuild.add_argument('--since', help="only responses fetched on or after this date (YYYY-MM-DD)")
+    rebuild.add_argument('--all-snapshots', action='store_true',
+                         help="parse every archived response, not just the newest per match")
+    rebuild.add_argument('--append', action='store_true', help="append instead of replacing the tables")
+    rebuild.add_argument('--workers', type=int, default=RAW_ARCHIVE_WORKERS)
+
+    commands.add_parser('stats', help="responses and bytes archived per endpoint")
+    args = parser.parse_args()
+
+    if args.command == 'stats':
+        archive = RawArchive(args.root)
+        print(archive.stats().to_string(index=False))
+        archive.close()
+        return
+
+    since = datetime.strptime(args.since, '%Y-%m-%d').timestamp() if args.since else None
+    rebuild_tables(
+        tables=args.tables, match_ids=args.match_ids, since=since, all_snapshots=args.all_snapshots,
+        append=args.append, workers=args.workers, root=args.root
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,299 @@
+"""
+Incremental live scorecards built from commentary deliveries.
+
+Refetching /mcenter/v1/{id}/scard every poll costs one API call per live
+match and only repeats what the /comm feed already said ball by ball.
+ScorecardEngine keeps each match's batting and bowling figures in memory,
+seeded from a full /scard fetch ("reconcile"), and applies the deliveries
+that arrive after it (see delivery_store.parse_deliveries).
+
+A match is reconciled again when:
+- it has never been reconciled, or its commentary skipped balls (the feed
+  only returns the latest page, so a long gap can't be replayed);
+- an innings starts or ends, or the match state changes (e.g. to Complete);
+- SCARD_RECONCILE_SECONDS have passed since the last reconcile, to pick up
+  what commentary can't tell us (maidens, full dismissal text, player ids).
+"""
+import logging
+import os
+import time
+from typing import Dict, Iterable, Optional
+
+import pandas as pd
+
+from delivery_store import WICKET_KINDS, parse_deliveries
+
+logger = logging.getLogger(__name__)
+
+SCARD_RECONCILE_SECONDS = int(os.getenv('SCARD_RECONCILE_SECONDS', 300))
+
+# Extras codes (delivery_store.EXTRAS_TYPES) and dismissals credited to the bowler
+WIDE, NO_BALL, LEG_BYE, BYE = 1, 2, 3, 4
+BOWLER_WICKETS = {1, 2, 3, 5, 6}
+
+BATTING_COLUMNS = [
+    'match_id', 'innings_id', 'team_name', 'batsman_id', 'batsman_name', 'batting_position',
+    'runs', 'balls_faced', 'fours', 'sixes', 'strike_rate', 'out_desc',
+]
+BOWLING_COLUMNS = [
+    'match_id', 'innings_id', 'team_name', 'bowler_id', 'bowler_name', 'overs', 'maidens',
+    'runs_conceded', 'wickets', 'economy', 'no_balls', 'wides',
+]
+
+
+def _overs_to_balls(overs) -> int:
+    """3.4 overs -> 22 balls."""
+    if overs is None or pd.isna(overs):
+        return 0
+    whole = int(overs)
+    return whole * 6 + int(round((overs - whole) * 10))
+
+
+def _balls_to_overs(balls: int) -> float:
+    return balls // 6 + (balls % 6) / 10
+
+
+def _short_name(name: str) -> str:
+    return name.split()[-1].lower() if name else ''
+
+
+class MatchScorecard:
+    """One match's batting and bowling rows, keyed by (innings, player name)."""
+
+    def __init__(self, match_id: int):
+        self.match_id = match_id
+        self.batting: Dict[tuple, dict] = {}
+        self.bowling: Dict[tuple, dict] = {}
+        self.bowler_balls: Dict[tuple, int] = {}
+        self.team_names: Dict[int, str] = {}
+        # Last /scard rows of the tables commentary can't update
+        self.partnerships: Optional[pd.DataFrame] = None
+        self.metadata: Optional[pd.DataFrame] = None
+        # Commentary name ("Kohli") -> scorecard key, per innings and side
+        self._names: Dict[tuple, tuple] = {}
+
+        self.last_timestamp: Optional[int] = None
+        self.reconciled_at: Optional[float] = None
+        self.innings_count: Optional[int] = None
+        self.state: Optional[str] = None
+        self.stale = True
+
+    def needs_reconcile(self, innings_count: int, state: Optional[str], now: Optional[float] = None) -> bool:
+        now = time.monotonic() if now is None else now
+        return (
+            self.stale
+            or self.reconciled_at is None
+            or innings_count != self.innings_count
+            or state != self.state
+            or now - self.reconciled_at >= SCARD_RECONCILE_SECONDS
+        )
+
+    def reconcile(self, tables: Dict[str, pd.DataFrame], deliveries: pd.DataFrame,
+                  innings_count: int, state: Optional[str]):
+        """Replace the state with this match's /scard rows; later deliveries are applied on top."""
+        def rows(table_name):
+            df = tables.get(table_name)
+            if df is None or df.empty:
+                return df.iloc[0:0] if df is not None else None
+            return df[df['match_id'] == self.match_id]
+
+        batting, bowling = rows('live_batting_stats'), rows('live_bowling_stats')
+        self.batting, self.bowling, self.bowler_balls, self._names = {}, {}, {}, {}
+        self.team_names = {}
+        if batting is not None:
+            for row in batting[BATTING_COLUMNS].to_dict('records'):
+                self.batting[(row['innings_id'], row['batsman_name'])] = row
+                self.team_names.setdefault(row['innings_id'], row['team_name'])
+        if bowling is not None:
+            for row in bowling[BOWLING_COLUMNS].to_dict('records'):
+                key = (row['innings_id'], row['bowler_name'])
+                self.bowling[key] = row
+                self.bowler_balls[key] = _overs_to_balls(row['overs'])
+                self.team_names.setdefault(row['innings_id'], row['team_name'])
+        self.partnerships = rows('live_partnerships')
+        self.metadata = rows('live_scorecard_metadata')
+
+        if not deliveries.empty:
+            self.last_timestamp = int(deliveries['timestamp'].max())
+        self.reconciled_at = time.monotonic()
+        self.innings_count = innings_count
+        self.state = state
+        self.stale = False
+
+    def _resolve(self, side: str, innings: int, name: str) -> tuple:
+        """Scorecard key for a commentary name, matching "Kohli" to "Virat Kohli"."""
+        cache_key = (side, innings, name)
+        if cache_key in self._names:
+            return self._names[cache_key]
+
+        rows = self.batting if side == 'bat' else self.bowling
+        key = (innings, name)
+        if key not in rows:
+            candidates = [k for k in rows if k[0] == innings and _short_name(k[1]) == _short_name(name)]
+            if len(candidates) == 1:
+                key = candidates[0]
+        self._names[cache_key] = key
+        return key
+
+    def _batting_row(self, key: tuple) -> dict:
+        row = self.batting.get(key)
+        if row is None:
+            innings, name = key
+            position = sum(1 for k in self.batting if k[0] == innings) + 1
+            row = self.batting[key] = {
+                'match_id': self.match_id, 'innings_id': innings, 'team_name': self.team_names.get(innings),
+                'batsman_id': None, 'batsman_name': name, 'batting_position': position,
+                'runs': 0, 'balls_faced': 0, 'fours': 0, 'sixes': 0, 'strike_rate': None, 'out_desc': None,
+            }
+        return row
+
+    def _bowling_row(self, key: tuple) -> dict:
+        row = self.bowling.get(key)
+        if row is None:
+            innings, name = key
+            row = self.bowling[key] = {
+                'match_id': self.match_id, 'innings_id': innings, 'team_name': self.team_names.get(innings),
+                'bowler_id': None, 'bowler_name': name, 'overs': 0.0, 'maidens': 0, 'runs_conceded': 0,
+                'wickets': 0, 'economy': None, 'no_balls': 0, 'wides': 0,
+            }
+            self.bowler_balls[key] = 0
+        return row
+
+    def apply(self, deliveries: pd.DataFrame) -> int:
+        """Apply deliveries newer than the last one seen; returns how many were applied."""
+        if deliveries.empty:
+            return 0
+        if self.last_timestamp is not None:
+            if deliveries['timestamp'].min() > self.last_timestamp:
+                # Every fetched ball is new, so balls between the two pages may be missing
+                self.stale = True
+            deliveries = deliveries[deliveries['timestamp'] > self.last_timestamp]
+        if deliveries.empty:
+            return 0
+
+        for d in deliveries.sort_values('timestamp').itertuples(index=False):
+            extras_type, wicket_kind = int(d.extras_type), int(d.wicket_kind)
+
+            bat = self._batting_row(self._resolve('bat', d.innings, d.batter))
+            if extras_type != WIDE:
+                bat['balls_faced'] = (bat['balls_faced'] or 0) + 1
+            bat['runs'] = (bat['runs'] or 0) + int(d.batter_runs)
+            if d.batter_runs == 4:
+                bat['fours'] = (bat['fours'] or 0) + 1
+            elif d.batter_runs == 6:
+                bat['sixes'] = (bat['sixes'] or 0) + 1
+            if wicket_kind:
+                bat['out_desc'] = WICKET_KINDS[wicket_kind]
+            if bat['balls_faced']:
+                bat['strike_rate'] = round(bat['runs'] * 100 / bat['balls_faced'], 2)
+
+            bowl_key = self._resolve('bowl', d.innings, d.bowler)
+            bowl = self._bowling_row(bowl_key)
+            if extras_type not in (WIDE, NO_BALL):
+                self.bowler_balls[bowl_key] += 1
+            conceded = int(d.runs) - (int(d.extras) if extras_type in (LEG_BYE, BYE) else 0)
+            bowl['runs_conceded'] = (bowl['runs_conceded'] or 0) + conceded
+            if extras_type == WIDE:
+                bowl['wides'] = (bowl['wides'] or 0) + int(d.extras)
+            elif extras_type == NO_BALL:
+                bowl['no_balls'] = (bowl['no_balls'] or 0) + 1
+            if wicket_kind in BOWLER_WICKETS:
+                bowl['wickets'] = (bowl['wickets'] or 0) + 1
+            balls = self.bowler_balls[bowl_key]
+            bowl['overs'] = _balls_to_overs(balls)
+            if balls:
+                bowl['economy'] = round(bowl['runs_conceded'] * 6 / balls, 2)
+
+        self.last_timestamp = int(deliveries['timestamp'].max())
+        return len(deliveries)
+
+    def frames(self) -> Dict[str, pd.DataFrame]:
+        """The match's current rows for the scorecard tables."""
+        frames = {
+            'live_batting_stats': pd.DataFrame(list(self.batting.values()), columns=BATTING_COLUMNS),
+            'live_bowling_stats': pd.DataFrame(list(self.bowling.values()), columns=BOWLING_COLUMNS),
+        }
+        if self.partnerships is not None:
+            frames['live_partnerships'] = self.partnerships
+        if self.metadata is not None:
+            frames['live_scorecard_metadata'] = self.metadata
+        return frames
+
+
+class ScorecardEngine:
+    """Scorecard state for every live match, kept across polls of one long-running process."""
+
+    def __init__(self):
+        self.matches: Dict[int, MatchScorecard] = {}
+
+    def needs_reconcile(self, match_id: int, innings_count: int, state: Optional[str]) -> bool:
+        match = self.matches.get(match_id)
+        return match is None or match.needs_reconcile(innings_count, state)
+
+    def mark_stale(self, match_id: int) -> bool:
+        """Reconcile a match on its next poll (its /scard failed); returns whether there are rows to serve meanwhile."""
+        match = self.matches.get(match_id)
+        if match is None:
+            return False
+        match.stale = True
+        return True
+
+    def update(self, tables: Dict[str, pd.DataFrame], reconciled: Dict[int, tuple],
+               skipped: Dict[int, tuple], prune: bool = True) -> Dict[str, pd.DataFrame]:
+        """
+        Fold one poll's tables into the engine and fill in the matches whose /scard was skipped.
+
+        Args:
+            tables: the parsed live tables, with live_commentary classified
+            reconciled: match_id -> (innings_count, state) for matches whose /scard was fetched
+            skipped: same, for matches served from commentary deltas
+            prune: forget matches in neither; pass False when the poll is fed
+                in one match at a time and call retain() at the end instead
+
+        Returns:
+            tables, with skipped matches' scorecard rows added from the engine.
+        """
+        deliveries = parse_deliveries(tables['live_commentary'])
+        by_match = dict(tuple(deliveries.groupby('match_id'))) if not deliveries.empty else {}
+        empty = deliveries.iloc[0:0]
+
+        for match_id, (innings_count, state) in reconciled.items():
+            match = self.matches.setdefault(match_id, MatchScorecard(match_id))
+            match.reconcile(tables, by_match.get(match_id, empty), innings_count, state)
+
+        added = {}
+        applied = 0
+        for match_id in skipped:
+            match = self.matches[match_id]
+            applied += match.apply(by_match.get(match_id, empty))
+            for table_name, df in match.frames().items():
+                added.setdefault(table_name, []).append(df)
+
+        for table_name, frames in added.items():
+            frames = [f for f in [tables[table_name]] + frames if not f.empty]
+            if frames:
+                tables[table_name] = pd.concat(frames, ignore_index=True)
+
+        if prune:
+            self.retain(set(reconciled) | set(skipped))
+
+        if skipped:
+            logger.info(f"Scorecards from commentary for {len(skipped)} matches ({applied} new balls), "
+                        f"/scard fetched for {len(reconciled)}")
+        return tables
+
+    def retain(self, live_ids: Iterable[int]):
+        """Forget matches that dropped out of the live feed."""
+        live_ids = set(live_ids)
+        for match_id in [m for m in self.matches if m not in live_ids]:
+            del self.matches[match_id]
+
+
+def innings_count(match_score: dict) -> int:
+    """Innings started so far, from a matchScore block."""
+    return sum(
+        1
+        for team in ('team1Score', 'team2Score')
+        for innings in ('inngs1', 'inngs2')
+        if (match_score.get(team) or {}).get(innings)
+    )
@@ -0,0 +1,190 @@
+"""
+Decoding of the Cricbuzz stats grids into typed DataFrames.
+
+Two shapes come back from the stats endpoints:
+
+- stats/v1/player/{id}/batting|bowling: one row per stat ("Matches", "SR",
+  ...) and one column per format (headers ["ROWHEADER", "Test", "ODI", ...]).
+  decode_stat_matrices() pivots many players' grids to one row per
+  (player, format).
+- stats/v1/topstats/{format}: one row per player, columns by position.
+  decode_stat_rows() reads it with a positional column list.
+
+Cells are converted a whole column at a time. "-", "-/-", blanks and
+malformed numbers all become missing and then take the column's default, so
+every stat handles missing values the same way.
+"""
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+INT = 'int'
+FLOAT = 'float'
+STR = 'str'
+# A ball count stored as overs (6 balls = 1 over, rounded to one decimal)
+BALLS_AS_OVERS = 'balls_as_overs'
+
+MISSING_VALUES = ['', '-', '-/-', '--', 'NA', 'N/A']
+
+# stat name (lowercase, as in the grid's first column) -> (output column, kind, default)
+BATTING_STATS: Dict[str, Tuple[str, str, object]] = {
+    'matches': ('matches', INT, 0),
+    'innings': ('innings', INT, 0),
+    'runs': ('runs', INT, 0),
+    'balls': ('balls', INT, 0),
+    'highest': ('highest', STR, '0'),
+    'average': ('average', FLOAT, 0.0),
+    'sr': ('strike_rate', FLOAT, 0.0),
+    'not out': ('not_out', INT, 0),
+    'fours': ('fours', INT, 0),
+    'sixes': ('sixes', INT, 0),
+    'ducks': ('ducks', INT, 0),
+    '50s': ('fifties', INT, 0),
+    '100s': ('hundreds', INT, 0),
+    '200s': ('two_hundreds', INT, 0),
+    '300s': ('three_hundreds', INT, 0),
+    '400s': ('four_hundreds', INT, 0),
+}
+
+BOWLING_STATS: Dict[str, Tuple[str, str, object]] = {
+    'wickets': ('wickets', INT, 0),
+    'avg': ('bowling_average', FLOAT, 0.0),
+    'sr': ('bowling_strike_rate', FLOAT, 0.0),
+    'eco': ('economy_rate', FLOAT, 0.0),
+    'balls': ('overs_bowled', BALLS_AS_OVERS, 0.0),
+    'maidens': ('maidens', INT, 0),
+    'runs': ('runs_conceded', INT, 0),
+    'bbi': ('best_bowling', STR, '0/0'),
+    '5w': ('five_wickets', INT, 0),
+    '10w': ('ten_wickets', INT, 0),
+}
+
+
+def _parse_cells(cells: list):
+    """Strip every cell once and parse it as a number: (text, numbers, missing)."""
+    text = pd.Series(cells, dtype=object)
+    text = text.where(text.notna(), '').astype(str).str.strip()
+    missing = text.isin(MISSING_VALUES).to_numpy()
+    numbers = pd.to_numeric(text.str.replace(',', '', regex=False), errors='coerce')
+    numbers = numbers.to_numpy(dtype=np.float64, na_value=np.nan)
+    numbers = np.where(missing, np.nan, numbers)
+    return text.to_numpy(dtype=object), numbers, missing
+
+
+def _typed(text: np.ndarray, numbers: np.ndarray, missing: np.ndarray, kind: str, default=None):
+    """
+    One column's parsed cells as its kind.
+
+    Missing cells (see MISSING_VALUES) become `default`; with default=None
+    numeric columns keep them as nulls (nullable Int64 for INT).
+    """
+    if kind == STR:
+        return np.where(missing, default, text)
+    if kind == BALLS_AS_OVERS:
+        numbers = np.round(np.floor(numbers) / 6, 1)
+    if default is not None:
+        numbers = np.where(np.isnan(numbers), default, numbers)
+    if kind == INT:
+        numbers = np.rint(numbers)
+        return numbers.astype(np.int64) if default is not None else pd.array(numbers, dtype='Int64')
+    return numbers
+
+
+def decode_stat_matrices(grids: Dict[object, Optional[dict]], stats: Dict[str, Tuple[str, str, object]],
+                         key_name: str = 'key') -> pd.DataFrame:
+    """
+    Pivot many stat-by-format grids (e.g. {player_id: response}) into one row per (key, format).
+
+    Every cell of every grid is stripped and parsed in one pass, so decoding a
+    few hundred players costs about the same fixed pandas overhead as one.
+    Returns a DataFrame indexed by (key_name, 'format') with one typed column
+    per stat in `stats` found in any grid; grids without that stat get its
+    default (later rows win if a stat repeats).
+    """
+    keys, formats_by_row = [], []
+    # stat name -> (output row ids, positions in `cells`)
+    found: Dict[str, Tuple[list, list]] = {}
+    cells = []
+
+    for key, data in grids.items():
+        data = data or {}
+        headers = data.get("headers", [])
+        formats = [h for h in headers[1:] if h.upper() not in ['ROWHEADER']]
+        width = len(formats)
+
+        # Last row per known stat name, in grid order
+        rows = {}
+        for row in data.get("values", []):
+            values = row.get("values", [])
+            if len(values) > width and values[0]:
+                stat_name = str(values[0]).strip().lower()
+                if stat_name in stats:
+                    rows.pop(stat_name, None)
+                    rows[stat_name] = values
+
+        first_row = len(keys)
+        keys.extend([key] * width)
+        formats_by_row.extend(formats)
+        for stat_name, values in rows.items():
+            row_ids, positions = found.setdefault(stat_name, ([], []))
+            row_ids.extend(range(first_row, first_row + width))
+            positions.extend(range(len(cells), len(cells) + width))
+            cells.extend(values[1:width + 1])
+
+    index = pd.MultiIndex.from_arrays([keys, formats_by_row], names=[key_name, 'format'])
+    if not found:
+        return pd.DataFrame(index=index)
+
+    # A trailing empty cell stands in for stats a grid doesn't have
+    cells.append(None)
+    text, numbers, missing = _parse_cells(cells)
+
+    decoded = {}
+    for stat_name, (row_ids, positions) in found.items():
+        column, kind, default = stats[stat_name]
+        take = np.full(len(keys), len(cells) - 1)
+        take[row_ids] = positions
+        decoded[column] = _typed(text[take], numbers[take], missing[take], kind, default)
+    return pd.DataFrame(decoded, index=index)
+
+
+def nested_stats(df: pd.DataFrame) -> Dict[object, Dict[str, dict]]:
+    """decode_stat_matrices() output as {key: {format: {column: value}}}."""
+    nested: Dict[object, Dict[str, dict]] = {}
+    for (key, format_name), values in df.to_dict('index').items():
+        nested.setdefault(key, {})[format_name] = values
+    return nested
+
+
+def decode_stat_rows(data: Optional[dict], columns: List[Tuple[str, str]],
+                     min_cells: Optional[int] = None) -> pd.DataFrame:
+    """
+    Read a row-per-player grid ({"values": [{"values": [...]}, ...]}) by position.
+
+    columns lists (output column, kind) for the leading cells of each row;
+    rows with fewer than min_cells cells (default: all of them) are skipped.
+    Missing or malformed numbers are left null.
+    """
+    width = len(columns)
+    min_cells = width if min_cells is None else min_cells
+    rows = [row.get("values", []) for row in (data or {}).get("values", [])]
+    rows = [
+        list(values[:width]) + [None] * (width - len(values))
+        for values in rows if values and len(values) >= min_cells
+    ]
+
+    # Column-major, so each column is a contiguous slice of the parsed cells
+    cells = [values[i] for i in range(width) for values in rows]
+    text, numbers, missing = _parse_cells(cells)
+    count = len(rows)
+    return pd.DataFrame({
+        name: _typed(text[i * count:(i + 1) * count], numbers[i * count:(i + 1) * count],
+                     missing[i * count:(i + 1) * count], kind)
+        for i, (name, kind) in enumerate(columns)
+    }, index=pd.RangeIndex(count))
+
+
+def to_records(df: pd.DataFrame) -> List[dict]:
+    """DataFrame rows as plain dicts, with nulls as None."""
+    return df.astype(object).where(df.notna(), None).to_dict('records')
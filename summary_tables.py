@@ -0,0 +1,207 @@
+"""
+Materialized summary tables for the SQL Analytics page.
+
+Each entry in SUMMARY_TABLES describes one aggregate that the dashboard used to
+recompute on every "Run Query" click. Ingesters call refresh_summaries() once
+their writes are committed; the dashboard reads the small summary table instead
+of re-running the GROUP BY against the base tables. Summaries are small, so each
+refresh rebuilds the whole table and swaps it in.
+"""
+import logging
+from typing import Dict, Iterable
+
+from sqlalchemy import text
+
+logger = logging.getLogger(__name__)
+
+# name -> spec
+#   sources:      base tables the summary is derived from
+#   ddl:          CREATE TABLE statement for the summary
+#   columns:      summary columns filled by `select` (in order)
+#   select:       aggregation over the sources
+#   query:        what the dashboard runs instead of the original query
+SUMMARY_TABLES: Dict[str, dict] = {
+    'summary_team_wins': {
+        'sources': ['recent_matches'],
+        'ddl': """
+            CREATE TABLE IF NOT EXISTS summary_team_wins (
+                team_name VARCHAR(255) NOT NULL,
+                total_wins INT NOT NULL DEFAULT 0,
+                refreshed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+                PRIMARY KEY (team_name),
+                INDEX idx_total_wins (total_wins DESC)
+            )
+        """,
+        'columns': ['team_name', 'total_wins'],
+        'select': """
+            SELECT team_name, COUNT(*) AS total_wins
+            FROM (
+                SELECT Team_1 AS team_name
+                FROM recent_matches
+                WHERE Status LIKE '%won by%' AND Status LIKE CONCAT(Team_1, '%')
+                UNION ALL
+                SELECT Team_2 AS team_name
+                FROM recent_matches
+                WHERE Status LIKE '%won by%' AND Status LIKE CONCAT(Team_2, '%')
+            ) AS wins
+            WHERE team_name IS NOT NULL
+            GROUP BY team_name
+        """,
+        'query': """
+            SELECT team_name, total_wins
+            FROM summary_team_wins
+            ORDER BY total_wins DESC;
+        """,
+    },
+    'summary_player_formats': {
+        'sources': ['player_stats'],
+        'ddl': """
+            CREATE TABLE IF NOT EXISTS summary_player_formats (
+                player_name VARCHAR(255) NOT NULL,
+                test_runs INT DEFAULT 0,
+                odi_runs INT DEFAULT 0,
+                t20i_runs INT DEFAULT 0,
+                total_runs INT DEFAULT 0,
+                total_wickets INT DEFAULT 0,
+                overall_avg DECIMAL(8,2),
+                formats_played INT DEFAULT 0,
+                refreshed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+                PRIMARY KEY (player_name),
+                INDEX idx_formats_played (formats_played)
+            )
+        """,
+        'columns': [
+            'player_name', 'test_runs', 'odi_runs', 't20i_runs', 'total_runs',
+            'total_wickets', 'overall_avg', 'formats_played'
+        ],
+        'select': """
+            SELECT player_name,
+                SUM(CASE WHEN format_type='Test' THEN runs ELSE 0 END) AS test_runs,
+                SUM(CASE WHEN format_type='ODI' THEN runs ELSE 0 END) AS odi_runs,
+                SUM(CASE WHEN format_type='T20I' THEN runs ELSE 0 END) AS t20i_runs,
+                SUM(runs) AS total_runs,
+                SUM(wickets) AS total_wickets,
+                AVG(average) AS overall_avg,
+                COUNT(DISTINCT format_type) AS formats_played
+            FROM player_stats
+            WHERE player_name IS NOT NULL
+            GROUP BY player_name
+        """,
+        'query': """
+            SELECT player_name, test_runs, odi_runs, t20i_runs, overall_avg
+            FROM summary_player_formats
+            WHERE formats_played >= 2;
+        """,
+    },
+    'summary_partnership_pairs': {
+        # Same rows as query 24: adjacent-position stands only, named from player_info
+        'sources': ['partnerships', 'player_info'],
+        'ddl': """
+            CREATE TABLE IF NOT EXISTS summary_partnership_pairs (
+                batsman1 VARCHAR(255) NOT NULL,
+                batsman2 VARCHAR(255) NOT NULL,
+                total_partnerships INT DEFAULT 0,
+                avg_runs DECIMAL(14,4),
+                fifty_plus INT DEFAULT 0,
+                highest INT DEFAULT 0,
+                refreshed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+                PRIMARY KEY (batsman1, batsman2),
+                INDEX idx_avg_runs (avg_runs DESC)
+            )
+        """,
+        'columns': ['batsman1', 'batsman2', 'total_partnerships', 'avg_runs', 'fifty_plus', 'highest'],
+        'select': """
+            SELECT p1.player_name AS batsman1, p2.player_name AS batsman2,
+                COUNT(*) AS total_partnerships,
+                AVG(partnership_runs) AS avg_runs,
+                SUM(CASE WHEN partnership_runs > 50 THEN 1 ELSE 0 END) AS fifty_plus,
+                MAX(partnership_runs) AS highest
+            FROM partnerships
+            JOIN player_info p1 ON partnerships.batsman1_id = p1.player_id
+            JOIN player_info p2 ON partnerships.batsman2_id = p2.player_id
+            WHERE ABS(partnerships.batsman1_pos - partnerships.batsman2_pos) = 1
+                AND p1.player_name IS NOT NULL AND p2.player_name IS NOT NULL
+            GROUP BY p1.player_name, p2.player_name
+        """,
+        'query': """
+            SELECT batsman1, batsman2, avg_runs, fifty_plus, highest, total_partnerships
+            FROM summary_partnership_pairs
+            WHERE total_partnerships >= 5
+            ORDER BY avg_runs DESC;
+        """,
+    },
+    'summary_toss_decisions': {
+        # Same groups and denominator as query 17, including matches without a toss or result
+        'sources': ['live_matches'],
+        'ddl': """
+            CREATE TABLE IF NOT EXISTS summary_toss_decisions (
+                toss_decision VARCHAR(50),
+                matches INT DEFAULT 0,
+                toss_winner_won INT DEFAULT 0,
+                win_pct DECIMAL(5,2),
+                refreshed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+                UNIQUE KEY uq_toss_decision (toss_decision)
+            )
+        """,
+        'columns': ['toss_decision', 'matches', 'toss_winner_won', 'win_pct'],
+        'select': """
+            SELECT toss_decision,
+                COUNT(*) AS matches,
+                SUM(CASE WHEN toss_winner = match_winner THEN 1 ELSE 0 END) AS toss_winner_won,
+                ROUND(100 * SUM(CASE WHEN toss_winner = match_winner THEN 1 ELSE 0 END) / COUNT(*), 2) AS win_pct
+            FROM live_matches
+            GROUP BY toss_decision
+        """,
+        'query': """
+            SELECT toss_decision, win_pct
+            FROM summary_toss_decisions;
+        """,
+    },
+}
+
+
+def ensure_summary_tables(engine):
+    """Create any missing summary tables."""
+    with engine.begin() as conn:
+        for spec in SUMMARY_TABLES.values():
+            conn.execute(text(spec['ddl']))
+
+
+def _full_refresh(conn, name: str, spec: dict):
+    """
+    Rebuild a summary into a shadow table and swap it in atomically.
+
+    The shadow table is created from the spec's DDL, so a summary whose columns
+    changed replaces the old table on its next rebuild.
+    """
+    shadow, retired = f"{name}__new", f"{name}__old"
+    columns = ", ".join(spec['columns'])
+    conn.execute(text(f"DROP TABLE IF EXISTS {shadow}, {retired}"))
+    conn.execute(text(spec['ddl'].replace(f" {name} (", f" {shadow} (", 1)))
+    conn.execute(text(
+        f"INSERT INTO {shadow} ({columns}) {spec['select']}"
+    ))
+    conn.execute(text(f"RENAME TABLE {name} TO {retired}, {shadow} TO {name}"))
+    conn.execute(text(f"DROP TABLE {retired}"))
+
+
+def refresh_summaries(engine, source_tables: Iterable[str]):
+    """
+    Rebuild every summary derived from the given source tables.
+
+    Args:
+        engine: SQLAlchemy engine for the cricbuzz database
+        source_tables: tables the caller has just written
+    """
+    source_tables = set(source_tables)
+    ensure_summary_tables(engine)
+
+    for name, spec in SUMMARY_TABLES.items():
+        if not source_tables.intersection(spec['sources']):
+            continue
+        try:
+            with engine.begin() as conn:
+                _full_refresh(conn, name, spec)
+            logger.info(f"✓ Rebuilt summary '{name}'")
+        except Exception as e:
+            logger.error(f"✗ Could not refresh summary '{name}': {e}")
@@ -0,0 +1,64 @@
+import json
+import os
+
+import pytest
+
+from archive_backfill import MatchArchiver
+
+FIXTURES = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+
+def load_fixture(name):
+    with open(os.path.join(FIXTURES, name)) as f:
+        return json.load(f)
+
+
+def stored_frames(archiver):
+    return {
+        table_name: builder.to_frame({'fetched_at': None} if 'fetched_at' in builder.spec else None)
+        for table_name, builder in archiver.builders.items()
+    }
+
+
+def test_store_reads_mcenter_header():
+    archiver = MatchArchiver(engine=None)
+    info = load_fixture('mcenter_match_info.json')
+
+    archiver.store(89654, {'match_info': info, 'scard': None, 'comm': None})
+    frames = stored_frames(archiver)
+
+    match_info = frames['live_match_info'].iloc[0]
+    assert match_info['series_id'] == 7120
+    assert match_info['match_desc'] == '2nd Test'
+    assert match_info['start_date'] == 1704189600000
+    assert match_info['toss_status'] == 'South Africa opt to bat'
+
+    teams = frames['live_teams']
+    assert teams[['team_role', 'team_id', 'team_name', 'team_sname']].values.tolist() == [
+        ['team1', 11, 'South Africa', 'RSA'],
+        ['team2', 2, 'India', 'IND'],
+    ]
+    venue = frames['live_venues'].iloc[0]
+    assert (venue['venue_id'], venue['ground'], venue['city']) == (43, 'Newlands', 'Cape Town')
+    assert frames['live_series'][['series_id', 'series_type']].values.tolist() == [[7120, 'INTERNATIONAL']]
+    assert len(frames['live_officials']) == 4
+
+    header = archiver.headers[0]
+    assert (header['team1_id'], header['team2_name']) == (11, 'India')
+    assert (header['toss_winner_id'], header['toss_decision'], header['winning_team_id']) == (11, 'Batting', 2)
+
+
+def test_store_failing_part_way_adds_nothing_to_the_batch():
+    archiver = MatchArchiver(engine=None)
+    info = load_fixture('mcenter_match_info.json')
+    archiver.store(89654, {'match_info': info, 'scard': None, 'comm': None})
+
+    # The header parses, then the malformed scorecard raises
+    with pytest.raises(AttributeError):
+        archiver.store(89655, {'match_info': info, 'scard': {'scorecard': ['x']}, 'comm': None})
+
+    assert archiver.match_ids == [89654]
+    assert len(archiver.headers) == 1
+    frames = stored_frames(archiver)
+    assert frames['live_match_info']['match_id'].tolist() == [89654]
+    assert len(frames['live_teams']) == 2
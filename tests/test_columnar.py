@@ -0,0 +1,23 @@
+from columnar import INT, STR, ColumnarBuilder
+
+
+def test_int_beyond_int64_keeps_the_column_as_objects():
+    builder = ColumnarBuilder({'id': INT, 'name': STR})
+    builder.append(1, 'a')
+    builder.append(None, 'b')
+    builder.append(2 ** 70, 'c')
+
+    df = builder.to_frame()
+    assert df['id'].dtype == object
+    assert df['id'].tolist() == [1, None, 2 ** 70]
+    assert df['name'].tolist() == ['a', 'b', 'c']
+
+
+def test_ints_within_int64_stay_typed():
+    builder = ColumnarBuilder({'id': INT})
+    builder.append(2 ** 63 - 1)
+    builder.append(None)
+
+    df = builder.to_frame()
+    assert str(df['id'].dtype) == 'Int64'
+    assert df['id'].tolist()[0] == 2 ** 63 - 1
@@ -0,0 +1,54 @@
+import pandas as pd
+import pytest
+
+from commentary_classifier import classify_commentary
+
+
+def classify(text, event='NONE'):
+    df = classify_commentary(pd.DataFrame({'commentary_text': [text], 'event_type': [event]}))
+    return df.iloc[0]
+
+
+@pytest.mark.parametrize('text, event, batter_runs, extras', [
+    ('Starc to Kohli, 2 runs, six fielders on the off side', 'NONE', 2, 0),
+    ('Starc to Kohli, 1 run, four men back on the leg side', 'NONE', 1, 0),
+    ('Starc to Kohli, no run, four slips in place', 'NONE', 0, 0),
+    ('Starc to Kohli, SIX, that takes him past 100 runs', 'SIX', 6, 0),
+    ('Starc to Kohli, B0$ FOUR, driven through the covers', 'FOUR', 4, 0),
+    ('Starc to Kohli, FOUR, driven through the covers', 'NONE', 4, 0),
+    ('Starc to Kohli, leg byes, 1 run, off the pad', 'NONE', 0, 1),
+    ('Starc to Kohli, byes, FOUR, past the keeper', 'FOUR', 0, 4),
+    ('Starc to Kohli, wide, down the leg side', 'NONE', 0, 1),
+    ('Starc to Kohli, 3 wides, way outside off', 'NONE', 0, 3),
+    ('Starc to Kohli, no ball, 1 run', 'NONE', 1, 1),
+    ('Starc to Kohli, no ball, 2 leg byes', 'NONE', 0, 3),
+    ('Starc to Kohli, 1 leg bye, off the pad', 'NONE', 0, 1),
+])
+def test_runs_come_from_the_outcome_token(text, event, batter_runs, extras):
+    row = classify(text, event)
+    assert (row['batter_runs'], row['extras']) == (batter_runs, extras)
+    assert row['runs_scored'] == batter_runs + extras
+
+
+@pytest.mark.parametrize('text, event, batter_runs', [
+    ('Starc to Kohli, FOUR, wide outside off and he slashes it away', 'FOUR', 4),
+    ('Starc to Kohli, 1 run, wide of mid-off', 'NONE', 1),
+    ('Starc to Kohli, 2 runs, no ball would have been close', 'NONE', 2),
+    ('Starc to Kohli, 1 run, byes to the keeper would have been easier', 'NONE', 1),
+])
+def test_extras_words_in_the_description_are_not_extras(text, event, batter_runs):
+    row = classify(text, event)
+    assert not (row['is_wide'] or row['is_no_ball'] or row['is_bye'] or row['is_leg_bye'])
+    assert (row['batter_runs'], row['extras'], row['runs_scored']) == (batter_runs, 0, batter_runs)
+
+
+def test_explicit_run_count_wins_over_boundary_words():
+    row = classify('Starc to Kohli, 2 runs, six fielders on the off side')
+    assert row['runs_scored'] == 2
+    assert not row['is_wicket']
+
+
+def test_wicket():
+    row = classify('Starc to Kohli, out Caught by Smith!! edged to second slip', 'WICKET')
+    assert row['is_wicket']
+    assert row['runs_scored'] == 0
@@ -0,0 +1,48 @@
+import pandas as pd
+import pytest
+
+from commentary_classifier import classify_commentary
+from commentary_codec import join_commentary, split_commentary
+from delivery_store import parse_deliveries
+
+BALLS = [
+    'Starc to Kohli, 1 run, pushed to mid-on',
+    'Starc to Kohli, B0$ FOUR, driven through the covers',
+    'Starc to Kohli, no run, defended',
+    'Starc to Kohli, 3 wides, way outside off',
+    'Starc to Kohli, leg byes, 1 run, off the pad',
+    'Starc to Kohli, no ball, 1 run',
+    'Starc to Kohli, out Caught by Smith!! edged to second slip',
+]
+NOT_BALLS = [
+    'Kohli comes to the crease, replacing Gill',
+    'drinks break, players head to the boundary, ',
+    'Starc to Kohli, the field spreads out',
+]
+
+
+def commentary(lines):
+    return classify_commentary(pd.DataFrame({
+        'match_id': 1, 'innings': 1, 'over_number': 0.1,
+        'timestamp': range(len(lines)), 'event_type': 'NONE', 'commentary_text': lines,
+    }))
+
+
+def test_only_ball_lines_are_deliveries():
+    deliveries = parse_deliveries(commentary(BALLS + NOT_BALLS))
+    assert len(deliveries) == len(BALLS)
+    assert set(deliveries['bowler']) | set(deliveries['batter']) == {'Starc', 'Kohli'}
+
+
+@pytest.mark.parametrize('text', NOT_BALLS)
+def test_codec_keeps_non_ball_lines_as_free_text(text):
+    parts = split_commentary([text])
+    assert pd.isna(parts['bowler'].iloc[0]) and pd.isna(parts['batter'].iloc[0])
+    assert join_commentary(parts) == [text]
+
+
+def test_codec_round_trip():
+    lines = BALLS + NOT_BALLS + [None, '']
+    parts = split_commentary(lines)
+    assert parts['bowler'].notna().sum() == len(BALLS)
+    assert join_commentary(parts) == lines
@@ -0,0 +1,34 @@
+import pytest
+from sqlalchemy import create_engine, text
+
+from entity_keys import TransactionCache
+
+
+@pytest.fixture
+def cache():
+    promoted = {}
+    cache = TransactionCache(lambda name, entries: promoted.setdefault(name, {}).update(entries))
+    cache.promoted = promoted
+    return cache
+
+
+def test_entries_are_cached_when_the_transaction_commits(cache):
+    engine = create_engine('sqlite://')
+    with engine.begin() as conn:
+        conn.execute(text('SELECT 1'))
+        cache.add(conn, 'players', {'Kohli': 1})
+        assert cache.get(conn, 'players') == {'Kohli': 1}
+        assert cache.promoted == {}
+    assert cache.promoted == {'players': {'Kohli': 1}}
+
+
+def test_entries_are_dropped_when_the_transaction_rolls_back(cache):
+    engine = create_engine('sqlite://')
+    with pytest.raises(RuntimeError):
+        with engine.begin() as conn:
+            conn.execute(text('SELECT 1'))
+            cache.add(conn, 'players', {'Kohli': 1})
+            raise RuntimeError('write failed')
+    assert cache.promoted == {}
+    with engine.begin() as conn:
+        assert cache.get(conn, 'players') == {}